@@ -1,6 +1,19 @@
-from typing import Generator
+import threading
+from typing import Any, Dict, Generator, Type, TypeVar
+
+from fastapi import HTTPException, Request, status
 
 from app.database.db import SessionLocal
+from app.services.chat_service import ChatService
+from app.services.gemini_service import GeminiService
+from app.services.guest_chat_service import GuestChatService
+from app.services.rate_limiter import RateLimiter, retry_after_header
+
+ServiceType = TypeVar("ServiceType")
+
+# Process-wide service instances, created on first use
+_services: Dict[type, Any] = {}
+_services_lock = threading.Lock()
 
 
 def get_db() -> Generator:
@@ -15,3 +28,93 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+def client_ip(request: Request) -> str:
+    """
+    Get the address of the client that sent a request.
+
+    Behind a reverse proxy this is the proxy's address unless uvicorn runs
+    with ``--proxy-headers --forwarded-allow-ips <proxy address>`` and the
+    proxy sets X-Forwarded-For (see deployment.md). uvicorn then replaces
+    the client with the address the trusted proxy saw; the header is ignored
+    on connections from anywhere else, so clients can't spoof it.
+
+    Args:
+        request (Request): Incoming request
+
+    Returns:
+        str: Client IP address
+    """
+    return request.client.host if request.client else "unknown"
+
+
+def check_rate_limit(limiter: RateLimiter, key: str) -> None:
+    """
+    Count a request against a rate limit budget.
+
+    Args:
+        limiter (RateLimiter): Budget to charge
+        key (str): User or client key, such as "user:12" or "ip:10.0.0.1"
+
+    Raises:
+        HTTPException: When the budget is exhausted
+    """
+    result = limiter.hit(key)
+    if not result.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please slow down",
+            headers=retry_after_header(result),
+        )
+
+
+def shared_service(service_class: Type[ServiceType]) -> ServiceType:
+    """
+    Get the process-wide instance of a service, creating it on first use.
+
+    Services hold LLM clients, which are slow to set up and need an API key,
+    so they are not created at import time. A worker that never serves AI
+    requests never creates them, and a missing key only affects AI features.
+
+    Args:
+        service_class (Type[ServiceType]): Service class
+
+    Raises:
+        HTTPException: When the service can't be created, e.g. without an API key
+
+    Returns:
+        ServiceType: Shared service instance
+    """
+    service = _services.get(service_class)
+    if service is not None:
+        return service
+
+    with _services_lock:
+        service = _services.get(service_class)
+        if service is None:
+            try:
+                service = service_class()
+            except ValueError as e:
+                print(f"Error creating {service_class.__name__}: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="AI features are not available",
+                )
+            _services[service_class] = service
+    return service
+
+
+def get_chat_service() -> ChatService:
+    """Get the shared chat service."""
+    return shared_service(ChatService)
+
+
+def get_guest_chat_service() -> GuestChatService:
+    """Get the shared guest chat service."""
+    return shared_service(GuestChatService)
+
+
+def get_gemini_service() -> GeminiService:
+    """Get the shared grading service."""
+    return shared_service(GeminiService)
@@ -0,0 +1,375 @@
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_db
+from app.core.auth import get_current_active_user, check_is_professor_or_admin
+from app.database.models import (
+    Assignment,
+    AssignmentStats,
+    Course,
+    CourseUser,
+    User,
+)
+from app.models.analytics import (
+    AssignmentAnalytics,
+    CourseAnalytics,
+    CurveMethod,
+    CurveRequest,
+    CurveResult,
+    GradeDistributionResponse,
+    GradeSource,
+)
+from app.services.analytics_service import (
+    load_assignment_stats,
+    load_course_stats,
+    rebuild_assignment_stats,
+    rebuild_course_stats,
+    serialize_assignment_stats,
+    serialize_course_stats,
+)
+from app.services.dashboard_service import invalidate_dashboard
+from app.services.grade_curve import (
+    apply_grades,
+    curve_grades,
+    histogram,
+    load_grades,
+    percentile_ranks,
+    summarize,
+    z_scores,
+)
+
+router = APIRouter()
+
+
+def check_teaches_course(db: Session, current_user: User, course_id: int) -> None:
+    """
+    Check that a professor teaches a course. Admins can view every course.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        course_id (int): Course ID
+
+    Raises:
+        HTTPException: When the professor doesn't teach the course
+    """
+    if current_user.role == "professor":
+        professor_course = (
+            db.query(CourseUser)
+            .filter(
+                CourseUser.user_id == current_user.id,
+                CourseUser.course_id == course_id,
+                CourseUser.role == "professor",
+            )
+            .first()
+        )
+
+        if not professor_course:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to view analytics for this course",
+            )
+
+
+def get_course_analytics_response(db: Session, course_id: int) -> dict:
+    """Read the course statistics and its assignments' statistics."""
+    stats = load_course_stats(db, course_id)
+
+    assignment_rows = (
+        db.query(AssignmentStats, Assignment.title)
+        .join(Assignment, Assignment.id == AssignmentStats.assignment_id)
+        .filter(AssignmentStats.course_id == course_id)
+        .order_by(Assignment.due_date, Assignment.id)
+        .all()
+    )
+
+    response = serialize_course_stats(stats)
+    response["assignments"] = [
+        serialize_assignment_stats(assignment_stats, title)
+        for assignment_stats, title in assignment_rows
+    ]
+    return response
+
+
+@router.get(
+    "/courses/{course_id}",
+    response_model=CourseAnalytics,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def get_course_analytics(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    course_id: int,
+) -> Any:
+    """
+    Get grade analytics of a course and its assignments (professors and admins only).
+
+    Statistics are read from summary tables. Counts and means are updated
+    whenever grades are written; medians and percentiles, and the course
+    row, are recomputed on read at most once per
+    ANALYTICS_DISTRIBUTION_MAX_AGE_SECONDS. Course-level grades are in
+    percent of points possible.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        course_id (int): Course ID
+
+    Raises:
+        HTTPException: When course not found or user doesn't teach the course
+
+    Returns:
+        CourseAnalytics: Course analytics
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+
+    check_teaches_course(db, current_user, course_id)
+
+    return get_course_analytics_response(db, course_id)
+
+
+@router.post(
+    "/courses/{course_id}/refresh",
+    response_model=CourseAnalytics,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def refresh_course_analytics(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    course_id: int,
+) -> Any:
+    """
+    Recompute the analytics of a course and all of its assignments.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        course_id (int): Course ID
+
+    Raises:
+        HTTPException: When course not found or user doesn't teach the course
+
+    Returns:
+        CourseAnalytics: Refreshed course analytics
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+
+    check_teaches_course(db, current_user, course_id)
+
+    rebuild_course_stats(db, course_id)
+    db.commit()
+
+    return get_course_analytics_response(db, course_id)
+
+
+@router.get(
+    "/assignments/{assignment_id}",
+    response_model=AssignmentAnalytics,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def get_assignment_analytics(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    assignment_id: int,
+) -> Any:
+    """
+    Get grade analytics of an assignment (professors and admins only).
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        assignment_id (int): Assignment ID
+
+    Raises:
+        HTTPException: When assignment not found or user doesn't teach the course
+
+    Returns:
+        AssignmentAnalytics: Assignment analytics
+    """
+    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
+        )
+
+    check_teaches_course(db, current_user, assignment.course_id)
+
+    stats = load_assignment_stats(db, assignment_id)
+
+    return serialize_assignment_stats(stats, assignment.title)
+
+
+def get_taught_assignment(db: Session, current_user: User, assignment_id: int):
+    """Get an assignment, checking that the user may view its course's grades."""
+    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
+        )
+
+    check_teaches_course(db, current_user, assignment.course_id)
+    return assignment
+
+
+@router.get(
+    "/assignments/{assignment_id}/distribution",
+    response_model=GradeDistributionResponse,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def get_grade_distribution(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    assignment_id: int,
+    source: GradeSource = Query(GradeSource.FINAL),
+    bins: int = Query(10, ge=1, le=100),
+    curve: Optional[CurveMethod] = Query(None),
+    target_mean: Optional[float] = Query(None, ge=0),
+    target_std: Optional[float] = Query(None, gt=0),
+) -> Any:
+    """
+    Get the grade distribution of an assignment (professors and admins only).
+
+    Each student's latest graded attempt is included with its z-score and
+    percentile rank. When ``curve`` is given, curved grades are previewed
+    without being saved.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        assignment_id (int): Assignment ID
+        source (GradeSource): AI grade or current final grade
+        bins (int): Number of histogram bins
+        curve (Optional[CurveMethod]): Curve to preview
+        target_mean (Optional[float]): Target mean for the linear curve
+        target_std (Optional[float]): Target standard deviation for the linear curve
+
+    Raises:
+        HTTPException: When assignment not found or user doesn't teach the course
+
+    Returns:
+        GradeDistributionResponse: Grade distribution
+    """
+    assignment = get_taught_assignment(db, current_user, assignment_id)
+
+    rows, grades = load_grades(db, assignment_id, source.value)
+    points_possible = assignment.points_possible
+
+    response = {
+        "assignment_id": assignment_id,
+        "points_possible": points_possible,
+        "source": source,
+        "count": len(rows),
+        **summarize(grades),
+        "histogram": histogram(grades, points_possible, bins),
+    }
+
+    curved = None
+    if curve:
+        curved = curve_grades(
+            grades, curve.value, points_possible, target_mean, target_std
+        )
+        curved_summary = summarize(curved)
+        response.update(
+            {
+                "curve": curve,
+                "curved_mean": curved_summary["mean"],
+                "curved_std": curved_summary["std"],
+                "curved_median": curved_summary["median"],
+                "curved_histogram": histogram(curved, points_possible, bins),
+            }
+        )
+
+    scores = z_scores(grades)
+    ranks = percentile_ranks(grades)
+    response["grades"] = [
+        {
+            "submission_id": row.submission_id,
+            "user_id": row.user_id,
+            "student_name": row.student_name,
+            "grade": row.grade,
+            "z_score": round(float(scores[i]), 3),
+            "percentile_rank": round(float(ranks[i]), 1),
+            "curved_grade": round(float(curved[i]), 2) if curved is not None else None,
+        }
+        for i, row in enumerate(rows)
+    ]
+
+    return response
+
+
+@router.post(
+    "/assignments/{assignment_id}/curve",
+    response_model=CurveResult,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def apply_curve(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    assignment_id: int,
+    curve_in: CurveRequest,
+) -> Any:
+    """
+    Apply a curve to every graded submission of an assignment.
+
+    Curved grades become the final grades of the students' latest attempts,
+    which are marked accepted. All grades are written in one statement.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        assignment_id (int): Assignment ID
+        curve_in (CurveRequest): Curve to apply
+
+    Raises:
+        HTTPException: When assignment not found or user doesn't teach the course
+
+    Returns:
+        CurveResult: Number of grades updated and the mean before and after
+    """
+    assignment = get_taught_assignment(db, current_user, assignment_id)
+
+    rows, grades = load_grades(db, assignment_id, curve_in.source.value)
+    curved = curve_grades(
+        grades,
+        curve_in.method.value,
+        assignment.points_possible,
+        curve_in.target_mean,
+        curve_in.target_std,
+    )
+
+    updated = apply_grades(
+        db, rows, curved, f"{current_user.first_name} {current_user.last_name}"
+    )
+    db.commit()
+    invalidate_dashboard(*{row.user_id for row in rows})
+
+    try:
+        # Every grade changed, so rebuild rather than update student by student
+        rebuild_assignment_stats(db, assignment_id)
+        db.commit()
+    except Exception as e:
+        print(f"Error refreshing grade analytics: {e}")
+        db.rollback()
+
+    return {
+        "assignment_id": assignment_id,
+        "method": curve_in.method,
+        "updated": updated,
+        "mean": summarize(grades)["mean"],
+        "curved_mean": summarize(curved)["mean"],
+    }
@@ -1,7 +1,17 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    UploadFile,
+    File,
+    Form,
+    Query,
+    status,
+)
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import func, and_, select
 
 from app.api.dependencies import get_db
 from app.core.auth import get_current_active_user, check_is_professor_or_admin
@@ -12,6 +22,10 @@ from app.models.assignment import (
     AssignmentList,
     AssignmentUpdate,
 )
+from app.models.submission import SimilarityReport
+from app.services.course_retrieval import sync_course_index
+from app.services.rubric_service import invalidate_rubric
+from app.services.similarity_index import similarity_report
 import os
 import shutil
 from datetime import datetime
@@ -37,6 +51,7 @@ def save_upload_file(upload_file: UploadFile, destination: str) -> str:
 @router.get("/", response_model=AssignmentList)
 def get_assignments(
     course_id: Optional[int] = None,
+    upcoming: bool = False,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
@@ -47,9 +62,18 @@ def get_assignments(
 
     Students can only see assignments for courses they are enrolled in.
     Professors and admins can see all assignments or filter by course.
+    With ``upcoming``, only assignments that are not yet due are returned,
+    soonest first.
     """
-    # Build query
-    query = db.query(Assignment)
+    # Build query; course name and code come from the same statement
+    query = (
+        db.query(Assignment, Course.name, Course.code)
+        .join(Course, Course.id == Assignment.course_id)
+        .options(
+            defer(Assignment.reference_solution),
+            defer(Assignment.reference_solution_file_path),
+        )
+    )
 
     # Filter by course if provided
     if course_id:
@@ -57,33 +81,26 @@ def get_assignments(
 
     # If user is a student, only show assignments for enrolled courses
     if current_user.role == "student":
-        # Get the courses the student is enrolled in
-        enrolled_course_ids = (
-            db.query(CourseUser.course_id)
-            .filter(CourseUser.user_id == current_user.id)
-            .all()
+        enrolled_course_ids = select(CourseUser.course_id).where(
+            CourseUser.user_id == current_user.id
         )
-
-        # Extract the course IDs from the result
-        enrolled_course_ids = [course_id for (course_id,) in enrolled_course_ids]
-
-        # Filter assignments to only show those from enrolled courses
         query = query.filter(Assignment.course_id.in_(enrolled_course_ids))
 
+    # Only assignments that are not yet due, soonest first
+    if upcoming:
+        query = query.filter(Assignment.due_date >= func.now()).order_by(
+            Assignment.due_date, Assignment.id
+        )
+
     # Get total count
     total = query.count()
 
     # Apply pagination
-    assignments = query.offset(skip).limit(limit).all()
+    rows = query.offset(skip).limit(limit).all()
 
     # Enhance assignments with course information
     result = []
-    for assignment in assignments:
-        # Get course info
-        course = db.query(Course).filter(Course.id == assignment.course_id).first()
-        course_name = course.name if course else None
-        course_code = course.code if course else None
-
+    for assignment, course_name, course_code in rows:
         # Create enhanced assignment object
         assignment_data = {
             "id": assignment.id,
@@ -175,6 +192,69 @@ def get_assignment(
     return response
 
 
+@router.get(
+    "/{assignment_id}/similarity-report",
+    response_model=SimilarityReport,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def get_similarity_report(
+    assignment_id: int,
+    threshold: float = Query(0.7, ge=0, le=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get every pair of near-duplicate submissions for an assignment (professors and admins only).
+    """
+    # Get assignment by ID
+    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
+        )
+
+    # If professor (not admin), check if they teach this course
+    if current_user.role == "professor":
+        professor_course = (
+            db.query(CourseUser)
+            .filter(
+                CourseUser.user_id == current_user.id,
+                CourseUser.course_id == assignment.course_id,
+                CourseUser.role == "professor",
+            )
+            .first()
+        )
+
+        if not professor_course:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to view submissions for this course",
+            )
+
+    pairs = similarity_report(db, assignment_id, threshold)
+
+    # Get student names for all pairs in one query
+    user_ids = {pair["user_id"] for pair in pairs} | {
+        pair["other_user_id"] for pair in pairs
+    }
+    names = {
+        user.id: f"{user.first_name} {user.last_name}"
+        for user in db.query(User.id, User.first_name, User.last_name).filter(
+            User.id.in_(user_ids)
+        )
+    }
+    for pair in pairs:
+        pair["student_name"] = names.get(pair["user_id"])
+        pair["other_student_name"] = names.get(pair["other_user_id"])
+
+    return {
+        "assignment_id": assignment_id,
+        "threshold": threshold,
+        "pairs": pairs,
+        "total": len(pairs),
+    }
+
+
 @router.post(
     "/",
     response_model=AssignmentResponse,
@@ -182,6 +262,7 @@ def get_assignment(
     dependencies=[Depends(check_is_professor_or_admin)],
 )
 async def create_assignment(
+    background_tasks: BackgroundTasks,
     course_id: int = Form(...),
     title: str = Form(...),
     description: Optional[str] = Form(None),
@@ -271,6 +352,8 @@ async def create_assignment(
     db.commit()
     db.refresh(assignment)
 
+    background_tasks.add_task(sync_course_index, db, assignment.course_id)
+
     # Create response with course info
     response = {
         "id": assignment.id,
@@ -300,6 +383,7 @@ async def create_assignment(
 )
 async def update_assignment(
     assignment_id: int,
+    background_tasks: BackgroundTasks,
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     assignment_type: Optional[str] = Form(None),
@@ -417,6 +501,9 @@ async def update_assignment(
     db.add(assignment)
     db.commit()
     db.refresh(assignment)
+    invalidate_rubric(assignment.id)
+
+    background_tasks.add_task(sync_course_index, db, assignment.course_id)
 
     # Get course info
     course = db.query(Course).filter(Course.id == assignment.course_id).first()
@@ -452,6 +539,7 @@ async def update_assignment(
 )
 def delete_assignment(
     assignment_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> None:
@@ -485,7 +573,11 @@ def delete_assignment(
             )
 
     # Delete assignment
+    course_id = assignment.course_id
     db.delete(assignment)
     db.commit()
+    invalidate_rubric(assignment_id)
+
+    background_tasks.add_task(sync_course_index, db, course_id)
 
     return
@@ -12,6 +12,7 @@ from app.core.auth import get_current_active_user
 from app.database.models import User, UserPreference
 from app.models.token import Token
 from app.models.user import UserCreate, UserResponse
+from app.services.catalog_cache import invalidate_catalog
 from app.config import settings
 
 router = APIRouter()
@@ -53,6 +54,9 @@ def register_user(*, db: Session = Depends(get_db), user_in: UserCreate) -> Any:
     )
     db.add(user)
     db.commit()
+    if user.role == "professor":
+        # New professors appear in the available professors list
+        invalidate_catalog()
     db.refresh(user)
 
     return user
@@ -1,50 +1,119 @@
 # backend/app/api/v1/endpoints/chat.py
-from typing import Any, Dict
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
 from pydantic import BaseModel
-
-from app.core.auth import get_current_active_user
-from app.database.models import User
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import (
+    check_rate_limit,
+    client_ip,
+    get_chat_service,
+    get_db,
+    get_guest_chat_service,
+)
+from app.core.auth import check_is_admin, get_current_active_user
+from app.database.models import ChatMessage, User
+from app.services.chat_memory import (
+    append_turns,
+    get_session,
+    load_context,
+    summarize_conversation,
+)
 from app.services.chat_service import ChatService
+from app.services.course_retrieval import retrieve_course_context
 from app.services.guest_chat_service import GuestChatService
+from app.services.rate_limiter import (
+    LLMBudgetExceeded,
+    chat_ip_rate_limiter,
+    chat_rate_limiter,
+    get_usage,
+    guest_chat_rate_limiter,
+)
 
 router = APIRouter()
-chat_service = ChatService()
-guest_chat_service = GuestChatService()
 
 
 class ChatRequest(BaseModel):
     """Chat request model."""
 
     prompt: str
+    conversation_id: Optional[int] = None
 
 
 class ChatResponse(BaseModel):
     """Chat response model."""
 
     response: str
+    conversation_id: Optional[int] = None
+
+
+def raise_assistant_busy() -> None:
+    """Reject a chat request while grading is using the AI capacity."""
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="The AI assistant is busy, please try again shortly",
+        headers={"Retry-After": "10"},
+    )
 
 
 @router.post("/", response_model=ChatResponse)
 def chat_with_ai(
-    request: ChatRequest, current_user: User = Depends(get_current_active_user)
+    request: ChatRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    chat_service: ChatService = Depends(get_chat_service),
 ) -> Any:
     """
     Chat with the AI assistant.
 
+    Without a conversation ID a new conversation is started. Its ID is
+    returned with the response; send it with the next prompt to continue.
+    Earlier turns are kept on the server, and once they outgrow the history
+    budget the older ones are summarized after the response is sent. The
+    most relevant excerpts of the user's course material are added to the
+    prompt, but not stored with the conversation.
+
     Args:
-        request (ChatRequest): Chat request with user prompt
+        request (ChatRequest): Chat request with user prompt and optional conversation ID
+        http_request (Request): Incoming request, for the client address
+        background_tasks (BackgroundTasks): Background tasks
+        db (Session): Database session
         current_user (User): Current authenticated user
+        chat_service (ChatService): Chat service
+
+    Raises:
+        HTTPException: When the prompt is empty, the conversation doesn't
+            exist, the user or client is over the chat budget, or grading is using
+            the AI capacity
 
     Returns:
-        dict: AI response
+        dict: AI response and conversation ID
     """
     if not request.prompt:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Prompt cannot be empty"
         )
 
-    result = chat_service.generate_response(request.prompt)
+    # Per user, and per address so one client can't spread load over accounts
+    check_rate_limit(chat_rate_limiter, f"user:{current_user.id}")
+    check_rate_limit(chat_ip_rate_limiter, f"ip:{client_ip(http_request)}")
+
+    session = get_session(db, current_user.id, request.conversation_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
+        )
+    context = load_context(db, session)
+    course_context = retrieve_course_context(db, current_user.id, request.prompt)
+
+    try:
+        result = chat_service.generate_response(
+            request.prompt, context.history(), course_context
+        )
+    except LLMBudgetExceeded:
+        raise_assistant_busy()
 
     if not result.get("success", False):
         raise HTTPException(
@@ -52,16 +121,81 @@ def chat_with_ai(
             detail="Failed to generate response from AI",
         )
 
-    return {"response": result["response"]}
+    append_turns(db, session, context, request.prompt, result["response"])
+    db.commit()
+
+    background_tasks.add_task(
+        summarize_conversation, db, session.id, chat_service.summarize
+    )
+
+    return {"response": result["response"], "conversation_id": session.id}
+
+
+@router.get("/conversations/{conversation_id}")
+def get_conversation(
+    conversation_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get the messages of one of the current user's conversations.
+
+    Args:
+        conversation_id (int): Conversation ID
+        db (Session): Database session
+        current_user (User): Current authenticated user
+
+    Raises:
+        HTTPException: If the conversation doesn't exist
+
+    Returns:
+        dict: Conversation with its messages, oldest first
+    """
+    session = get_session(db, current_user.id, conversation_id)
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
+        )
+
+    messages = (
+        db.query(ChatMessage)
+        .filter(ChatMessage.session_id == session.id)
+        .order_by(ChatMessage.id)
+        .all()
+    )
+
+    return {
+        "id": session.id,
+        "created_at": session.created_at,
+        "updated_at": session.updated_at,
+        "messages": [
+            {
+                "role": message.role,
+                "content": message.content,
+                "created_at": message.created_at,
+            }
+            for message in messages
+        ],
+    }
 
 
 @router.post("/guest", response_model=ChatResponse)
-def chat_with_ai_guest(request: ChatRequest) -> Any:
+def chat_with_ai_guest(
+    request: ChatRequest,
+    http_request: Request,
+    guest_chat_service: GuestChatService = Depends(get_guest_chat_service),
+) -> Any:
     """
     Chat with the AI assistant without authentication.
 
     Args:
         request (ChatRequest): Chat request with user prompt
+        http_request (Request): Incoming request, for the client address
+        guest_chat_service (GuestChatService): Guest chat service
+
+    Raises:
+        HTTPException: When the prompt is empty, the client is over the guest
+            budget, or grading is using the AI capacity
 
     Returns:
         dict: AI response
@@ -71,7 +205,12 @@ def chat_with_ai_guest(request: ChatRequest) -> Any:
             status_code=status.HTTP_400_BAD_REQUEST, detail="Prompt cannot be empty"
         )
 
-    result = guest_chat_service.generate_response(request.prompt)
+    check_rate_limit(guest_chat_rate_limiter, f"ip:{client_ip(http_request)}")
+
+    try:
+        result = guest_chat_service.generate_response(request.prompt)
+    except LLMBudgetExceeded:
+        raise_assistant_busy()
 
     if not result.get("success", False):
         raise HTTPException(
@@ -79,4 +218,17 @@ def chat_with_ai_guest(request: ChatRequest) -> Any:
             detail="Failed to generate response from AI",
         )
 
-    return {"response": result["response"]}
\ No newline at end of file
+    return {"response": result["response"]}
+
+@router.get("/usage", dependencies=[Depends(check_is_admin)])
+def get_ai_usage() -> Dict[str, Any]:
+    """
+    Get rate limit and AI call counters of this API worker (admins only).
+
+    Counters start at zero when the worker starts; with several workers,
+    sum them for a total.
+
+    Returns:
+        dict: Allowed and limited requests per budget, and AI calls per kind
+    """
+    return get_usage()
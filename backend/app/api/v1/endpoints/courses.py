@@ -1,20 +1,122 @@
+import csv
 from typing import Any, Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    UploadFile,
+    File,
+    Form,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app.api.dependencies import get_db
 from app.core.auth import get_current_active_user, check_is_professor_or_admin
 from app.database.models import Course, User, CourseUser
-from app.models.course import CourseResponse, CourseList, CourseCreate, CourseUpdate
+from app.models.course import (
+    CourseResponse,
+    CourseList,
+    CourseCreate,
+    CourseUpdate,
+    CourseUserRole,
+    BulkEnrollmentRequest,
+    BulkEnrollmentResult,
+)
+from app.services.catalog_cache import get_catalog_response, invalidate_catalog
+from app.services.course_retrieval import sync_course_index
+from app.services.dashboard_service import invalidate_dashboard
+from app.services.gradebook_service import iter_gradebook_csv, iter_gradebook_jsonl
+from app.services.enrollment_service import (
+    enroll_users,
+    parse_roster_csv,
+    resolve_emails,
+)
 from app.models.user import UserResponse
 
 router = APIRouter()
 
 
+def professors_of(loader):
+    """
+    Loader option for each course's professors and their user rows.
+
+    Args:
+        loader: ``selectinload`` for lists of courses, ``joinedload`` for one course
+
+    Returns:
+        Loader option for Course queries
+    """
+    return loader(
+        Course.course_users.and_(CourseUser.role == "professor")
+    ).joinedload(CourseUser.user)
+
+
+def course_response(course: Course) -> dict:
+    """
+    Build a course response from a course loaded with professors_of.
+
+    Args:
+        course (Course): Course with its professor enrollments loaded
+
+    Returns:
+        dict: Course information with professors
+    """
+    return {
+        "id": course.id,
+        "code": course.code,
+        "name": course.name,
+        "description": course.description,
+        "term": course.term,
+        "created_at": course.created_at,
+        "updated_at": course.updated_at,
+        "professors": [
+            {
+                "id": course_user.user.id,
+                "first_name": course_user.user.first_name,
+                "last_name": course_user.user.last_name,
+                "email": course_user.user.email,
+            }
+            for course_user in course.course_users
+            if course_user.role == "professor"
+        ],
+    }
+
+
+def catalog_response(request: Request, key: tuple, build) -> Response:
+    """
+    Serve a catalog response from the cache, honoring If-None-Match.
+
+    Args:
+        request (Request): Incoming request
+        key (tuple): Cache key
+        build: Produces the validated response data on a cache miss
+
+    Returns:
+        Response: JSON response, or 304 Not Modified when the client's copy is current
+    """
+    body, etag = get_catalog_response(key, build)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/", response_model=CourseList)
 def get_courses(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     skip: int = Query(0, ge=0),
@@ -34,60 +136,33 @@ def get_courses(
     Returns:
         dict: Courses list and total count
     """
-    # Build query
-    query = db.query(Course)
-
-    # Apply term filter if provided
-    if term:
-        query = query.filter(Course.term == term)
-
-    # Get total count
-    total = query.count()
-
-    # Get courses with pagination
-    courses = query.offset(skip).limit(limit).all()
-
-    # Prepare response with professors
-    result_courses = []
-    for course in courses:
-        # Get professors for this course
-        professors = (
-            db.query(User)
-            .join(CourseUser, CourseUser.user_id == User.id)
-            .filter(CourseUser.course_id == course.id, CourseUser.role == "professor")
-            .all()
+
+    def build() -> CourseList:
+        # Build query
+        query = db.query(Course)
+
+        # Apply term filter if provided
+        if term:
+            query = query.filter(Course.term == term)
+
+        # Get total count
+        total = query.count()
+
+        # Get courses with pagination; professors are loaded in one extra query
+        courses = (
+            query.options(professors_of(selectinload)).offset(skip).limit(limit).all()
         )
-        
-        # Create professor info list
-        professor_info = [
-            {
-                "id": prof.id,
-                "first_name": prof.first_name,
-                "last_name": prof.last_name,
-                "email": prof.email
-            }
-            for prof in professors
-        ]
-        
-        # Create course dict with professors
-        course_dict = {
-            "id": course.id,
-            "code": course.code,
-            "name": course.name,
-            "description": course.description,
-            "term": course.term,
-            "created_at": course.created_at,
-            "updated_at": course.updated_at,
-            "professors": professor_info
-        }
-        
-        result_courses.append(course_dict)
-
-    return {"courses": result_courses, "total": total}
+
+        result_courses = [course_response(course) for course in courses]
+
+        return CourseList(courses=result_courses, total=total)
+
+    return catalog_response(request, ("courses", term, skip, limit), build)
 
 @router.get("/available-professors", response_model=List[UserResponse])
 def get_available_professors(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
@@ -101,15 +176,20 @@ def get_available_professors(
     Returns:
         List[UserResponse]: List of professors
     """
-    # Query professors from database
-    professors = db.query(User).filter(User.role == "professor", User.is_active == True).all()
-    
-    return professors
+
+    def build() -> List[UserResponse]:
+        # Query professors from database
+        professors = db.query(User).filter(User.role == "professor", User.is_active == True).all()
+
+        return [UserResponse.model_validate(professor) for professor in professors]
+
+    return catalog_response(request, ("available-professors",), build)
 
 
 @router.get("/{course_id}", response_model=CourseResponse)
 def get_course(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     course_id: int,
@@ -128,45 +208,23 @@ def get_course(
     Returns:
         Course: Course information
     """
-    # Get course by ID
-    course = db.query(Course).filter(Course.id == course_id).first()
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+
+    def build() -> CourseResponse:
+        # Get course by ID together with its professors
+        course = (
+            db.query(Course)
+            .options(professors_of(joinedload))
+            .filter(Course.id == course_id)
+            .first()
         )
+        if not course:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+            )
 
-    # Get professors for this course
-    professors = (
-        db.query(User)
-        .join(CourseUser, CourseUser.user_id == User.id)
-        .filter(CourseUser.course_id == course_id, CourseUser.role == "professor")
-        .all()
-    )
-    
-    # Create professor info list
-    professor_info = [
-        {
-            "id": prof.id,
-            "first_name": prof.first_name,
-            "last_name": prof.last_name,
-            "email": prof.email
-        }
-        for prof in professors
-    ]
-    
-    # Create course dict with professors
-    course_dict = {
-        "id": course.id,
-        "code": course.code,
-        "name": course.name,
-        "description": course.description,
-        "term": course.term,
-        "created_at": course.created_at,
-        "updated_at": course.updated_at,
-        "professors": professor_info
-    }
-    
-    return course_dict
+        return CourseResponse(**course_response(course))
+
+    return catalog_response(request, ("course", course_id), build)
 
 
 @router.post(
@@ -233,6 +291,7 @@ def create_course(*, db: Session = Depends(get_db), course_in: CourseCreate, cur
     db.add(course_user)
 
     db.commit()
+    invalidate_catalog()
     db.refresh(course)
 
     # Get professor info for response
@@ -264,7 +323,11 @@ def create_course(*, db: Session = Depends(get_db), course_in: CourseCreate, cur
     dependencies=[Depends(check_is_professor_or_admin)],
 )
 def update_course(
-    *, db: Session = Depends(get_db), course_id: int, course_in: CourseUpdate
+    *,
+    db: Session = Depends(get_db),
+    course_id: int,
+    course_in: CourseUpdate,
+    background_tasks: BackgroundTasks,
 ) -> Any:
     """
     Update a course (professors and admins only).
@@ -273,6 +336,7 @@ def update_course(
         db (Session): Database session
         course_id (int): Course ID
         course_in (CourseUpdate): Course data to update
+        background_tasks (BackgroundTasks): Background tasks
 
     Raises:
         HTTPException: When course not found
@@ -294,8 +358,11 @@ def update_course(
 
     db.add(course)
     db.commit()
+    invalidate_catalog()
     db.refresh(course)
 
+    background_tasks.add_task(sync_course_index, db, course.id)
+
     return course
 
 
@@ -369,8 +436,254 @@ def seed_courses(*, db: Session = Depends(get_db)) -> Any:
             added_count += 1
 
     db.commit()
+    invalidate_catalog()
 
     return {
         "message": f"Successfully added {added_count} new courses",
         "total_added": added_count,
-    }
\ No newline at end of file
+    }
+
+
+def bulk_enroll(
+    db: Session, current_user: User, course_id: int, emails: List[str], role: str
+) -> dict:
+    """
+    Enroll a roster of users in a course by email.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        course_id (int): Course ID
+        emails (List[str]): Roster email addresses
+        role (str): Course role for new enrollments
+
+    Raises:
+        HTTPException: When course not found, user doesn't teach the course,
+            a professor tries to add professors, or a professor enrollment
+            names an account that isn't a professor
+
+    Returns:
+        dict: Created and skipped counts and unknown emails
+    """
+    # Only admins can add professors to a course
+    if role == "professor" and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can enroll professors",
+        )
+
+    # Get course by ID
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+
+    # If professor (not admin), check if they teach this course
+    if current_user.role == "professor":
+        professor_course = (
+            db.query(CourseUser)
+            .filter(
+                CourseUser.user_id == current_user.id,
+                CourseUser.course_id == course_id,
+                CourseUser.role == "professor",
+            )
+            .first()
+        )
+
+        if not professor_course:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to enroll users in this course",
+            )
+
+    # De-duplicate the roster, keeping the first spelling of each email
+    roster = {}
+    for email in emails:
+        email = email.strip()
+        if email:
+            roster.setdefault(email.lower(), email)
+    unique_emails = list(roster.values())
+
+    # Resolve all emails in one query, then insert all enrollments in one statement
+    user_ids = resolve_emails(db, unique_emails)
+
+    # Professor enrollments must name professor accounts
+    if role == "professor" and user_ids:
+        non_professors = [
+            email
+            for (email,) in db.query(User.email).filter(
+                User.id.in_(user_ids.values()), User.role != "professor"
+            )
+        ]
+        if non_professors:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"These accounts are not professors: {', '.join(sorted(non_professors))}",
+            )
+
+    created = enroll_users(db, course_id, user_ids.values(), role)
+    db.commit()
+    if created:
+        invalidate_catalog()
+        invalidate_dashboard(*created)
+
+    unknown_emails = [email for email in unique_emails if email.lower() not in user_ids]
+
+    return {
+        "course_id": course_id,
+        "requested": len(unique_emails),
+        "created": len(created),
+        "skipped": len(user_ids) - len(created),
+        "unknown_emails": unknown_emails,
+    }
+
+
+@router.post(
+    "/{course_id}/enrollments",
+    response_model=BulkEnrollmentResult,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def bulk_enroll_users(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    course_id: int,
+    enrollment_in: BulkEnrollmentRequest,
+) -> Any:
+    """
+    Enroll a JSON roster of users in a course (course professors and admins only).
+
+    Users already enrolled are skipped and unknown emails are reported back.
+    Professors can only enroll students; only admins can add professors.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        course_id (int): Course ID
+        enrollment_in (BulkEnrollmentRequest): Roster emails and course role
+
+    Returns:
+        dict: Created and skipped counts and unknown emails
+    """
+    return bulk_enroll(
+        db, current_user, course_id, enrollment_in.emails, enrollment_in.role.value
+    )
+
+
+@router.post(
+    "/{course_id}/enrollments/csv",
+    response_model=BulkEnrollmentResult,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+async def bulk_enroll_users_csv(
+    course_id: int,
+    file: UploadFile = File(...),
+    role: CourseUserRole = Form(CourseUserRole.STUDENT),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Enroll a CSV roster of users in a course (course professors and admins only).
+
+    The CSV needs an ``email`` column, or emails in its first column.
+    Professors can only enroll students; only admins can add professors.
+
+    Args:
+        course_id (int): Course ID
+        file (UploadFile): CSV roster
+        role (CourseUserRole): Course role for new enrollments
+        db (Session): Database session
+        current_user (User): Current authenticated user
+
+    Raises:
+        HTTPException: When the file is not valid UTF-8 CSV or has no emails
+
+    Returns:
+        dict: Created and skipped counts and unknown emails
+    """
+    try:
+        emails = parse_roster_csv(await file.read())
+    except (UnicodeDecodeError, csv.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Roster must be a UTF-8 encoded CSV file",
+        )
+    finally:
+        await file.close()
+
+    if not emails:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Roster does not contain any email addresses",
+        )
+
+    return bulk_enroll(db, current_user, course_id, emails, role.value)
+
+
+@router.get(
+    "/{course_id}/gradebook",
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def export_gradebook(
+    *,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    course_id: int,
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+) -> Any:
+    """
+    Stream a course gradebook (course professors and admins only).
+
+    One row per enrolled student and assignment, with the latest attempt and
+    its grades. Rows are read through a server-side cursor and streamed, so
+    memory use does not grow with the size of the course.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+        course_id (int): Course ID
+        format (str): ``csv`` or ``jsonl``
+
+    Raises:
+        HTTPException: When course not found or user doesn't teach the course
+
+    Returns:
+        StreamingResponse: Gradebook file
+    """
+    # Get course by ID
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+
+    # If professor (not admin), check if they teach this course
+    if current_user.role == "professor":
+        professor_course = (
+            db.query(CourseUser)
+            .filter(
+                CourseUser.user_id == current_user.id,
+                CourseUser.course_id == course_id,
+                CourseUser.role == "professor",
+            )
+            .first()
+        )
+
+        if not professor_course:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to export grades for this course",
+            )
+
+    file_name = f"{course.code}_{course.term}_gradebook.{format}".replace(" ", "_")
+    if format == "jsonl":
+        content, media_type = iter_gradebook_jsonl(db, course_id), "application/x-ndjson"
+    else:
+        content, media_type = iter_gradebook_csv(db, course_id), "text/csv"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.auth import get_user_from_token
+from app.database.db import SessionLocal
+from app.services.event_bus import event_bus
+
+router = APIRouter()
+
+
+def authenticate(token: str) -> Optional[int]:
+    """
+    Get the active user a token belongs to, with a short-lived session.
+
+    Args:
+        token (str): JWT access token
+
+    Returns:
+        Optional[int]: User ID, or None when the token is invalid or the user inactive
+    """
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+        return user.id if user is not None and user.is_active else None
+    finally:
+        db.close()
+
+
+@router.websocket("/ws")
+async def user_events(websocket: WebSocket, token: str = Query(...)) -> None:
+    """
+    Stream the current user's events over a websocket.
+
+    Browsers can't set headers on websocket requests, so the access token
+    is passed as the ``token`` query parameter. Each message is a JSON
+    event, for example ``{"type": "submission.graded", "submission_id": 1,
+    ...}`` once a submission's feedback is committed.
+
+    Args:
+        websocket (WebSocket): Websocket connection
+        token (str): JWT access token
+    """
+    # The database calls are blocking, so keep them off the event loop.
+    # Authenticate with a short-lived session; the connection can stay open for hours
+    user_id = await run_in_threadpool(authenticate, token)
+
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    queue = event_bus.subscribe(user_id)
+
+    async def send_events() -> None:
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def wait_for_disconnect() -> None:
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    tasks = [
+        asyncio.create_task(send_events()),
+        asyncio.create_task(wait_for_disconnect()),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        event_bus.unsubscribe(user_id, queue)
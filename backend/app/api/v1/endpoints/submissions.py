@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Any, List, Optional
 from fastapi import (
     APIRouter,
@@ -7,21 +8,22 @@ from fastapi import (
     File,
     Form,
     BackgroundTasks,
+    Header,
+    Query,
     status,
 )
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import func, select
 
-from app.api.dependencies import get_db
-from app.core.auth import get_current_active_user
+from app.api.dependencies import get_db, check_rate_limit, get_gemini_service
+from app.core.auth import get_current_active_user, check_is_professor_or_admin
 from app.database.models import (
     User,
     Assignment,
     Submission,
     Feedback,
     FeedbackDetail,
-    IssueType,
-    SeverityLevel,
     CourseUser,
 )
 from app.models.submission import (
@@ -30,14 +32,35 @@ from app.models.submission import (
     SubmissionList,
     SubmissionGradingRequest,
     GradingFeedback,
+    SimilarSubmissionList,
+    ReviewQueue,
+    BulkAcceptRequest,
+    BulkAcceptResult,
 )
-from app.services.gemini_service import GeminiService
+from app.services.feedback_store import (
+    insert_feedback,
+    build_detail_rows,
+    build_criteria_rows,
+)
+from app.services.rubric_service import load_rubric
+from app.services.pregrader import pregrade, PREGRADER_NAME
+from app.services.similarity_index import index_submission, find_similar
+from app.services.analytics_service import refresh_assignment_stats
+from app.services.dashboard_service import invalidate_dashboard
+from app.services.notification_service import queue_feedback_notifications
+from app.services.event_bus import publish_event
+from app.services.review_queue import get_review_queue, accept_submissions
+from app.services.rate_limiter import grading_rate_limiter
+from app.services.grading_retry import record_grading_failure, clear_grading_failure
 import os
 import shutil
 from datetime import datetime, timezone
 
 router = APIRouter()
-gemini_service = GeminiService()
+
+# Advisory lock namespace serializing a student's submission creation
+SUBMISSION_LOCK_NAMESPACE = 43
+SUBMISSION_CREATE_ATTEMPTS = 3
 
 
 # File utilities
@@ -67,6 +90,10 @@ def process_submission_grading(
     """
     Process submission grading using Gemini API.
     This is designed to run as a background task.
+
+    When grading fails no grade is stored; the submission moves to
+    "grading_retry" for the grading retrier, or to "grading_failed" once it
+    has used all its attempts.
     """
     # Get submission
     submission = db.query(Submission).filter(Submission.id == submission_id).first()
@@ -91,6 +118,8 @@ def process_submission_grading(
             submission_text = read_file_content(submission.file_path)
         except Exception as e:
             print(f"Error reading submission file: {e}")
+            # Counts as a failed attempt, so a claimed retry doesn't wait forever
+            record_failed_grading(db, submission, e)
             return
 
     # Get reference solution
@@ -105,62 +134,237 @@ def process_submission_grading(
         except Exception as e:
             print(f"Error reading reference solution file: {e}")
 
+    # Settle trivial submissions locally before calling the LLM
+    pregrade_result = pregrade(
+        submission_text, reference_solution, assignment.points_possible
+    )
+
     # Grade submission
     try:
-        feedback = gemini_service.grade_submission(
-            student_submission=submission_text,
-            reference_solution=reference_solution,
-            total_points=assignment.points_possible,
-            strictness=strictness,
+        graded_by = "GRADiEnt AI"
+        detail_rows = []
+        if pregrade_result.decided:
+            feedback = pregrade_result.feedback
+            graded_by = PREGRADER_NAME
+        else:
+            # Get the assignment's rubric, if any (cached per assignment)
+            rubric = load_rubric(db, assignment.id)
+            gemini_service = get_gemini_service()
+            if rubric:
+                feedback = gemini_service.grade_with_rubric(
+                    student_submission=submission_text,
+                    rubric=rubric,
+                    reference_solution=reference_solution,
+                    total_points=assignment.points_possible,
+                    strictness=strictness,
+                    signals=pregrade_result.signals,
+                )
+                detail_rows = build_criteria_rows(
+                    rubric["criteria"], feedback["criteria_results"]
+                )
+            else:
+                feedback = gemini_service.grade_submission(
+                    student_submission=submission_text,
+                    reference_solution=reference_solution,
+                    total_points=assignment.points_possible,
+                    strictness=strictness,
+                    signals=pregrade_result.signals,
+                )
+        detail_rows += build_detail_rows(feedback.get("improvement_suggestions", []))
+
+        # Prefer the deterministic similarity over the model's estimate
+        similarity_score = pregrade_result.similarity_score
+        if similarity_score is None:
+            similarity_score = feedback.get("similarity_score")
+
+        # Store feedback and its detail rows in one round trip
+        insert_feedback(
+            db,
+            {
+                "submission_id": submission.id,
+                "feedback_text": feedback.get("overall_assessment", ""),
+                "suggested_grade": feedback.get("score", 0),
+                "similarity_score": similarity_score,
+                "graded_by": graded_by,
+                "feedback_generated_at": func.now(),
+            },
+            detail_rows,
         )
 
-        # Create feedback in database
-        db_feedback = Feedback(
-            submission_id=submission.id,
-            feedback_text=feedback.get("overall_assessment", ""),
-            suggested_grade=feedback.get("score", 0),
-            similarity_score=feedback.get("similarity_score"),
-            graded_by="GRADiEnt AI",
-            feedback_generated_at=func.now(),
-        )
-        db.add(db_feedback)
-        db.flush()  # Get the ID without committing
-
-        # Add feedback details with direct SQL using fixed enum values
-        for i, suggestion in enumerate(feedback.get("improvement_suggestions", [])):
-            # Using direct SQL with literal type casting
-            stmt = text(
-                """
-                INSERT INTO feedback_details 
-                (feedback_id, issue_type, issue_location, issue_description, suggestion, severity)
-                VALUES 
-                (:feedback_id, 'content'::issue_type, :issue_location, :issue_description, :suggestion, 'medium'::severity_level)
-            """
-            )
-
-            db.execute(
-                stmt,
-                {
-                    "feedback_id": db_feedback.id,
-                    "issue_description": suggestion,
-                    "suggestion": None,
-                    "issue_location": None,
-                },
-            )
-
         # Update submission status
         submission.status = "graded"
+        clear_grading_failure(submission)
         db.add(submission)
 
+        # Let the student know; delivered by the notification scheduler
+        queue_feedback_notifications(db, [submission.id])
+        # Pushed to the student's open websocket connections on commit
+        publish_event(
+            db,
+            submission.user_id,
+            "submission.graded",
+            submission_id=submission.id,
+            assignment_id=assignment.id,
+            status=submission.status,
+        )
+
         db.commit()
+        invalidate_dashboard(submission.user_id)
     except Exception as e:
         print(f"Error during grading: {e}")
         db.rollback()
+        record_failed_grading(db, submission, e)
+        return
+
+    refresh_grade_analytics(db, assignment.id, [submission.user_id])
+
+
+def record_failed_grading(db: Session, submission: Submission, error: Exception) -> None:
+    """
+    Store the failure state of a submission and tell the student.
+    Runs in its own transaction after the grading transaction is rolled back.
+    """
+    try:
+        record_grading_failure(db, submission, error)
+        publish_event(
+            db,
+            submission.user_id,
+            "submission.grading_failed",
+            submission_id=submission.id,
+            assignment_id=submission.assignment_id,
+            status=submission.status,
+        )
+        db.commit()
+        invalidate_dashboard(submission.user_id)
+    except Exception as e:
+        print(f"Error recording grading failure: {e}")
+        db.rollback()
+
+
+def refresh_grade_analytics(
+    db: Session, assignment_id: int, user_ids: List[int]
+) -> None:
+    """
+    Update the grade statistics of an assignment for students whose grades changed.
+    Runs in its own transaction after grades are committed.
+    """
+    try:
+        refresh_assignment_stats(db, assignment_id, user_ids)
+        db.commit()
+    except Exception as e:
+        print(f"Error refreshing grade analytics: {e}")
+        db.rollback()
+
+
+def update_similarity_index(db: Session, submission_id: int) -> None:
+    """
+    Add a submission to its assignment's near-duplicate index.
+    This is designed to run as a background task.
+    """
+    submission = db.query(Submission).filter(Submission.id == submission_id).first()
+    if not submission:
+        print(f"Submission {submission_id} not found")
+        return
+
+    submission_text = submission.submission_text
+    if not submission_text and submission.file_path:
+        try:
+            submission_text = read_file_content(submission.file_path)
+        except Exception as e:
+            print(f"Error reading submission file: {e}")
+            return
+
+    try:
+        index_submission(db, submission, submission_text)
+        db.commit()
+    except Exception as e:
+        print(f"Error updating similarity index: {e}")
+        db.rollback()
+
+
+@router.post(
+    "/accept",
+    response_model=BulkAcceptResult,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def accept_submission_grades(
+    accept_in: BulkAcceptRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Accept the AI-generated grades of many submissions in one request.
+
+    Select submissions by id or accept every graded submission of an
+    assignment. Permission is checked once per course; the grades are then
+    accepted with a single statement. Submissions that are not in the
+    "graded" state are skipped.
+    """
+    if accept_in.submission_ids:
+        criteria = [Submission.id.in_(accept_in.submission_ids)]
+        course_ids = {
+            course_id
+            for (course_id,) in db.query(Assignment.course_id)
+            .join(Submission, Submission.assignment_id == Assignment.id)
+            .filter(Submission.id.in_(accept_in.submission_ids))
+            .distinct()
+            .all()
+        }
+    else:
+        criteria = [Submission.assignment_id == accept_in.assignment_id]
+        assignment = (
+            db.query(Assignment).filter(Assignment.id == accept_in.assignment_id).first()
+        )
+        if not assignment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found"
+            )
+        course_ids = {assignment.course_id}
+
+    # For professors, check that they teach every affected course
+    if current_user.role == "professor" and course_ids:
+        taught_course_ids = {
+            course_id
+            for (course_id,) in db.query(CourseUser.course_id)
+            .filter(
+                CourseUser.user_id == current_user.id,
+                CourseUser.course_id.in_(course_ids),
+                CourseUser.role == "professor",
+            )
+            .all()
+        }
+
+        if taught_course_ids != course_ids:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to accept grades for this course",
+            )
+
+    accepted = accept_submissions(db, *criteria)
+    db.commit()
+
+    invalidate_dashboard(*{row.user_id for row in accepted})
+
+    # Refresh grade analytics after the response is sent
+    accepted_users = defaultdict(set)
+    for row in accepted:
+        accepted_users[row.assignment_id].add(row.user_id)
+    for assignment_id, user_ids in accepted_users.items():
+        background_tasks.add_task(
+            refresh_grade_analytics, db, assignment_id, sorted(user_ids)
+        )
+
+    return {
+        "accepted": len(accepted),
+        "submission_ids": sorted(row.submission_id for row in accepted),
+    }
 
 
 @router.post("/{submission_id}/accept", response_model=SubmissionResponse)
 def accept_submission_grade(
     submission_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
@@ -225,8 +429,14 @@ def accept_submission_grade(
         db.add(feedback)
 
     db.commit()
+    invalidate_dashboard(submission.user_id)
     db.refresh(submission)
 
+    # Refresh grade analytics after the response is sent
+    background_tasks.add_task(
+        refresh_grade_analytics, db, assignment.id, [submission.user_id]
+    )
+
     # Get assignment title
     assignment_title = assignment.title if assignment else None
 
@@ -286,11 +496,14 @@ def accept_submission_grade(
 @router.post(
     "/", response_model=SubmissionResponse, status_code=status.HTTP_201_CREATED
 )
-async def create_submission(
+def create_submission(
     background_tasks: BackgroundTasks,
     assignment_id: int = Form(...),
     submission_text: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", max_length=255
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
@@ -298,6 +511,8 @@ async def create_submission(
     Create a new submission.
 
     Students can only submit assignments for courses they are enrolled in.
+    Requests repeated with the same ``Idempotency-Key`` header return the
+    submission created by the first one, without storing or grading it again.
     """
     # Validate assignment exists
     assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
@@ -331,25 +546,16 @@ async def create_submission(
             detail="Either file or submission text must be provided",
         )
 
-    # Handle file upload
-    file_name = None
-    file_path = None
-    file_type = None
-
-    if file:
-        # Create directory if it doesn't exist
-        os.makedirs("uploads/submissions", exist_ok=True)
-
-        # Generate unique file name
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        file_name = f"{current_user.id}_{assignment_id}_{timestamp}_{file.filename}"
-        file_path = f"uploads/submissions/{file_name}"
-
-        # Save file
-        save_upload_file(file, file_path)
+    # A retry of a request that already succeeded isn't charged to the rate limit
+    if idempotency_key:
+        existing = find_idempotent_submission(db, current_user.id, idempotency_key)
+        if existing:
+            return idempotent_submission_response(
+                existing, assignment_id, assignment.title
+            )
 
-        # Get file extension
-        file_type = file.filename.split(".")[-1] if "." in file.filename else ""
+    # Every new submission is graded by the AI
+    check_rate_limit(grading_rate_limiter, f"user:{current_user.id}")
 
     # Check if submission is late
     is_late = False
@@ -365,44 +571,142 @@ async def create_submission(
         if now > due_date:
             is_late = True
 
-    # Get attempt number
-    attempt_count = (
-        db.query(Submission)
-        .filter(
-            Submission.assignment_id == assignment_id,
-            Submission.user_id == current_user.id,
-        )
-        .count()
-    )
+    file_name = None
+    file_path = None
+    file_type = None
 
-    # Create submission
-    submission = Submission(
-        assignment_id=assignment_id,
-        user_id=current_user.id,
-        submission_time=func.now(),  # This will be timezone-aware in the database
-        is_late=is_late,
-        file_name=file_name,
-        file_path=file_path,
-        file_type=file_type,
-        submission_text=submission_text,
-        attempt_number=attempt_count + 1,
-        status="submitted",
-    )
+    for _ in range(SUBMISSION_CREATE_ATTEMPTS):
+        try:
+            # Serialize this student's submissions until the transaction ends
+            db.execute(
+                select(
+                    func.pg_advisory_xact_lock(
+                        SUBMISSION_LOCK_NAMESPACE, current_user.id
+                    )
+                )
+            )
 
-    db.add(submission)
-    db.commit()
+            # A concurrent request with the same key may have created it meanwhile
+            if idempotency_key:
+                existing = find_idempotent_submission(
+                    db, current_user.id, idempotency_key
+                )
+                if existing:
+                    try:
+                        return idempotent_submission_response(
+                            existing, assignment_id, assignment.title
+                        )
+                    finally:
+                        db.rollback()
+                        if file_path:
+                            # Saved by an attempt that lost the race
+                            os.remove(file_path)
+
+            # Get attempt number
+            last_attempt = (
+                db.query(func.max(Submission.attempt_number))
+                .filter(
+                    Submission.assignment_id == assignment_id,
+                    Submission.user_id == current_user.id,
+                )
+                .scalar()
+            )
+            attempt_number = (last_attempt or 0) + 1
+
+            # Handle file upload, once the request is known not to be a duplicate
+            if file and not file_path:
+                # Create directory if it doesn't exist
+                os.makedirs("uploads/submissions", exist_ok=True)
+
+                # Generate unique file name
+                timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+                file_name = f"{current_user.id}_{assignment_id}_{attempt_number}_{timestamp}_{file.filename}"
+                file_path = f"uploads/submissions/{file_name}"
+
+                # Save file
+                save_upload_file(file, file_path)
+
+                # Get file extension
+                file_type = file.filename.split(".")[-1] if "." in file.filename else ""
+
+            # Create submission
+            submission = Submission(
+                assignment_id=assignment_id,
+                user_id=current_user.id,
+                submission_time=func.now(),  # This will be timezone-aware in the database
+                is_late=is_late,
+                file_name=file_name,
+                file_path=file_path,
+                file_type=file_type,
+                submission_text=submission_text,
+                attempt_number=attempt_number,
+                status="submitted",
+                idempotency_key=idempotency_key,
+            )
+
+            db.add(submission)
+            db.commit()
+            break
+        except IntegrityError as e:
+            # Another request took the attempt number or idempotency key
+            print(f"Retrying submission creation: {e}")
+            db.rollback()
+    else:
+        if file_path:
+            os.remove(file_path)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The submission could not be created, please try again",
+        )
+
+    invalidate_dashboard(current_user.id)
     db.refresh(submission)
 
-    # Add grading task to background tasks
+    # Index the submission for near-duplicate search, then grade it
+    background_tasks.add_task(
+        update_similarity_index, db=db, submission_id=submission.id
+    )
     background_tasks.add_task(
         process_submission_grading, db=db, submission_id=submission.id
     )
 
-    # Get assignment title for response
-    assignment_title = assignment.title if assignment else None
+    return submission_created_response(submission, assignment.title)
 
-    # Create response with properly formatted fields
-    response = {
+
+def find_idempotent_submission(
+    db: Session, user_id: int, idempotency_key: str
+) -> Optional[Submission]:
+    """Find the submission a user already created with an idempotency key."""
+    return (
+        db.query(Submission)
+        .filter(
+            Submission.user_id == user_id,
+            Submission.idempotency_key == idempotency_key,
+        )
+        .first()
+    )
+
+
+def idempotent_submission_response(
+    existing: Submission, assignment_id: int, assignment_title: str
+) -> dict:
+    """
+    Build the response of a request repeated with an idempotency key.
+
+    Raises:
+        HTTPException: When the key was used for another assignment
+    """
+    if existing.assignment_id != assignment_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key was already used for another assignment",
+        )
+    return submission_created_response(existing, assignment_title)
+
+
+def submission_created_response(submission: Submission, assignment_title: str) -> dict:
+    """Build the response of a newly created submission."""
+    return {
         "id": submission.id,
         "assignment_id": submission.assignment_id,
         "assignment_title": assignment_title,
@@ -418,7 +722,38 @@ async def create_submission(
         "feedback": None,  # No feedback yet since it's being processed
     }
 
-    return response
+
+@router.get(
+    "/review-queue",
+    response_model=ReviewQueue,
+    dependencies=[Depends(check_is_professor_or_admin)],
+)
+def get_submission_review_queue(
+    course_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get AI-graded submissions awaiting professor review.
+
+    Only professors who teach the course (and admins) see its submissions.
+    Items are ordered by due date and submission time; pass ``next_cursor``
+    from a page as ``cursor`` to get the next one.
+    """
+    try:
+        return get_review_queue(
+            db,
+            current_user,
+            course_id=course_id,
+            assignment_id=assignment_id,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{submission_id}", response_model=SubmissionResponse)
@@ -537,6 +872,73 @@ def get_submission(
     return response
 
 
+@router.get("/{submission_id}/similar", response_model=SimilarSubmissionList)
+def get_similar_submissions(
+    submission_id: int,
+    threshold: float = Query(0.5, ge=0, le=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get submissions by other students that are near-duplicates of a submission.
+
+    Thresholds below about 0.42, where the LSH index can't find pairs
+    reliably, compare against every submission of the assignment.
+    Only professors who teach the course can compare submissions.
+    """
+    # Check permission (only professors can compare submissions)
+    if current_user.role not in ["professor", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only professors can compare submissions",
+        )
+
+    # Get submission with its course
+    row = (
+        db.query(Submission.id, Assignment.course_id)
+        .join(Assignment, Submission.assignment_id == Assignment.id)
+        .filter(Submission.id == submission_id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Submission not found"
+        )
+
+    # For professors, check if they teach the course
+    if current_user.role == "professor":
+        professor_course = (
+            db.query(CourseUser)
+            .filter(
+                CourseUser.user_id == current_user.id,
+                CourseUser.course_id == row.course_id,
+                CourseUser.role == "professor",
+            )
+            .first()
+        )
+
+        if not professor_course:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to access submissions for this course",
+            )
+
+    matches = find_similar(db, submission_id, threshold)
+
+    # Get student names for all matches in one query
+    user_ids = {match["user_id"] for match in matches}
+    names = {
+        user.id: f"{user.first_name} {user.last_name}"
+        for user in db.query(User.id, User.first_name, User.last_name).filter(
+            User.id.in_(user_ids)
+        )
+    }
+    for match in matches:
+        match["student_name"] = names.get(match["user_id"])
+
+    return {"submission_id": submission_id, "threshold": threshold, "matches": matches}
+
+
 @router.get("/", response_model=SubmissionList)
 def get_submissions(
     assignment_id: Optional[int] = None,
@@ -721,6 +1123,8 @@ def grade_submission_manually(
                 detail="You don't have permission to grade submissions for this course",
             )
 
+    check_rate_limit(grading_rate_limiter, f"user:{current_user.id}")
+
     # Add grading task to background tasks
     background_tasks.add_task(
         process_submission_grading,
@@ -731,6 +1135,7 @@ def grade_submission_manually(
 
     # Update submission status
     submission.status = "submitted"  # Reset to submitted for regrading
+    clear_grading_failure(submission)
     db.add(submission)
     db.commit()
     db.refresh(submission)
@@ -771,6 +1176,7 @@ def grade_submission_manually(
 @router.post("/{submission_id}/grade_manually", response_model=SubmissionResponse)
 def grade_submission_manually_by_professor(
     submission_id: int,
+    background_tasks: BackgroundTasks,
     grade: float = Form(...),
     feedback_text: str = Form(...),
     db: Session = Depends(get_db),
@@ -853,9 +1259,15 @@ def grade_submission_manually_by_professor(
     db.add(submission)
 
     db.commit()
+    invalidate_dashboard(submission.user_id)
     db.refresh(submission)
     db.refresh(feedback)
 
+    # Refresh grade analytics after the response is sent
+    background_tasks.add_task(
+        refresh_grade_analytics, db, assignment.id, [submission.user_id]
+    )
+
     # Prepare response
     
     assignment_title = assignment.title if assignment else None
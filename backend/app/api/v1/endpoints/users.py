@@ -2,13 +2,15 @@ from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.api.dependencies import get_db
 from app.core.auth import get_current_active_user
 from app.database.models import User, CourseUser, Course
-from app.models.user import UserResponse, UserUpdate, CourseSelection
+from app.models.user import UserResponse, UserUpdate, CourseSelection, UserDashboard
 from app.models.course import CourseResponse
+from app.services.catalog_cache import invalidate_catalog
+from app.services.dashboard_service import get_dashboard, invalidate_dashboard
 
 router = APIRouter()
 
@@ -55,11 +57,35 @@ def update_current_user(
 
     current_user = db.merge(current_user)
     db.commit()
+    if current_user.role == "professor":
+        # Professor names appear in the course catalog
+        invalidate_catalog()
     db.refresh(current_user)
 
     return current_user
 
 
+@router.get("/me/dashboard", response_model=UserDashboard)
+def get_user_dashboard(
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Get the current user's home screen data in one request.
+
+    Returns the user, their enrolled courses, upcoming assignments with the
+    user's latest submission status, and recent feedback. The data is cached
+    per user for a short time.
+
+    Args:
+        db (Session): Database session
+        current_user (User): Current authenticated user
+
+    Returns:
+        UserDashboard: Dashboard data
+    """
+    return {"user": current_user, **get_dashboard(db, current_user)}
+
+
 @router.get("/me/courses", response_model=List[CourseResponse])
 def get_user_courses(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)
@@ -133,25 +159,24 @@ def select_user_courses(
             detail="Students can enroll in a maximum of 3 courses",
         )
     
-    # Create new course enrollments
-    for course_id in new_course_ids:
-        # Create role value as a properly typed ENUM value
+    # Create new course enrollments in a single statement
+    if new_course_ids:
         role_value = "student" if current_user.role == "student" else "professor"
-
-        # Use text() to explicitly cast the string to the ENUM type
-        role_cast = text(f"'{role_value}'::course_user_role")
-
-        # Create the course user with the properly cast role
-        course_user = CourseUser(
-            course_id=course_id,
-            user_id=current_user.id,
+        db.execute(
+            pg_insert(CourseUser)
+            .values(
+                [
+                    {"course_id": course_id, "user_id": current_user.id, "role": role_value}
+                    for course_id in new_course_ids
+                ]
+            )
+            .on_conflict_do_nothing(constraint="unique_course_user")
         )
-        # Set the role using the SQLAlchemy core expression
-        course_user.role = role_cast
-
-        db.add(course_user)
 
     db.commit()
+    if new_course_ids:
+        invalidate_catalog()
+        invalidate_dashboard(current_user.id)
 
     # Get updated course list for the user (including existing and new courses)
     all_course_ids = current_course_ids + new_course_ids
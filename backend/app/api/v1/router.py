@@ -8,6 +8,8 @@ from app.api.v1.endpoints import (
     submissions,
     assignments,
     chat,
+    analytics,
+    events,
 )
 
 # Create API router
@@ -25,3 +27,5 @@ api_router.include_router(
     assignments.router, prefix="/assignments", tags=["Assignments"]
 )
 api_router.include_router(chat.router, prefix="/chat", tags=["Chat"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
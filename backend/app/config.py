@@ -30,6 +30,101 @@ class Settings(BaseSettings):
     # CORS settings
     CORS_ORIGINS: list = ["*"]
 
+    # Gemini settings
+    GEMINI_MODEL: str = "gemini-2.0-flash"
+    GEMINI_CONTEXT_CACHE_ENABLED: bool = True
+    GEMINI_CONTEXT_CACHE_TTL_SECONDS: int = 3600
+    # Provider minimum for explicit context caches; smaller prompts are sent inline
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS: int = 4096
+
+    # LLM backend: "gemini", or "fake" for an offline stand-in with the
+    # latency, error rate and streaming below (used by the benchmarks)
+    LLM_BACKEND: str = "gemini"
+    FAKE_LLM_LATENCY_MS: float = 800
+    FAKE_LLM_LATENCY_JITTER_MS: float = 200
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_STREAM_CHUNK_CHARS: int = 40
+    FAKE_LLM_STREAM_CHUNK_DELAY_MS: float = 30
+    FAKE_LLM_SEED: int = 0
+
+    # Grading settings
+    GRADING_MAX_PARALLEL_CALLS: int = 8
+    RUBRIC_CACHE_TTL_SECONDS: int = 300
+
+    # Course catalog cache (per process; invalidated in every process on course
+    # and enrollment changes)
+    CATALOG_CACHE_TTL_SECONDS: int = 120
+
+    # Grade analytics: medians, percentiles and course statistics are
+    # recomputed on read at most this often while grades keep changing
+    ANALYTICS_DISTRIBUTION_MAX_AGE_SECONDS: int = 60
+
+    # Per-user dashboard cache
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+
+    # Admission control: API requests in flight per worker. Keep it near the
+    # database pool size (5 + 10 overflow by default) so requests queue here,
+    # by priority, rather than on the pool.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 15
+
+    # Rate limits (token buckets). "memory" keeps buckets per process;
+    # "database" shares them between workers through Postgres.
+    RATE_LIMIT_STORE: str = "memory"
+    CHAT_RATE_LIMIT_PER_MINUTE: float = 10
+    CHAT_RATE_LIMIT_BURST: int = 5
+    GUEST_CHAT_RATE_LIMIT_PER_MINUTE: float = 3
+    GUEST_CHAT_RATE_LIMIT_BURST: int = 3
+    # Signed-in chat per client address, on top of the per-user budget. Larger,
+    # since a campus network or NAT puts many users behind one address.
+    CHAT_IP_RATE_LIMIT_PER_MINUTE: float = 60
+    CHAT_IP_RATE_LIMIT_BURST: int = 20
+    GRADING_RATE_LIMIT_PER_MINUTE: float = 20
+    GRADING_RATE_LIMIT_BURST: int = 10
+
+    # Concurrent LLM calls per process; chat gets a share and yields to grading
+    LLM_MAX_CONCURRENT_CALLS: int = 16
+    LLM_MAX_CONCURRENT_CHAT_CALLS: int = 4
+    LLM_CHAT_WAIT_SECONDS: float = 5
+
+    # LLM call resilience: per-call timeout, attempts per call with jittered
+    # exponential backoff on transient errors (429, 5xx, timeouts), and a
+    # circuit breaker that pauses calls after consecutive transient failures
+    LLM_CALL_TIMEOUT_SECONDS: float = 60
+    LLM_GRADING_CALL_ATTEMPTS: int = 3
+    LLM_CHAT_CALL_ATTEMPTS: int = 2
+    LLM_RETRY_BASE_SECONDS: float = 1
+    LLM_RETRY_MAX_SECONDS: float = 20
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 60
+
+    # Submissions whose grading failed are retried by the grading retrier
+    # worker, with exponential backoff, until they have this many attempts
+    GRADING_MAX_ATTEMPTS: int = 5
+    GRADING_RETRY_BASE_SECONDS: int = 60
+    GRADING_RETRY_MAX_SECONDS: int = 3600
+    GRADING_RETRY_POLL_SECONDS: int = 15
+    GRADING_RETRY_BATCH_SIZE: int = 20
+
+    # Chat memory: history tokens sent with each prompt before older turns
+    # are summarized, turns always sent verbatim, and sessions kept in memory
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1500
+    CHAT_RECENT_MESSAGES: int = 6
+    CHAT_SESSION_CACHE_SIZE: int = 1024
+
+    # Course material retrieval for chat: on-disk BM25 index, one shard per
+    # course, and the number of excerpts added to each prompt
+    RETRIEVAL_ENABLED: bool = True
+    RETRIEVAL_INDEX_DIR: str = "data/retrieval_index"
+    RETRIEVAL_TOP_K: int = 4
+
+    # Notification delivery (the scheduler worker sends email through SMTP)
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    SMTP_FROM: str = "GRADiEnt <no-reply@gradient.local>"
+    NOTIFICATION_POLL_SECONDS: int = 60
+    NOTIFICATION_BATCH_SIZE: int = 500
+
     # Database URL
     @property
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,342 @@
+import asyncio
+import heapq
+import itertools
+import json
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from app.config import settings
+
+
+class PriorityClass:
+    """A class of requests sharing a priority and a concurrency limit."""
+
+    def __init__(
+        self,
+        name: str,
+        priority: int,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        retry_after_seconds: int,
+    ):
+        """
+        Initialize a priority class.
+
+        Args:
+            name (str): Class name
+            priority (int): Lower values are admitted first
+            max_concurrency (int): Requests of this class in flight at once
+            max_queue (int): Requests of this class allowed to wait for a slot
+            max_wait_seconds (float): Longest time a request waits before being shed
+            retry_after_seconds (int): Retry-After sent with 503 responses
+        """
+        self.name = name
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+
+class RouteRule:
+    """Maps requests to a priority class, with an optional per-route limit."""
+
+    def __init__(
+        self,
+        name: str,
+        method: Optional[str],
+        path: str,
+        priority_class: str,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize a route rule.
+
+        Args:
+            name (str): Rule name, used for per-route counters
+            method (Optional[str]): HTTP method, or None for any method
+            path (str): Regular expression matched against the path below the API prefix
+            priority_class (str): Name of the priority class
+            max_concurrency (Optional[int]): Requests of this route in flight at once
+        """
+        self.name = name
+        self.method = method
+        self.pattern: Pattern = re.compile(path)
+        self.priority_class = priority_class
+        self.max_concurrency = max_concurrency
+
+    def matches(self, method: str, path: str) -> bool:
+        """Whether the rule applies to a request."""
+        return (self.method is None or self.method == method) and bool(
+            self.pattern.fullmatch(path)
+        )
+
+
+def default_priority_classes(capacity: int) -> Dict[str, PriorityClass]:
+    """
+    Priority classes sized for a worker admitting ``capacity`` requests at once.
+
+    Submission writes may use every slot. Ordinary requests leave a quarter
+    of the slots free for them, and dashboards, search, analytics and chat
+    are held to a small share and shed first.
+    """
+    return {
+        "critical": PriorityClass("critical", 0, capacity, 200, 20.0, 2),
+        "standard": PriorityClass(
+            "standard", 1, max(1, capacity * 3 // 4), 50, 5.0, 5
+        ),
+        "background": PriorityClass(
+            "background", 2, max(1, capacity * 2 // 5), 20, 1.0, 10
+        ),
+    }
+
+
+DEFAULT_ROUTE_RULES = [
+    RouteRule("create_submission", "POST", r"/submissions/?", "critical"),
+    RouteRule("login", "POST", r"/auth/login", "critical"),
+    RouteRule("dashboard", "GET", r"/users/me/dashboard", "background"),
+    RouteRule("search", None, r"/search/.*", "background"),
+    RouteRule("analytics", None, r"/analytics/.*", "background"),
+    RouteRule("chat", None, r"/chat/.*", "background"),
+    RouteRule(
+        "gradebook_export", "GET", r"/courses/\d+/gradebook", "background", 2
+    ),
+]
+
+
+class AdmissionController:
+    """
+    Admits requests into a bounded number of slots, highest priority first.
+
+    A request is admitted when a slot is free and neither its class nor its
+    route is at its limit. Otherwise it waits in a priority queue; requests
+    are shed when their class queue is full or they wait too long. Runs on a
+    single event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        classes: Dict[str, PriorityClass],
+        rules: List[RouteRule],
+    ):
+        """
+        Initialize an admission controller.
+
+        Args:
+            capacity (int): Requests in flight at once across all classes
+            classes (Dict[str, PriorityClass]): Priority classes by name
+            rules (List[RouteRule]): Route rules, first match wins
+        """
+        self.capacity = capacity
+        self.classes = classes
+        self.rules = rules
+        self.in_flight = 0
+        self.class_in_flight: Dict[str, int] = {name: 0 for name in classes}
+        self.route_in_flight: Dict[str, int] = {rule.name: 0 for rule in rules}
+        self.queued: Dict[str, int] = {name: 0 for name in classes}
+        self.admitted: Dict[str, int] = {name: 0 for name in classes}
+        self.rejected: Dict[str, int] = {name: 0 for name in classes}
+        self._waiters: List[Tuple] = []
+        self._sequence = itertools.count()
+
+    def classify(
+        self, method: str, path: str
+    ) -> Tuple[PriorityClass, Optional[RouteRule]]:
+        """
+        Find the priority class and route rule of a request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Path below the API prefix
+
+        Returns:
+            Tuple[PriorityClass, Optional[RouteRule]]: Class, and the matching rule if any
+        """
+        for rule in self.rules:
+            if rule.matches(method, path):
+                return self.classes[rule.priority_class], rule
+        return self.classes["standard"], None
+
+    def _can_admit(self, cls: PriorityClass, rule: Optional[RouteRule]) -> bool:
+        """Whether a slot is free for a request of this class and route."""
+        if self.in_flight >= self.capacity:
+            return False
+        if self.class_in_flight[cls.name] >= cls.max_concurrency:
+            return False
+        if rule is not None and rule.max_concurrency is not None:
+            return self.route_in_flight[rule.name] < rule.max_concurrency
+        return True
+
+    def _admit(self, cls: PriorityClass, rule: Optional[RouteRule]) -> None:
+        """Take a slot."""
+        self.in_flight += 1
+        self.class_in_flight[cls.name] += 1
+        if rule is not None:
+            self.route_in_flight[rule.name] += 1
+        self.admitted[cls.name] += 1
+
+    async def acquire(self, cls: PriorityClass, rule: Optional[RouteRule]) -> bool:
+        """
+        Wait for a slot.
+
+        Args:
+            cls (PriorityClass): Priority class of the request
+            rule (Optional[RouteRule]): Route rule of the request
+
+        Returns:
+            bool: True when admitted, False when the request should be shed
+        """
+        # Freed slots go straight to admissible waiters, so a free slot here
+        # means no waiter could have used it
+        if self._can_admit(cls, rule):
+            self._admit(cls, rule)
+            return True
+
+        if self.queued[cls.name] >= cls.max_queue:
+            self.rejected[cls.name] += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (cls.priority, next(self._sequence), future, cls, rule)
+        )
+        self.queued[cls.name] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(future), cls.max_wait_seconds)
+            return True
+        except asyncio.TimeoutError:
+            if future.done():
+                # Admitted just as the wait timed out
+                return True
+            future.cancel()
+            self.rejected[cls.name] += 1
+            return False
+        except asyncio.CancelledError:
+            # The client went away while waiting
+            if future.done():
+                self.release(cls, rule)
+            else:
+                future.cancel()
+            raise
+        finally:
+            self.queued[cls.name] -= 1
+
+    def release(self, cls: PriorityClass, rule: Optional[RouteRule]) -> None:
+        """
+        Free a slot and admit waiting requests in priority order.
+
+        Args:
+            cls (PriorityClass): Priority class of the finished request
+            rule (Optional[RouteRule]): Route rule of the finished request
+        """
+        self.in_flight -= 1
+        self.class_in_flight[cls.name] -= 1
+        if rule is not None:
+            self.route_in_flight[rule.name] -= 1
+
+        skipped = []
+        while self._waiters and self.in_flight < self.capacity:
+            waiter = heapq.heappop(self._waiters)
+            _, _, future, waiting_cls, waiting_rule = waiter
+            if future.done():
+                # Timed out while waiting
+                continue
+            if self._can_admit(waiting_cls, waiting_rule):
+                self._admit(waiting_cls, waiting_rule)
+                future.set_result(True)
+            else:
+                # Its class or route is full; let lower priorities use the slot
+                skipped.append(waiter)
+        for waiter in skipped:
+            heapq.heappush(self._waiters, waiter)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Current load and counters per priority class."""
+        return {
+            name: {
+                "in_flight": self.class_in_flight[name],
+                "queued": self.queued[name],
+                "admitted": self.admitted[name],
+                "rejected": self.rejected[name],
+            }
+            for name in self.classes
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying admission control to API requests.
+
+    Shed requests get an immediate 503 with Retry-After instead of queuing
+    for the threadpool and the database pool. A slot is released as soon as
+    the response body is sent, so background tasks that run afterwards do
+    not hold it.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application
+            controller (Optional[AdmissionController]): Controller; built from settings when omitted
+        """
+        self.app = app
+        self.controller = controller or AdmissionController(
+            settings.ADMISSION_MAX_CONCURRENCY,
+            default_priority_classes(settings.ADMISSION_MAX_CONCURRENCY),
+            DEFAULT_ROUTE_RULES,
+        )
+        self.prefix = settings.API_V1_STR
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"][len(self.prefix):]
+        cls, rule = self.controller.classify(scope["method"], path)
+
+        if not await self.controller.acquire(cls, rule):
+            await self._reject(send, cls)
+            return
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.controller.release(cls, rule)
+
+        async def send_and_release(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                release()
+
+        try:
+            await self.app(scope, receive, send_and_release)
+        finally:
+            release()
+
+    async def _reject(self, send, cls: PriorityClass) -> None:
+        """Send a 503 response with Retry-After."""
+        body = json.dumps(
+            {"detail": "The server is busy, please retry shortly"}
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"retry-after", str(cls.retry_after_seconds).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -14,44 +14,56 @@ from app.config import settings
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
     """
-    Get current authenticated user.
+    Get the user an access token was issued to.
 
     Args:
         db (Session): Database session
         token (str): JWT token
 
-    Raises:
-        HTTPException: When credentials are invalid
-
     Returns:
-        User: Current user
+        Optional[User]: User, or None when the token is invalid
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
     try:
         # Decode JWT token
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(sub=payload.get("sub"), role=payload.get("role"))
-
-        if token_data.sub is None:
-            raise credentials_exception
     except (JWTError, ValidationError):
-        raise credentials_exception
+        return None
+
+    if token_data.sub is None:
+        return None
 
     # Get user from database
-    user = db.query(User).filter(User.email == token_data.sub).first()
+    return db.query(User).filter(User.email == token_data.sub).first()
+
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Get current authenticated user.
+
+    Args:
+        db (Session): Database session
+        token (str): JWT token
+
+    Raises:
+        HTTPException: When credentials are invalid
+
+    Returns:
+        User: Current user
+    """
+    user = get_user_from_token(db, token)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return user
 
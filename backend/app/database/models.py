@@ -8,6 +8,9 @@ from sqlalchemy import (
     DateTime,
     Enum,
     Float,
+    BigInteger,
+    LargeBinary,
+    Index,
     TIMESTAMP,
     CheckConstraint,
     UniqueConstraint,
@@ -60,6 +63,10 @@ class SubmissionStatus(str, enum.Enum):
     GRADED = "graded"
     ACCEPTED = "accepted"
     RESUBMITTED = "resubmitted"
+    # AI grading failed; retried at next_grading_at
+    GRADING_RETRY = "grading_retry"
+    # AI grading failed on every attempt; needs a manual regrade
+    GRADING_FAILED = "grading_failed"
 
 
 class IssueType(str, enum.Enum):
@@ -185,6 +192,8 @@ class CourseUser(Base):
 
     __table_args__ = (
         UniqueConstraint("course_id", "user_id", name="unique_course_user"),
+        Index("ix_course_users_course_id_role", "course_id", "role"),
+        Index("ix_course_users_user_id", "user_id"),
     )
 
 
@@ -235,6 +244,7 @@ class Assignment(Base):
             name="check_resubmission_after_due",
         ),
         CheckConstraint("points_possible > 0", name="check_positive_points"),
+        Index("ix_assignments_course_id_due_date", "course_id", "due_date"),
     )
 
 
@@ -285,6 +295,10 @@ class Submission(Base):
     status = Column(
         String, default="submitted"
     )  # Using string instead of Enum for compatibility
+    idempotency_key = Column(String(255), nullable=True)
+    grading_failures = Column(Integer, nullable=False, default=0, server_default="0")
+    grading_error = Column(Text, nullable=True)
+    next_grading_at = Column(TIMESTAMP(timezone=True), nullable=True)
     updated_at = Column(
         TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
     )
@@ -304,6 +318,28 @@ class Submission(Base):
             "file_path IS NOT NULL OR submission_text IS NOT NULL",
             name="check_file_or_text_required",
         ),
+        Index("ix_submissions_assignment_id", "assignment_id"),
+        Index("ix_submissions_user_id", "user_id"),
+        Index("ix_submissions_status", "status"),
+        UniqueConstraint(
+            "assignment_id", "user_id", "attempt_number", name="uq_submissions_attempt"
+        ),
+        # A retried request with the same Idempotency-Key maps to one submission
+        Index(
+            "uq_submissions_idempotency_key",
+            "user_id",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("idempotency_key IS NOT NULL"),
+            sqlite_where=text("idempotency_key IS NOT NULL"),
+        ),
+        # Due grading retries, polled by the grading retrier
+        Index(
+            "ix_submissions_next_grading_at",
+            "next_grading_at",
+            postgresql_where=text("status = 'grading_retry'"),
+            sqlite_where=text("status = 'grading_retry'"),
+        ),
     )
 
 
@@ -367,6 +403,17 @@ class Feedback(Base):
         "FeedbackDetail", back_populates="feedback", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_feedback_submission_id", "submission_id"),
+        # Small index over feedback that still awaits professor review
+        Index(
+            "ix_feedback_pending_review",
+            "submission_id",
+            postgresql_where=text("professor_review = false"),
+            sqlite_where=text("professor_review = false"),
+        ),
+    )
+
 
 class FeedbackDetail(Base):
     """Feedback detail model."""
@@ -386,12 +433,17 @@ class FeedbackDetail(Base):
     severity = Column(
         String, nullable=False
     )  # Using string instead of Enum for compatibility
+    rubric_criteria_id = Column(
+        Integer, ForeignKey("rubric_criteria.id", ondelete="SET NULL"), nullable=True
+    )
+    points_awarded = Column(Float, nullable=True)
     created_at = Column(
         TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
     )
 
     # Relationships
     feedback = relationship("Feedback", back_populates="details")
+    rubric_criteria = relationship("RubricCriteria")
 
 
 class Rubric(Base):
@@ -447,6 +499,68 @@ class RubricCriteria(Base):
     )
 
 
+class ChatSession(Base):
+    """Chat conversation of a user with the AI assistant."""
+
+    __tablename__ = "chat_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # Summary of the turns up to summarized_through_id, sent instead of them
+    summary = Column(Text, nullable=True)
+    summarized_through_id = Column(Integer, nullable=False, default=0)
+    message_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+    updated_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    # Relationships
+    messages = relationship(
+        "ChatMessage",
+        back_populates="session",
+        order_by="ChatMessage.id",
+        cascade="all, delete-orphan",
+    )
+
+    __table_args__ = (Index("ix_chat_sessions_user_id", "user_id"),)
+
+
+class ChatMessage(Base):
+    """One turn of a chat conversation."""
+
+    __tablename__ = "chat_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(
+        Integer, ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False
+    )
+    role = Column(String(20), nullable=False)  # "user" or "model"
+    content = Column(Text, nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    # Relationships
+    session = relationship("ChatSession", back_populates="messages")
+
+    __table_args__ = (Index("ix_chat_messages_session_id_id", "session_id", "id"),)
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by API workers for rate limiting."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+
 class Notification(Base):
     """Notification model."""
 
@@ -471,6 +585,175 @@ class Notification(Base):
         TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
     )
 
+    __table_args__ = (
+        # One deadline reminder per student and assignment
+        Index(
+            "uq_notifications_deadline_reminder",
+            "user_id",
+            "related_assignment_id",
+            unique=True,
+            postgresql_where=text("notification_type = 'deadline_reminder'"),
+            sqlite_where=text("notification_type = 'deadline_reminder'"),
+        ),
+        # Delivery queue: notifications not sent yet
+        Index(
+            "ix_notifications_pending",
+            "scheduled_time",
+            postgresql_where=text("sent_time IS NULL"),
+            sqlite_where=text("sent_time IS NULL"),
+        ),
+    )
+
     # Relationships
     user = relationship("User")
     related_assignment = relationship("Assignment")
+
+
+class SubmissionSignature(Base):
+    """MinHash signature of a submission's text for near-duplicate search."""
+
+    __tablename__ = "submission_signatures"
+
+    submission_id = Column(
+        Integer, ForeignKey("submissions.id", ondelete="CASCADE"), primary_key=True
+    )
+    assignment_id = Column(
+        Integer, ForeignKey("assignments.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    signature = Column(LargeBinary, nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    __table_args__ = (
+        Index("ix_submission_signatures_assignment_id", "assignment_id"),
+    )
+
+
+class SubmissionLshBucket(Base):
+    """LSH band bucket of a submission signature."""
+
+    __tablename__ = "submission_lsh_buckets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    submission_id = Column(
+        Integer,
+        ForeignKey("submission_signatures.submission_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    assignment_id = Column(Integer, nullable=False)
+    band = Column(Integer, nullable=False)
+    bucket = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_submission_lsh_buckets_lookup", "assignment_id", "band", "bucket"
+        ),
+    )
+
+
+class AssignmentStats(Base):
+    """Materialized grade statistics of an assignment (in points)."""
+
+    __tablename__ = "assignment_stats"
+
+    assignment_id = Column(
+        Integer, ForeignKey("assignments.id", ondelete="CASCADE"), primary_key=True
+    )
+    course_id = Column(
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False
+    )
+    submission_count = Column(Integer, nullable=False, default=0)
+    student_count = Column(Integer, nullable=False, default=0)
+    late_count = Column(Integer, nullable=False, default=0)
+    graded_count = Column(Integer, nullable=False, default=0)
+    reviewed_count = Column(Integer, nullable=False, default=0)
+    suggested_mean = Column(Float, nullable=True)
+    suggested_median = Column(Float, nullable=True)
+    suggested_p25 = Column(Float, nullable=True)
+    suggested_p75 = Column(Float, nullable=True)
+    suggested_p90 = Column(Float, nullable=True)
+    suggested_min = Column(Float, nullable=True)
+    suggested_max = Column(Float, nullable=True)
+    final_mean = Column(Float, nullable=True)
+    final_median = Column(Float, nullable=True)
+    final_p25 = Column(Float, nullable=True)
+    final_p75 = Column(Float, nullable=True)
+    final_p90 = Column(Float, nullable=True)
+    final_min = Column(Float, nullable=True)
+    final_max = Column(Float, nullable=True)
+    grade_delta_mean = Column(Float, nullable=True)
+    grade_delta_abs_mean = Column(Float, nullable=True)
+    # Running sums updated with each student's grade change; means derive from them
+    suggested_sum = Column(Float, nullable=False, default=0, server_default="0")
+    final_sum = Column(Float, nullable=False, default=0, server_default="0")
+    delta_count = Column(Integer, nullable=False, default=0, server_default="0")
+    grade_delta_sum = Column(Float, nullable=False, default=0, server_default="0")
+    grade_delta_abs_sum = Column(Float, nullable=False, default=0, server_default="0")
+    # Medians, percentiles, min and max are recomputed lazily once stale
+    distribution_stale = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+    distribution_refreshed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    refreshed_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
+
+    __table_args__ = (Index("ix_assignment_stats_course_id", "course_id"),)
+
+
+class AssignmentStudentGrade(Base):
+    """Latest attempt of a student in an assignment, as counted in its statistics."""
+
+    __tablename__ = "assignment_student_grades"
+
+    assignment_id = Column(
+        Integer, ForeignKey("assignments.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    course_id = Column(
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False
+    )
+    attempt_count = Column(Integer, nullable=False, default=0)
+    is_late = Column(Boolean, nullable=False, default=False)
+    suggested_grade = Column(Float, nullable=True)
+    # Released grade: the professor's grade, or the AI grade once accepted
+    final_grade = Column(Float, nullable=True)
+
+    __table_args__ = (Index("ix_assignment_student_grades_course_id", "course_id"),)
+
+
+class CourseStats(Base):
+    """Materialized grade statistics of a course (in percent of points possible)."""
+
+    __tablename__ = "course_stats"
+
+    course_id = Column(
+        Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True
+    )
+    assignment_count = Column(Integer, nullable=False, default=0)
+    submission_count = Column(Integer, nullable=False, default=0)
+    student_count = Column(Integer, nullable=False, default=0)
+    late_count = Column(Integer, nullable=False, default=0)
+    graded_count = Column(Integer, nullable=False, default=0)
+    reviewed_count = Column(Integer, nullable=False, default=0)
+    suggested_mean = Column(Float, nullable=True)
+    suggested_median = Column(Float, nullable=True)
+    suggested_p25 = Column(Float, nullable=True)
+    suggested_p75 = Column(Float, nullable=True)
+    suggested_p90 = Column(Float, nullable=True)
+    suggested_min = Column(Float, nullable=True)
+    suggested_max = Column(Float, nullable=True)
+    final_mean = Column(Float, nullable=True)
+    final_median = Column(Float, nullable=True)
+    final_p25 = Column(Float, nullable=True)
+    final_p75 = Column(Float, nullable=True)
+    final_p90 = Column(Float, nullable=True)
+    final_min = Column(Float, nullable=True)
+    final_max = Column(Float, nullable=True)
+    grade_delta_mean = Column(Float, nullable=True)
+    grade_delta_abs_mean = Column(Float, nullable=True)
+    refreshed_at = Column(
+        TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP")
+    )
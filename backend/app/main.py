@@ -1,15 +1,24 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.v1.router import api_router
 from app.config import settings
+from app.core.admission import AdmissionControlMiddleware
+from app.services.event_bus import event_bus
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Shed low-priority load before it reaches the threadpool and database pool.
+# Added first so CORS headers are still applied to its 503 responses.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +32,18 @@ app.add_middleware(
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
+@app.on_event("startup")
+async def start_event_listener():
+    """Start listening for events to push to websocket clients."""
+    event_bus.start(asyncio.get_running_loop())
+
+
+@app.on_event("shutdown")
+async def stop_event_listener():
+    """Stop the event listener."""
+    event_bus.stop()
+
+
 @app.get("/")
 async def root():
     """
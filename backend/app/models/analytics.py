@@ -0,0 +1,122 @@
+# backend/app/models/analytics.py
+
+from typing import Optional, List
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+
+
+class GradeSource(str, Enum):
+    """Grade column used for distributions and curves."""
+
+    SUGGESTED = "suggested"
+    FINAL = "final"
+
+
+class CurveMethod(str, Enum):
+    """Grade curve method."""
+
+    LINEAR = "linear"
+    SQRT = "sqrt"
+
+
+class GradeDistribution(BaseModel):
+    """Summary statistics of a set of grades."""
+
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    p25: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class GradeStatistics(BaseModel):
+    """Statistics shared by assignment and course analytics."""
+
+    submission_count: int
+    student_count: int
+    late_count: int
+    late_rate: Optional[float] = None
+    graded_count: int
+    reviewed_count: int
+    suggested_grade: GradeDistribution
+    final_grade: GradeDistribution
+    grade_delta_mean: Optional[float] = None
+    grade_delta_abs_mean: Optional[float] = None
+    refreshed_at: Optional[datetime] = None
+
+
+class AssignmentAnalytics(GradeStatistics):
+    """Analytics of an assignment; grades are in points."""
+
+    assignment_id: int
+    assignment_title: Optional[str] = None
+    course_id: int
+
+
+class CourseAnalytics(GradeStatistics):
+    """Analytics of a course; grades are in percent of points possible."""
+
+    course_id: int
+    assignment_count: int
+    assignments: List[AssignmentAnalytics] = []
+
+
+class HistogramBin(BaseModel):
+    """Histogram bin of grades."""
+
+    lower: float
+    upper: float
+    count: int
+
+
+class StudentGrade(BaseModel):
+    """Grade of one student with its position in the distribution."""
+
+    submission_id: int
+    user_id: int
+    student_name: Optional[str] = None
+    grade: float
+    z_score: float
+    percentile_rank: float
+    curved_grade: Optional[float] = None
+
+
+class GradeDistributionResponse(BaseModel):
+    """Grade distribution of an assignment, with an optional curve preview."""
+
+    assignment_id: int
+    points_possible: int
+    source: GradeSource
+    count: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    median: Optional[float] = None
+    histogram: List[HistogramBin]
+    curve: Optional[CurveMethod] = None
+    curved_mean: Optional[float] = None
+    curved_std: Optional[float] = None
+    curved_median: Optional[float] = None
+    curved_histogram: Optional[List[HistogramBin]] = None
+    grades: List[StudentGrade]
+
+
+class CurveRequest(BaseModel):
+    """Request to apply a curve to an assignment's grades."""
+
+    method: CurveMethod
+    source: GradeSource = GradeSource.FINAL
+    target_mean: Optional[float] = Field(None, ge=0)
+    target_std: Optional[float] = Field(None, gt=0)
+
+
+class CurveResult(BaseModel):
+    """Result of applying a curve."""
+
+    assignment_id: int
+    method: CurveMethod
+    updated: int
+    mean: Optional[float] = None
+    curved_mean: Optional[float] = None
@@ -1,6 +1,15 @@
 from typing import Optional, List, Dict
 from pydantic import BaseModel, Field
 from datetime import datetime
+from enum import Enum
+
+
+class CourseUserRole(str, Enum):
+    """Course user role enum."""
+
+    STUDENT = "student"
+    PROFESSOR = "professor"
+    TEACHING_ASSISTANT = "teaching_assistant"
 
 
 class ProfessorInfo(BaseModel):
@@ -56,4 +65,22 @@ class CourseList(BaseModel):
     """Course list model."""
 
     courses: List[CourseResponse]
-    total: int
\ No newline at end of file
+    total: int
+
+
+class BulkEnrollmentRequest(BaseModel):
+    """Bulk enrollment request model."""
+
+    emails: List[str] = Field(..., min_items=1, max_items=5000)
+    # "professor" is only accepted from admins, for professor accounts
+    role: CourseUserRole = CourseUserRole.STUDENT
+
+
+class BulkEnrollmentResult(BaseModel):
+    """Bulk enrollment result model."""
+
+    course_id: int
+    requested: int
+    created: int
+    skipped: int
+    unknown_emails: List[str]
@@ -1,7 +1,7 @@
 # backend/app/models/submission.py
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from enum import Enum
 
@@ -13,6 +13,8 @@ class SubmissionStatus(str, Enum):
     GRADED = "graded"
     ACCEPTED = "accepted"
     RESUBMITTED = "resubmitted"
+    GRADING_RETRY = "grading_retry"
+    GRADING_FAILED = "grading_failed"
 
 
 class GradingFeedback(BaseModel):
@@ -76,3 +78,90 @@ class ManualGradingRequest(BaseModel):
     
     grade: float
     feedback_text: str
+
+
+class SimilarSubmission(BaseModel):
+    """Submission found near-duplicate to another one."""
+
+    submission_id: int
+    user_id: int
+    student_name: Optional[str] = None
+    similarity: float
+
+
+class SimilarSubmissionList(BaseModel):
+    """Near-duplicates of a submission."""
+
+    submission_id: int
+    threshold: float
+    matches: List[SimilarSubmission]
+
+
+class SimilarityPair(BaseModel):
+    """Pair of near-duplicate submissions in an assignment."""
+
+    submission_id: int
+    user_id: int
+    student_name: Optional[str] = None
+    other_submission_id: int
+    other_user_id: int
+    other_student_name: Optional[str] = None
+    similarity: float
+
+
+class SimilarityReport(BaseModel):
+    """All near-duplicate pairs in an assignment."""
+
+    assignment_id: int
+    threshold: float
+    pairs: List[SimilarityPair]
+    total: int
+
+
+class ReviewQueueItem(BaseModel):
+    """AI-graded submission awaiting professor review."""
+
+    submission_id: int
+    submission_time: datetime
+    is_late: Optional[bool] = None
+    attempt_number: Optional[int] = None
+    user_id: int
+    student_name: Optional[str] = None
+    assignment_id: int
+    assignment_title: str
+    due_date: datetime
+    points_possible: int
+    course_id: int
+    course_code: str
+    suggested_grade: Optional[float] = None
+    similarity_score: Optional[float] = None
+    graded_by: Optional[str] = None
+    feedback_generated_at: Optional[datetime] = None
+
+
+class ReviewQueue(BaseModel):
+    """Page of the professor review queue."""
+
+    items: List[ReviewQueueItem]
+    next_cursor: Optional[str] = None
+
+
+class BulkAcceptRequest(BaseModel):
+    """Request to accept the AI grades of many submissions at once."""
+
+    submission_ids: Optional[List[int]] = Field(None, min_items=1, max_items=5000)
+    assignment_id: Optional[int] = None
+
+    @validator("assignment_id", always=True)
+    def submissions_or_assignment(cls, v, values, **kwargs):
+        """Validate that exactly one selector is given."""
+        if (v is None) == (values.get("submission_ids") is None):
+            raise ValueError("Provide either submission_ids or assignment_id")
+        return v
+
+
+class BulkAcceptResult(BaseModel):
+    """Result of a bulk accept."""
+
+    accepted: int
+    submission_ids: List[int]
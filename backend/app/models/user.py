@@ -70,3 +70,56 @@ class CourseSelection(BaseModel):
     """Course selection model."""
 
     course_ids: List[int] = Field(..., min_items=1, max_items=3)
+
+
+class DashboardCourse(BaseModel):
+    """Course on the user dashboard."""
+
+    id: int
+    code: str
+    name: str
+    term: str
+    role: str
+
+
+class DashboardAssignment(BaseModel):
+    """Upcoming assignment with the user's latest attempt."""
+
+    id: int
+    title: str
+    assignment_type: str
+    due_date: datetime
+    points_possible: int
+    allow_resubmissions: Optional[bool] = None
+    resubmission_deadline: Optional[datetime] = None
+    course_id: int
+    course_code: str
+    course_name: str
+    submission_id: Optional[int] = None
+    submission_status: Optional[str] = None
+    attempt_number: Optional[int] = None
+    submission_time: Optional[datetime] = None
+
+
+class DashboardFeedback(BaseModel):
+    """Recently generated feedback on one of the user's submissions."""
+
+    submission_id: int
+    assignment_id: int
+    assignment_title: str
+    course_code: str
+    points_possible: int
+    status: Optional[str] = None
+    score: Optional[float] = None
+    final_grade: Optional[float] = None
+    professor_review: Optional[bool] = None
+    feedback_generated_at: Optional[datetime] = None
+
+
+class UserDashboard(BaseModel):
+    """Everything the home screen needs in one response."""
+
+    user: UserResponse
+    courses: List[DashboardCourse]
+    upcoming_assignments: List[DashboardAssignment]
+    recent_feedback: List[DashboardFeedback]
@@ -0,0 +1,683 @@
+# backend/app/services/analytics_service.py
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import (
+    Assignment,
+    AssignmentStats,
+    AssignmentStudentGrade,
+    CourseStats,
+    Feedback,
+    Submission,
+)
+
+GRADE_STATISTICS = ("mean", "median", "p25", "p75", "p90", "min", "max")
+
+# Counters kept per assignment, changed by the difference between a
+# student's old and new contribution
+COUNTERS = (
+    "submission_count",
+    "student_count",
+    "late_count",
+    "graded_count",
+    "reviewed_count",
+    "suggested_sum",
+    "final_sum",
+    "delta_count",
+    "grade_delta_sum",
+    "grade_delta_abs_sum",
+)
+
+# Percentiles of the distribution, as (statistic, percent)
+PERCENTILES = (("median", 50), ("p25", 25), ("p75", 75), ("p90", 90))
+
+
+def latest_submissions_subquery(*criteria):
+    """Submissions ranked per student and assignment, latest attempt first."""
+    return (
+        select(
+            Submission.id,
+            Submission.assignment_id,
+            Submission.user_id,
+            Submission.is_late,
+            func.count()
+            .over(partition_by=(Submission.assignment_id, Submission.user_id))
+            .label("attempt_count"),
+            func.row_number()
+            .over(
+                partition_by=(Submission.assignment_id, Submission.user_id),
+                order_by=(Submission.attempt_number.desc(), Submission.id.desc()),
+            )
+            .label("rank"),
+        )
+        .join(Assignment, Submission.assignment_id == Assignment.id)
+        .where(*criteria)
+        .subquery("latest_submission")
+    )
+
+
+def latest_feedback_subquery(latest_submission):
+    """Latest feedback of each latest attempt."""
+    return (
+        select(
+            Feedback.id,
+            Feedback.submission_id,
+            Feedback.suggested_grade,
+            Feedback.final_grade,
+            Feedback.professor_review,
+            func.row_number()
+            .over(partition_by=Feedback.submission_id, order_by=Feedback.id.desc())
+            .label("rank"),
+        )
+        .join(latest_submission, Feedback.submission_id == latest_submission.c.id)
+        .where(latest_submission.c.rank == 1)
+        .subquery("latest_feedback")
+    )
+
+
+def _insert(db: Session, model):
+    """INSERT supporting ON CONFLICT on Postgres and on SQLite (benchmarks)."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert(model)
+    return pg_insert(model)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat a naive timestamp read back from SQLite as UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _is_outdated(refreshed_at: Optional[datetime]) -> bool:
+    """Whether lazily computed statistics are older than the allowed age."""
+    refreshed_at = _utc(refreshed_at)
+    if refreshed_at is None:
+        return True
+    age = (datetime.now(timezone.utc) - refreshed_at).total_seconds()
+    return age >= settings.ANALYTICS_DISTRIBUTION_MAX_AGE_SECONDS
+
+
+def contribution(
+    attempt_count: int,
+    is_late: bool,
+    suggested: Optional[float],
+    final: Optional[float],
+) -> Dict[str, float]:
+    """
+    Counters contributed by one student's latest attempt at an assignment.
+
+    Args:
+        attempt_count (int): Submissions of the student; 0 when they have none
+        is_late (bool): Whether the latest attempt was late
+        suggested (Optional[float]): AI grade of the latest attempt
+        final (Optional[float]): Released grade of the latest attempt
+
+    Returns:
+        Dict[str, float]: Value of every counter in COUNTERS
+    """
+    both = suggested is not None and final is not None
+    return {
+        "submission_count": attempt_count,
+        "student_count": 1 if attempt_count else 0,
+        "late_count": 1 if attempt_count and is_late else 0,
+        "graded_count": 1 if suggested is not None else 0,
+        "reviewed_count": 1 if final is not None else 0,
+        "suggested_sum": suggested or 0.0,
+        "final_sum": final or 0.0,
+        "delta_count": 1 if both else 0,
+        "grade_delta_sum": final - suggested if both else 0.0,
+        "grade_delta_abs_sum": abs(final - suggested) if both else 0.0,
+    }
+
+
+def distribution(grades: Iterable[float]) -> Dict[str, Optional[float]]:
+    """
+    Median, percentiles, min and max of grades (linear interpolation, like
+    SQL percentile_cont).
+
+    Args:
+        grades (Iterable[float]): Grades
+
+    Returns:
+        Dict[str, Optional[float]]: Statistics, None when there are no grades
+    """
+    values = np.asarray(list(grades), dtype=float)
+    if not len(values):
+        return {name: None for name in ("median", "p25", "p75", "p90", "min", "max")}
+    stats = {
+        name: float(np.percentile(values, percent)) for name, percent in PERCENTILES
+    }
+    stats["min"] = float(values.min())
+    stats["max"] = float(values.max())
+    return stats
+
+
+def _means(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Mean columns derived from the counters of a statistics row."""
+
+    def mean(total, count):
+        return total / count if count else None
+
+    return {
+        "suggested_mean": mean(counters["suggested_sum"], counters["graded_count"]),
+        "final_mean": mean(counters["final_sum"], counters["reviewed_count"]),
+        "grade_delta_mean": mean(counters["grade_delta_sum"], counters["delta_count"]),
+        "grade_delta_abs_mean": mean(
+            counters["grade_delta_abs_sum"], counters["delta_count"]
+        ),
+    }
+
+
+def _latest_grades(db: Session, assignment_id: int, user_ids=None) -> List[Any]:
+    """
+    Read the latest attempt and grade of students in an assignment.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+        user_ids: Students to read; every student when None
+
+    Returns:
+        List[Any]: Rows (user_id, attempt_count, is_late, suggested_grade, final_grade)
+    """
+    criteria = [Assignment.id == assignment_id]
+    if user_ids is not None:
+        criteria.append(Submission.user_id.in_(user_ids))
+    latest_submission = latest_submissions_subquery(*criteria)
+    latest_feedback = latest_feedback_subquery(latest_submission)
+    final = case(
+        (
+            latest_feedback.c.professor_review.is_(True),
+            func.coalesce(
+                latest_feedback.c.final_grade, latest_feedback.c.suggested_grade
+            ),
+        )
+    )
+    return db.execute(
+        select(
+            latest_submission.c.user_id,
+            latest_submission.c.attempt_count,
+            latest_submission.c.is_late,
+            latest_feedback.c.suggested_grade,
+            final.label("final_grade"),
+        )
+        .select_from(latest_submission)
+        .outerjoin(
+            latest_feedback,
+            and_(
+                latest_feedback.c.submission_id == latest_submission.c.id,
+                latest_feedback.c.rank == 1,
+            ),
+        )
+        .where(latest_submission.c.rank == 1)
+    ).all()
+
+
+def _grade_row(assignment_id: int, course_id: int, user_id: int, row) -> Dict[str, Any]:
+    """Values of an assignment_student_grades row; ``row`` None means no attempts."""
+    return {
+        "assignment_id": assignment_id,
+        "user_id": user_id,
+        "course_id": course_id,
+        "attempt_count": row.attempt_count if row else 0,
+        "is_late": bool(row.is_late) if row else False,
+        "suggested_grade": row.suggested_grade if row else None,
+        "final_grade": row.final_grade if row else None,
+    }
+
+
+def rebuild_assignment_stats(db: Session, assignment_id: int) -> None:
+    """
+    Recompute the statistics of an assignment from all of its submissions.
+
+    Used to backfill statistics and after changes to many grades at once,
+    such as a curve. The caller commits.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+    """
+    course_id = (
+        db.query(Assignment.course_id).filter(Assignment.id == assignment_id).scalar()
+    )
+    if course_id is None:
+        return
+
+    rows = {row.user_id: row for row in _latest_grades(db, assignment_id)}
+    values = [
+        _grade_row(assignment_id, course_id, user_id, rows[user_id])
+        for user_id in sorted(rows)
+    ]
+
+    # Upsert in user order, the order incremental updates lock rows in
+    grade_table = AssignmentStudentGrade.__table__
+    if values:
+        stmt = _insert(db, AssignmentStudentGrade).values(values)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[grade_table.c.assignment_id, grade_table.c.user_id],
+                set_={
+                    name: stmt.excluded[name]
+                    for name in ("course_id", "attempt_count", "is_late", "suggested_grade", "final_grade")
+                },
+            )
+        )
+    db.execute(
+        delete(AssignmentStudentGrade)
+        .where(
+            AssignmentStudentGrade.assignment_id == assignment_id,
+            AssignmentStudentGrade.user_id.not_in(list(rows)),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    counters = {name: 0 for name in COUNTERS}
+    for value in values:
+        for name, amount in contribution(
+            value["attempt_count"],
+            value["is_late"],
+            value["suggested_grade"],
+            value["final_grade"],
+        ).items():
+            counters[name] += amount
+
+    row = {
+        "assignment_id": assignment_id,
+        "course_id": course_id,
+        **counters,
+        **_means(counters),
+        **_prefixed_distributions(values),
+        "distribution_stale": False,
+        "distribution_refreshed_at": datetime.now(timezone.utc),
+        "refreshed_at": datetime.now(timezone.utc),
+    }
+    stmt = _insert(db, AssignmentStats).values(row)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AssignmentStats.__table__.c.assignment_id],
+            set_={name: stmt.excluded[name] for name in row if name != "assignment_id"},
+        )
+    )
+
+
+def _prefixed_distributions(values: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Distribution columns of suggested and final grades."""
+    columns = {}
+    for prefix in ("suggested", "final"):
+        grades = [
+            value[f"{prefix}_grade"]
+            for value in values
+            if value[f"{prefix}_grade"] is not None
+        ]
+        for name, stat in distribution(grades).items():
+            columns[f"{prefix}_{name}"] = stat
+    return columns
+
+
+def refresh_assignment_stats(
+    db: Session, assignment_id: int, user_ids: Optional[Iterable[int]] = None
+) -> None:
+    """
+    Update the statistics of an assignment after grades of some students changed.
+
+    Only those students' latest attempts are read. Their previous
+    contribution is replaced by the new one in the assignment's running
+    counters and means, so the cost doesn't grow with the class size.
+    Medians and percentiles are only marked stale; they are recomputed when
+    read. Course statistics are derived on read as well. Without students,
+    or before the assignment has statistics, everything is rebuilt.
+    The caller commits.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment whose grades changed
+        user_ids (Optional[Iterable[int]]): Students whose grades changed
+    """
+    stats = (
+        db.query(AssignmentStats.course_id)
+        .filter(AssignmentStats.assignment_id == assignment_id)
+        .first()
+    )
+    if user_ids is None or stats is None:
+        rebuild_assignment_stats(db, assignment_id)
+        return
+
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+
+    # Lock the students' rows (in user order) so concurrent updates of the
+    # same student apply their changes one after the other
+    db.execute(
+        _insert(db, AssignmentStudentGrade)
+        .values(
+            [
+                _grade_row(assignment_id, stats.course_id, user_id, None)
+                for user_id in user_ids
+            ]
+        )
+        .on_conflict_do_nothing()
+    )
+    old_rows = {
+        row.user_id: row
+        for row in db.execute(
+            select(AssignmentStudentGrade)
+            .where(
+                AssignmentStudentGrade.assignment_id == assignment_id,
+                AssignmentStudentGrade.user_id.in_(user_ids),
+            )
+            .order_by(AssignmentStudentGrade.user_id)
+            .with_for_update()
+        ).scalars()
+    }
+    new_rows = {row.user_id: row for row in _latest_grades(db, assignment_id, user_ids)}
+
+    deltas = {name: 0 for name in COUNTERS}
+    updates = []
+    for user_id in user_ids:
+        old = old_rows[user_id]
+        new = _grade_row(assignment_id, stats.course_id, user_id, new_rows.get(user_id))
+        before = contribution(
+            old.attempt_count, old.is_late, old.suggested_grade, old.final_grade
+        )
+        after = contribution(
+            new["attempt_count"], new["is_late"], new["suggested_grade"], new["final_grade"]
+        )
+        for name in COUNTERS:
+            deltas[name] += after[name] - before[name]
+        updates.append(new)
+
+    db.execute(update(AssignmentStudentGrade), updates)
+
+    # Means follow from the updated counters, computed in the same statement
+    columns = {
+        name: getattr(AssignmentStats, name) + deltas[name] for name in COUNTERS
+    }
+
+    def mean(total, count):
+        return columns[total] / func.nullif(columns[count], 0)
+
+    db.execute(
+        update(AssignmentStats)
+        .where(AssignmentStats.assignment_id == assignment_id)
+        .values(
+            **columns,
+            suggested_mean=mean("suggested_sum", "graded_count"),
+            final_mean=mean("final_sum", "reviewed_count"),
+            grade_delta_mean=mean("grade_delta_sum", "delta_count"),
+            grade_delta_abs_mean=mean("grade_delta_abs_sum", "delta_count"),
+            distribution_stale=True,
+            refreshed_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def load_assignment_stats(db: Session, assignment_id: int) -> Optional[AssignmentStats]:
+    """
+    Read the statistics of an assignment, bringing stale parts up to date.
+
+    Statistics are built on first read. A stale distribution is recomputed
+    from the per-student rows, at most once per
+    ANALYTICS_DISTRIBUTION_MAX_AGE_SECONDS. Commits when it writes.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+
+    Returns:
+        Optional[AssignmentStats]: Statistics row, None if the assignment doesn't exist
+    """
+    stats = (
+        db.query(AssignmentStats)
+        .filter(AssignmentStats.assignment_id == assignment_id)
+        .first()
+    )
+    if stats is None:
+        rebuild_assignment_stats(db, assignment_id)
+        db.commit()
+    elif stats.distribution_stale and _is_outdated(stats.distribution_refreshed_at):
+        refresh_assignment_distribution(db, assignment_id)
+        db.commit()
+    else:
+        return stats
+
+    return (
+        db.query(AssignmentStats)
+        .filter(AssignmentStats.assignment_id == assignment_id)
+        .first()
+    )
+
+
+def refresh_assignment_distribution(db: Session, assignment_id: int) -> None:
+    """
+    Recompute the medians, percentiles, min and max of an assignment.
+
+    Reads the per-student grade rows of the assignment. The caller commits.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+    """
+    values = [
+        {"suggested_grade": suggested, "final_grade": final}
+        for suggested, final in db.query(
+            AssignmentStudentGrade.suggested_grade, AssignmentStudentGrade.final_grade
+        ).filter(AssignmentStudentGrade.assignment_id == assignment_id)
+    ]
+    db.execute(
+        update(AssignmentStats)
+        .where(AssignmentStats.assignment_id == assignment_id)
+        .values(
+            **_prefixed_distributions(values),
+            distribution_stale=False,
+            distribution_refreshed_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_course_stats(db: Session, course_id: int) -> None:
+    """
+    Recompute the statistics of a course and all of its assignments.
+
+    Used to backfill statistics; grading updates a single assignment.
+    The caller commits.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+    """
+    assignment_ids = (
+        db.query(Assignment.id).filter(Assignment.course_id == course_id).all()
+    )
+    for (assignment_id,) in assignment_ids:
+        rebuild_assignment_stats(db, assignment_id)
+    refresh_course_stats(db, course_id)
+
+
+def refresh_course_stats(db: Session, course_id: int) -> None:
+    """
+    Derive the statistics of a course from its assignments' statistics.
+
+    Counts and means come from the per-assignment counters, grades scaled to
+    percent of points possible. Distinct students and the distribution come
+    from the per-student rows. The caller commits.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+    """
+    assignment_count = (
+        db.query(func.count(Assignment.id)).filter(Assignment.course_id == course_id).scalar()
+    )
+
+    counters = {name: 0 for name in COUNTERS}
+    rows = (
+        db.query(AssignmentStats, Assignment.points_possible)
+        .join(Assignment, Assignment.id == AssignmentStats.assignment_id)
+        .filter(AssignmentStats.course_id == course_id)
+        .all()
+    )
+    for stats, points_possible in rows:
+        scale = 100.0 / points_possible if points_possible else 0.0
+        for name in COUNTERS:
+            value = getattr(stats, name) or 0
+            counters[name] += value * scale if name.endswith("_sum") else value
+
+    student_count = (
+        db.query(func.count(AssignmentStudentGrade.user_id.distinct()))
+        .filter(
+            AssignmentStudentGrade.course_id == course_id,
+            AssignmentStudentGrade.attempt_count > 0,
+        )
+        .scalar()
+    )
+
+    values = [
+        {
+            "suggested_grade": suggested * 100.0 / points if suggested is not None and points else None,
+            "final_grade": final * 100.0 / points if final is not None and points else None,
+        }
+        for suggested, final, points in db.query(
+            AssignmentStudentGrade.suggested_grade,
+            AssignmentStudentGrade.final_grade,
+            Assignment.points_possible,
+        )
+        .join(Assignment, Assignment.id == AssignmentStudentGrade.assignment_id)
+        .filter(AssignmentStudentGrade.course_id == course_id)
+    ]
+
+    row = {
+        "course_id": course_id,
+        "assignment_count": assignment_count,
+        "submission_count": counters["submission_count"],
+        "student_count": student_count,
+        "late_count": counters["late_count"],
+        "graded_count": counters["graded_count"],
+        "reviewed_count": counters["reviewed_count"],
+        **_means(counters),
+        **_prefixed_distributions(values),
+        "refreshed_at": datetime.now(timezone.utc),
+    }
+    stmt = _insert(db, CourseStats).values(row)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CourseStats.__table__.c.course_id],
+            set_={name: stmt.excluded[name] for name in row if name != "course_id"},
+        )
+    )
+
+
+def load_course_stats(db: Session, course_id: int) -> CourseStats:
+    """
+    Read the statistics of a course, deriving them again once outdated.
+
+    Course statistics are never written while grading; they are derived
+    from the assignment statistics on read, at most once per
+    ANALYTICS_DISTRIBUTION_MAX_AGE_SECONDS. Stale distributions of the
+    course's assignments are recomputed at the same pace. Commits when it
+    writes.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+
+    Returns:
+        CourseStats: Statistics row
+    """
+    stale = [
+        assignment_id
+        for assignment_id, refreshed_at in db.query(
+            AssignmentStats.assignment_id, AssignmentStats.distribution_refreshed_at
+        ).filter(
+            AssignmentStats.course_id == course_id,
+            AssignmentStats.distribution_stale.is_(True),
+        )
+        if _is_outdated(refreshed_at)
+    ]
+    for assignment_id in stale:
+        refresh_assignment_distribution(db, assignment_id)
+
+    stats = db.query(CourseStats).filter(CourseStats.course_id == course_id).first()
+    if stats is None:
+        # Statistics have never been computed for this course
+        rebuild_course_stats(db, course_id)
+    elif _is_outdated(stats.refreshed_at):
+        refresh_course_stats(db, course_id)
+    elif not stale:
+        return stats
+
+    db.commit()
+    return db.query(CourseStats).filter(CourseStats.course_id == course_id).first()
+
+
+def _serialize(stats) -> Dict[str, Any]:
+    """Build the response fields shared by assignment and course statistics."""
+    return {
+        "submission_count": stats.submission_count,
+        "student_count": stats.student_count,
+        "late_count": stats.late_count,
+        "late_rate": (
+            round(stats.late_count / stats.student_count, 4)
+            if stats.student_count
+            else None
+        ),
+        "graded_count": stats.graded_count,
+        "reviewed_count": stats.reviewed_count,
+        "suggested_grade": {
+            name: getattr(stats, f"suggested_{name}") for name in GRADE_STATISTICS
+        },
+        "final_grade": {
+            name: getattr(stats, f"final_{name}") for name in GRADE_STATISTICS
+        },
+        "grade_delta_mean": stats.grade_delta_mean,
+        "grade_delta_abs_mean": stats.grade_delta_abs_mean,
+        "refreshed_at": stats.refreshed_at,
+    }
+
+
+def serialize_assignment_stats(
+    stats: AssignmentStats, assignment_title: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Convert an assignment statistics row to a response dict.
+
+    Args:
+        stats (AssignmentStats): Statistics row
+        assignment_title (Optional[str]): Assignment title
+
+    Returns:
+        Dict[str, Any]: Assignment analytics
+    """
+    return {
+        "assignment_id": stats.assignment_id,
+        "assignment_title": assignment_title,
+        "course_id": stats.course_id,
+        **_serialize(stats),
+    }
+
+
+def serialize_course_stats(stats: CourseStats) -> Dict[str, Any]:
+    """
+    Convert a course statistics row to a response dict.
+
+    Args:
+        stats (CourseStats): Statistics row
+
+    Returns:
+        Dict[str, Any]: Course analytics, grades in percent of points possible
+    """
+    return {
+        "course_id": stats.course_id,
+        "assignment_count": stats.assignment_count,
+        **_serialize(stats),
+    }
@@ -0,0 +1,71 @@
+# backend/app/services/catalog_cache.py
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+from cachetools import TTLCache
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.services.event_bus import broadcast_invalidation, event_bus
+
+# Rendered catalog responses (JSON body and ETag) keyed by endpoint and parameters
+_catalog_cache: TTLCache = TTLCache(
+    maxsize=512, ttl=settings.CATALOG_CACHE_TTL_SECONDS
+)
+_catalog_cache_lock = threading.Lock()
+# Bumped on every invalidation so responses built from older data are not stored
+_catalog_generation = 0
+
+
+def get_catalog_response(
+    key: Hashable, build: Callable[[], Any]
+) -> Tuple[bytes, str]:
+    """
+    Get a rendered catalog response, building it on a cache miss.
+
+    Args:
+        key (Hashable): Cache key identifying the endpoint and its parameters
+        build (Callable[[], Any]): Produces the response data from the database
+
+    Returns:
+        Tuple[bytes, str]: JSON body and its ETag
+    """
+    with _catalog_cache_lock:
+        cached = _catalog_cache.get(key)
+        generation = _catalog_generation
+    if cached is not None:
+        return cached
+
+    body = json.dumps(
+        jsonable_encoder(build()), separators=(",", ":")
+    ).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    with _catalog_cache_lock:
+        if generation == _catalog_generation:
+            _catalog_cache[key] = (body, etag)
+    return body, etag
+
+
+def _clear_catalog(keys=None) -> None:
+    """Drop all cached catalog responses of this process."""
+    global _catalog_generation
+    with _catalog_cache_lock:
+        _catalog_generation += 1
+        _catalog_cache.clear()
+
+
+def invalidate_catalog() -> None:
+    """
+    Drop all cached catalog responses, in this and every other process.
+
+    Called after courses, enrollments or professors change, once the change
+    is committed. Other workers drop theirs when the broadcast reaches them.
+    """
+    _clear_catalog()
+    broadcast_invalidation("catalog")
+
+
+event_bus.on_invalidate("catalog", _clear_catalog)
@@ -0,0 +1,247 @@
+# backend/app/services/chat_memory.py
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from cachetools import LRUCache
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import ChatMessage, ChatSession
+
+# Turns loaded for a session that has not been summarized yet
+MAX_LOADED_MESSAGES = 200
+
+SUMMARY_ACKNOWLEDGEMENT = "Understood, I'll continue from there."
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class ChatContext:
+    """Summary and unsummarized turns of a conversation, as sent to the model."""
+
+    def __init__(
+        self,
+        message_count: int,
+        summary: Optional[str],
+        summarized_through_id: int,
+        turns: List[Tuple[int, str, str]],
+    ):
+        """
+        Initialize a chat context.
+
+        Args:
+            message_count (int): Messages in the conversation when loaded
+            summary (Optional[str]): Summary of the older turns
+            summarized_through_id (int): Last message ID covered by the summary
+            turns (List[Tuple[int, str, str]]): (message ID, role, text) after the summary
+        """
+        self.message_count = message_count
+        self.summary = summary
+        self.summarized_through_id = summarized_through_id
+        self.turns = turns
+
+    def history(self) -> List[Tuple[str, str]]:
+        """
+        Build the (role, text) turns to send before the next prompt.
+
+        The summary comes first, followed by the newest turns that fit in the
+        history token budget.
+
+        Returns:
+            List[Tuple[str, str]]: Conversation history
+        """
+        budget = settings.CHAT_HISTORY_TOKEN_BUDGET
+        recent: List[Tuple[str, str]] = []
+        for _, role, text in reversed(self.turns):
+            budget -= estimate_tokens(text)
+            if budget < 0 and recent:
+                break
+            recent.append((role, text))
+        recent.reverse()
+
+        # Gemini expects the conversation to start with a user turn
+        while recent and recent[0][0] != "user":
+            recent.pop(0)
+
+        if not self.summary:
+            return recent
+        return [
+            ("user", f"Summary of our conversation so far:\n{self.summary}"),
+            ("model", SUMMARY_ACKNOWLEDGEMENT),
+            *recent,
+        ]
+
+    def needs_summary(self) -> bool:
+        """Whether the unsummarized turns exceed the history token budget."""
+        return (
+            len(self.turns) > settings.CHAT_RECENT_MESSAGES
+            and sum(estimate_tokens(text) for _, _, text in self.turns)
+            > settings.CHAT_HISTORY_TOKEN_BUDGET
+        )
+
+
+# Contexts of recently active conversations, keyed by session id. A cached
+# context is used only while its message count and summary position match
+# the session row, so changes made by another worker are never missed.
+_context_cache: LRUCache = LRUCache(maxsize=settings.CHAT_SESSION_CACHE_SIZE)
+_context_cache_lock = threading.Lock()
+
+
+def get_session(
+    db: Session, user_id: int, conversation_id: Optional[int]
+) -> Optional[ChatSession]:
+    """
+    Get a conversation of a user, or start a new one when no ID is given.
+
+    Args:
+        db (Session): Database session
+        user_id (int): User ID
+        conversation_id (Optional[int]): Conversation ID
+
+    Returns:
+        Optional[ChatSession]: Conversation, or None if it doesn't exist or belongs to someone else
+    """
+    if conversation_id is None:
+        session = ChatSession(user_id=user_id, message_count=0, summarized_through_id=0)
+        db.add(session)
+        db.flush()
+        return session
+
+    return (
+        db.query(ChatSession)
+        .filter(ChatSession.id == conversation_id, ChatSession.user_id == user_id)
+        .first()
+    )
+
+
+def load_context(db: Session, session: ChatSession) -> ChatContext:
+    """
+    Get the context of a conversation from memory, or load it from the database.
+
+    Args:
+        db (Session): Database session
+        session (ChatSession): Conversation
+
+    Returns:
+        ChatContext: Conversation context
+    """
+    with _context_cache_lock:
+        context = _context_cache.get(session.id)
+    if (
+        context is not None
+        and context.message_count == session.message_count
+        and context.summarized_through_id == session.summarized_through_id
+    ):
+        return context
+
+    rows = (
+        db.query(ChatMessage.id, ChatMessage.role, ChatMessage.content)
+        .filter(
+            ChatMessage.session_id == session.id,
+            ChatMessage.id > session.summarized_through_id,
+        )
+        .order_by(ChatMessage.id.desc())
+        .limit(MAX_LOADED_MESSAGES)
+        .all()
+    )
+    context = ChatContext(
+        session.message_count,
+        session.summary,
+        session.summarized_through_id,
+        [(row.id, row.role, row.content) for row in reversed(rows)],
+    )
+    with _context_cache_lock:
+        _context_cache[session.id] = context
+    return context
+
+
+def append_turns(
+    db: Session, session: ChatSession, context: ChatContext, prompt: str, reply: str
+) -> None:
+    """
+    Store a prompt and its reply, and add them to the cached context.
+
+    The caller commits.
+
+    Args:
+        db (Session): Database session
+        session (ChatSession): Conversation
+        context (ChatContext): Context the reply was generated from
+        prompt (str): User prompt
+        reply (str): Model reply
+    """
+    messages = [
+        ChatMessage(session_id=session.id, role="user", content=prompt),
+        ChatMessage(session_id=session.id, role="model", content=reply),
+    ]
+    db.add_all(messages)
+    session.message_count = ChatSession.message_count + 2
+    session.updated_at = func.now()
+    db.flush()
+    db.refresh(session, ["message_count"])
+
+    with _context_cache_lock:
+        if session.message_count != context.message_count + 2:
+            # Another request added turns meanwhile; reload next time
+            _context_cache.pop(session.id, None)
+            return
+        _context_cache[session.id] = ChatContext(
+            session.message_count,
+            context.summary,
+            context.summarized_through_id,
+            context.turns + [(m.id, m.role, m.content) for m in messages],
+        )
+
+
+def summarize_conversation(
+    db: Session,
+    session_id: int,
+    summarize: Callable[[Optional[str], List[Tuple[str, str]]], Optional[str]],
+) -> None:
+    """
+    Fold the older turns of a conversation into its summary when it grows too long.
+
+    The newest ``CHAT_RECENT_MESSAGES`` turns stay verbatim. This is designed
+    to run as a background task after the reply is sent.
+
+    Args:
+        db (Session): Database session
+        session_id (int): Conversation ID
+        summarize: Produces a new summary from the old summary and the turns to fold in
+    """
+    try:
+        session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+        if not session:
+            return
+
+        context = load_context(db, session)
+        if not context.needs_summary():
+            return
+
+        older = context.turns[: -settings.CHAT_RECENT_MESSAGES]
+        summary = summarize(context.summary, [(role, text) for _, role, text in older])
+        if not summary:
+            return
+
+        # Only move forward; another worker may have summarized meanwhile
+        db.query(ChatSession).filter(
+            ChatSession.id == session_id,
+            ChatSession.summarized_through_id == context.summarized_through_id,
+        ).update(
+            {
+                ChatSession.summary: summary,
+                ChatSession.summarized_through_id: older[-1][0],
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+
+        with _context_cache_lock:
+            _context_cache.pop(session_id, None)
+    except Exception as e:
+        print(f"Error summarizing chat session {session_id}: {e}")
+        db.rollback()
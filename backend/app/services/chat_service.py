@@ -1,98 +1,84 @@
 # backend/app/services/chat_service.py
 import json
-from typing import Dict, Any
-import os
-from google import genai
-from google.genai import types
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.config import settings
+from app.services.llm_client import create_llm_client
+from app.services.llm_resilience import call_llm
+from app.services.prompt_registry import prompt_registry
+from app.services.rate_limiter import LLMBudgetExceeded, llm_budget
 
 
 class ChatService:
     """Service for interacting with Google's Gemini API for chat functionality."""
 
     def __init__(self):
-        """Initialize Gemini API client."""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable not set")
-        self.client = genai.Client(api_key=api_key)
+        """Initialize the LLM client selected by the LLM_BACKEND setting."""
+        self.client = create_llm_client()
 
-    def generate_response(self, prompt: str) -> Dict[str, Any]:
+    def _generate(self, model: str, contents: Any, generate_content_config: Any) -> Any:
+        """
+        Make a chat call, retrying transient errors.
+
+        A chat LLM slot is held per attempt, not across the backoff between
+        attempts, so a retrying chat doesn't keep capacity from grading.
+
+        Args:
+            model (str): Model name
+            contents (Any): Request contents
+            generate_content_config (Any): Request config
+
+        Raises:
+            LLMBudgetExceeded: When grading is using the LLM capacity
+            Exception: When the call fails after its retries
+
+        Returns:
+            Any: Model response
+        """
+
+        def call() -> Any:
+            with llm_budget.slot("chat", timeout=settings.LLM_CHAT_WAIT_SECONDS):
+                return self.client.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=generate_content_config,
+                )
+
+        return call_llm(call, "chat")
+
+    def generate_response(
+        self,
+        prompt: str,
+        history: Optional[List[Tuple[str, str]]] = None,
+        course_context: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Generate a chat response using Gemini API.
 
         Args:
             prompt (str): User's prompt
+            history (Optional[List[Tuple[str, str]]]): Earlier (role, text) turns of the conversation
+            course_context (Optional[str]): Course material excerpts relevant to the prompt
+
+        Raises:
+            LLMBudgetExceeded: When grading is using the LLM capacity
 
         Returns:
             Dict[str, Any]: Response from the model
         """
-        model = "gemini-2.0-flash"
-        contents = [
-            types.Content(
-                role="user",
-                parts=[
-                    types.Part.from_text(text=prompt),
-                ],
-            ),
-        ]
-        generate_content_config = types.GenerateContentConfig(
-            response_mime_type="text/plain",
-            system_instruction=types.Content(
-                role="system",
-                parts=[
-                    types.Part.from_text(
-                        text="""SYSTEM PROMPT:
-
-You are Neuron, an AI teaching assistant specifically designed to help students learn and navigate the GRADiEnt learning platform. 
-
-GRADiEnt is an educational platform that:
-- Provides AI-powered instant feedback on student assignments
-- Allows students to register for courses
-- Enables submission of assignments in various formats (text, file uploads)
-- Features automated grading with professor review
-- Organizes courses by terms with enrollment capabilities
-- Offers detailed feedback on submissions with improvement suggestions
-
-Your primary purpose is to guide students toward knowledge and provide comprehensive educational assistance. You should:
-
-1. Provide direct, concise answers to student questions without asking unnecessary follow-up questions
-2. Explain how to register for courses, submit assignments, and view feedback clearly and efficiently
-3. Give helpful information about assignments based on whatever context is available
-4. Provide guidance on interpreting feedback and improving submissions
-5. Explain platform features like course registration, submission processes, and grading
-6. **Teach academic concepts completely and thoroughly when asked**
-7. **Provide in-depth educational content on any curriculum topics**
-
-When students ask for help with specific assignment tasks or to learn any academic subject, ALWAYS provide comprehensive teaching:
-- For coding assignments: Provide detailed algorithm explanations, pseudocode, or code snippets that demonstrate concepts with thorough explanations
-- For essays: Offer structural guidance, thesis statement assistance, or paragraph organization tips
-- For presentations: Suggest effective slide organization, visual elements, or speaking points
-- For other academic work: Provide conceptual frameworks, methodological approaches, or resource suggestions
-- **For direct learning requests: Teach the topic completely, explaining concepts from fundamentals to advanced applications**
-
-Never refuse to help with legitimate academic questions or teaching requests. When a student asks you to teach a topic, provide a structured, educational explanation of the subject.
-
-Only ask clarifying questions when absolutely necessary to provide assistance. Focus on giving comprehensive answers with the information you have available.
-
-Always maintain a helpful, educational tone. Your goal is to empower students to succeed academically by providing both platform assistance and direct educational content.
-
-Remember key platform features:
-- Course registration system with term-based organization
-- Assignment submission with both text and file upload options
-- AI-powered automated grading with professor review
-- Detailed feedback with improvement suggestions
-- Dashboard showing enrolled courses and upcoming assignments"""
-                    ),
-                ],
-            ),
+        if course_context:
+            prompt = (
+                f"Course material that may be relevant:\n{course_context}"
+                f"\n\nStudent question:\n{prompt}"
+            )
+        model, contents, generate_content_config = prompt_registry.request_for(
+            self.client, "chat", prompt, history
         )
         try:
-            response = self.client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=generate_content_config,
-            )
+            response = self._generate(model, contents, generate_content_config)
             return {"response": response.text, "success": True}
+        except LLMBudgetExceeded:
+            raise
         except Exception as e:
             # Log the error and return an error response
             print(f"Error generating content: {e}")
@@ -101,3 +87,31 @@ Remember key platform features:
                 "success": False,
                 "error": str(e),
             }
+
+    def summarize(
+        self, summary: Optional[str], turns: List[Tuple[str, str]]
+    ) -> Optional[str]:
+        """
+        Fold conversation turns into a running summary.
+
+        Args:
+            summary (Optional[str]): Previous summary
+            turns (List[Tuple[str, str]]): (role, text) turns to add to it
+
+        Returns:
+            Optional[str]: New summary, or None on error
+        """
+        transcript = "\n\n".join(
+            f"{'Student' if role == 'user' else 'Neuron'}: {text}"
+            for role, text in turns
+        )
+        text = json.dumps({"previous_summary": summary or "", "turns": transcript})
+        model, contents, generate_content_config = prompt_registry.request_for(
+            self.client, "chat_summary", text
+        )
+        try:
+            response = self._generate(model, contents, generate_content_config)
+            return response.text.strip() or None
+        except Exception as e:
+            print(f"Error summarizing conversation: {e}")
+            return None
@@ -0,0 +1,439 @@
+# backend/app/services/course_retrieval.py
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import Assignment, AssignmentMaterial, Course, CourseUser
+
+# Bump when the shard layout or text processing changes; old shards are rebuilt
+INDEX_FORMAT_VERSION = 1
+
+# Passages are overlapping windows of words
+PASSAGE_WORDS = 120
+PASSAGE_OVERLAP = 30
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Material files indexed as text, and how much of each is read
+TEXT_MATERIAL_TYPES = {
+    "txt", "md", "rst", "csv", "json", "html", "tex",
+    "py", "java", "c", "cpp", "h", "js", "ts", "sql", "r", "m",
+}
+MAX_MATERIAL_CHARS = 200_000
+
+TERM_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from",
+    "how", "i", "in", "is", "it", "of", "on", "or", "that", "the", "this", "to",
+    "was", "what", "when", "which", "with", "you", "your",
+}
+
+
+def search_terms(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms, without stopwords.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        List[str]: Terms in order
+    """
+    return [
+        term
+        for term in TERM_PATTERN.findall(text.lower())
+        if term not in STOPWORDS
+    ]
+
+
+def split_passages(text: str) -> List[str]:
+    """
+    Split text into overlapping passages of about PASSAGE_WORDS words.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        List[str]: Passages
+    """
+    words = text.split()
+    if not words:
+        return []
+    step = PASSAGE_WORDS - PASSAGE_OVERLAP
+    return [
+        " ".join(words[start : start + PASSAGE_WORDS])
+        for start in range(0, max(1, len(words) - PASSAGE_OVERLAP), step)
+    ]
+
+
+def _fingerprint(*parts: Any) -> str:
+    """Short hash identifying the indexed version of a document."""
+    return hashlib.sha1(
+        "\x1f".join(str(part) for part in parts).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def _read_material(material: AssignmentMaterial) -> Optional[str]:
+    """Read the text of a material file, or None if it isn't a readable text file."""
+    if (material.file_type or "").lower().lstrip(".") not in TEXT_MATERIAL_TYPES:
+        return None
+    try:
+        with open(material.file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read(MAX_MATERIAL_CHARS)
+    except OSError as e:
+        print(f"Error reading material {material.id}: {e}")
+        return None
+
+
+def _material_fingerprint(material: AssignmentMaterial) -> str:
+    """Fingerprint of a material file from its path, size and modification time."""
+    try:
+        stat = os.stat(material.file_path)
+        return _fingerprint(material.file_path, stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return _fingerprint(material.file_path, "missing")
+
+
+def _build_document(title: str, source: str, text: str) -> Dict[str, Any]:
+    """Split a document into passages with their term frequencies."""
+    passages = []
+    for passage in split_passages(text):
+        terms = search_terms(f"{title} {passage}")
+        if terms:
+            passages.append(
+                {"text": passage, "terms": dict(Counter(terms)), "length": len(terms)}
+            )
+    return {"title": title, "source": source, "passages": passages}
+
+
+class CourseShard:
+    """BM25 statistics of the passages of one course, as stored on disk."""
+
+    def __init__(self, course_id: int, documents: Dict[str, Dict[str, Any]]):
+        """
+        Initialize a course shard.
+
+        Args:
+            course_id (int): Course ID
+            documents (Dict[str, Dict[str, Any]]): Indexed documents by key, such as "assignment:12"
+        """
+        self.course_id = course_id
+        self.documents = documents
+        self.passages: List[Tuple[str, Dict[str, Any]]] = [
+            (key, passage)
+            for key, document in documents.items()
+            for passage in document["passages"]
+        ]
+        self.document_frequency: Counter = Counter()
+        for _, passage in self.passages:
+            self.document_frequency.update(passage["terms"].keys())
+        self.total_length = sum(passage["length"] for _, passage in self.passages)
+
+
+class CourseRetrievalIndex:
+    """
+    On-disk BM25 index of course descriptions, assignment descriptions and
+    text assignment materials, with one JSON shard per course.
+
+    Each indexed document keeps a fingerprint of its source, so syncing a
+    course re-reads only the assignments and files that changed. Shards are
+    replaced atomically and cached in memory until their file changes, so
+    every worker sees updates made by the others.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize a retrieval index.
+
+        Args:
+            directory (str): Directory holding the course shards
+        """
+        self.directory = directory
+        self._shards: Dict[int, Tuple[int, CourseShard]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, course_id: int) -> str:
+        """Path of a course shard."""
+        return os.path.join(self.directory, f"course_{course_id}.json")
+
+    def _read(self, course_id: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Read the documents of a shard, or None if it is missing or outdated."""
+        try:
+            with open(self._path(course_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            return None
+        return data["documents"]
+
+    def _write(self, course_id: int, documents: Dict[str, Dict[str, Any]]) -> None:
+        """Replace a shard atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(course_id)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": INDEX_FORMAT_VERSION,
+                    "course_id": course_id,
+                    "documents": documents,
+                },
+                f,
+            )
+        os.replace(temp_path, path)
+
+    def sync_course(self, db: Session, course_id: int) -> bool:
+        """
+        Bring a course shard up to date with the database.
+
+        Args:
+            db (Session): Database session
+            course_id (int): Course ID
+
+        Returns:
+            bool: True if the shard was written
+        """
+        stored = self._read(course_id)
+        documents: Dict[str, Dict[str, Any]] = {}
+        changed = stored is None
+        stored = stored or {}
+
+        def keep_or_build(key: str, fingerprint: str, build) -> None:
+            nonlocal changed
+            previous = stored.get(key)
+            if previous is not None and previous.get("fingerprint") == fingerprint:
+                documents[key] = previous
+                return
+            document = build()
+            if document is None:
+                return
+            document["fingerprint"] = fingerprint
+            documents[key] = document
+            changed = True
+
+        course = db.query(Course).filter(Course.id == course_id).first()
+        if course is None:
+            return self.remove_course(course_id)
+
+        course_title = f"{course.code}: {course.name}"
+        if course.description:
+            keep_or_build(
+                f"course:{course.id}",
+                _fingerprint(course_title, course.description),
+                lambda: _build_document(course_title, "course", course.description),
+            )
+
+        assignments = (
+            db.query(Assignment.id, Assignment.title, Assignment.description)
+            .filter(Assignment.course_id == course_id)
+            .all()
+        )
+        titles = {assignment.id: assignment.title for assignment in assignments}
+        for assignment in assignments:
+            if assignment.description:
+                keep_or_build(
+                    f"assignment:{assignment.id}",
+                    _fingerprint(assignment.title, assignment.description),
+                    lambda a=assignment: _build_document(
+                        a.title, "assignment", a.description
+                    ),
+                )
+
+        materials = (
+            db.query(AssignmentMaterial)
+            .join(Assignment, Assignment.id == AssignmentMaterial.assignment_id)
+            .filter(Assignment.course_id == course_id)
+            .all()
+        )
+        for material in materials:
+
+            def build_material(m=material) -> Optional[Dict[str, Any]]:
+                text = _read_material(m)
+                if not text:
+                    return None
+                title = f"{titles.get(m.assignment_id, '')} - {m.file_name}"
+                return _build_document(title, "material", text)
+
+            keep_or_build(
+                f"material:{material.id}",
+                _material_fingerprint(material),
+                build_material,
+            )
+
+        if set(documents) != set(stored):
+            changed = True
+        if not changed:
+            return False
+
+        self._write(course_id, documents)
+        with self._lock:
+            self._shards.pop(course_id, None)
+        return True
+
+    def remove_course(self, course_id: int) -> bool:
+        """
+        Delete the shard of a course.
+
+        Args:
+            course_id (int): Course ID
+
+        Returns:
+            bool: True if a shard was deleted
+        """
+        with self._lock:
+            self._shards.pop(course_id, None)
+        try:
+            os.remove(self._path(course_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _load(self, db: Session, course_id: int) -> CourseShard:
+        """Get a course shard from memory, reading or building it when needed."""
+        path = self._path(course_id)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self.sync_course(db, course_id)
+            mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+        with self._lock:
+            cached = self._shards.get(course_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        shard = CourseShard(course_id, self._read(course_id) or {})
+        with self._lock:
+            self._shards[course_id] = (mtime, shard)
+        return shard
+
+    def search(
+        self, db: Session, course_ids: List[int], query: str, top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the passages of some courses most relevant to a query.
+
+        Term statistics are combined across the searched courses, so scores
+        are comparable between them.
+
+        Args:
+            db (Session): Database session, used to build missing shards
+            course_ids (List[int]): Courses to search
+            query (str): Query text
+            top_k (int): Passages to return
+
+        Returns:
+            List[Dict[str, Any]]: course_id, source, title, text and score, best first
+        """
+        terms = set(search_terms(query))
+        if not terms or not course_ids:
+            return []
+
+        shards = [self._load(db, course_id) for course_id in course_ids]
+        passage_count = sum(len(shard.passages) for shard in shards)
+        if not passage_count:
+            return []
+        average_length = sum(shard.total_length for shard in shards) / passage_count
+
+        idf = {}
+        for term in terms:
+            frequency = sum(shard.document_frequency[term] for shard in shards)
+            if frequency:
+                idf[term] = math.log(
+                    1 + (passage_count - frequency + 0.5) / (frequency + 0.5)
+                )
+        if not idf:
+            return []
+
+        scored = []
+        for shard in shards:
+            for key, passage in shard.passages:
+                score = 0.0
+                length_norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * passage["length"] / average_length
+                )
+                for term, weight in idf.items():
+                    tf = passage["terms"].get(term)
+                    if tf:
+                        score += weight * tf * (BM25_K1 + 1) / (tf + length_norm)
+                if score > 0:
+                    scored.append((score, shard, key, passage))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "course_id": shard.course_id,
+                "source": shard.documents[key]["source"],
+                "title": shard.documents[key]["title"],
+                "text": passage["text"],
+                "score": round(score, 3),
+            }
+            for score, shard, key, passage in scored[:top_k]
+        ]
+
+
+course_index = CourseRetrievalIndex(settings.RETRIEVAL_INDEX_DIR)
+
+
+def sync_course_index(db: Session, course_id: int) -> None:
+    """
+    Update the retrieval index of a course after its content changed.
+
+    This is designed to run as a background task.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+    """
+    try:
+        course_index.sync_course(db, course_id)
+    except Exception as e:
+        print(f"Error indexing course {course_id}: {e}")
+
+
+def retrieve_course_context(db: Session, user_id: int, query: str) -> Optional[str]:
+    """
+    Build the course material excerpts relevant to a chat prompt.
+
+    Only courses the user belongs to are searched.
+
+    Args:
+        db (Session): Database session
+        user_id (int): User ID
+        query (str): Chat prompt
+
+    Returns:
+        Optional[str]: Numbered excerpts, or None when nothing relevant was found
+    """
+    if not settings.RETRIEVAL_ENABLED:
+        return None
+
+    course_ids = [
+        row.course_id
+        for row in db.query(CourseUser.course_id)
+        .filter(CourseUser.user_id == user_id)
+        .all()
+    ]
+    try:
+        results = course_index.search(db, course_ids, query, settings.RETRIEVAL_TOP_K)
+    except Exception as e:
+        print(f"Error searching course material: {e}")
+        return None
+    if not results:
+        return None
+
+    return "\n\n".join(
+        f"[{number}] {result['title']} ({result['source']})\n{result['text']}"
+        for number, result in enumerate(results, start=1)
+    )
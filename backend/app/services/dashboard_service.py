@@ -0,0 +1,172 @@
+# backend/app/services/dashboard_service.py
+import threading
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import Assignment, Course, CourseUser, Feedback, Submission, User
+from app.services.event_bus import broadcast_invalidation, event_bus
+
+UPCOMING_ASSIGNMENTS_LIMIT = 20
+RECENT_FEEDBACK_LIMIT = 10
+
+# Dashboards keyed by user id. Kept short-lived; writes that change a user's
+# dashboard drop the entry explicitly.
+_dashboard_cache: TTLCache = TTLCache(
+    maxsize=4096, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
+_dashboard_cache_lock = threading.Lock()
+
+
+def _enrolled_courses(db: Session, user_id: int) -> List[Dict[str, Any]]:
+    """Courses the user is enrolled in, with their course role."""
+    rows = db.execute(
+        select(Course.id, Course.code, Course.name, Course.term, CourseUser.role)
+        .join(CourseUser, CourseUser.course_id == Course.id)
+        .where(CourseUser.user_id == user_id)
+        .order_by(Course.code, Course.id)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def _upcoming_assignments(
+    db: Session, user_id: int, course_ids: List[int]
+) -> List[Dict[str, Any]]:
+    """Assignments not yet due in the given courses, with the user's latest attempt."""
+    if not course_ids:
+        return []
+
+    latest_submission = (
+        select(
+            Submission.id,
+            Submission.assignment_id,
+            Submission.status,
+            Submission.attempt_number,
+            Submission.submission_time,
+            func.row_number()
+            .over(
+                partition_by=Submission.assignment_id,
+                order_by=(Submission.attempt_number.desc(), Submission.id.desc()),
+            )
+            .label("rank"),
+        )
+        .where(Submission.user_id == user_id)
+        .subquery("latest_submission")
+    )
+
+    rows = db.execute(
+        select(
+            Assignment.id,
+            Assignment.title,
+            Assignment.assignment_type,
+            Assignment.due_date,
+            Assignment.points_possible,
+            Assignment.allow_resubmissions,
+            Assignment.resubmission_deadline,
+            Assignment.course_id,
+            Course.code.label("course_code"),
+            Course.name.label("course_name"),
+            latest_submission.c.id.label("submission_id"),
+            latest_submission.c.status.label("submission_status"),
+            latest_submission.c.attempt_number,
+            latest_submission.c.submission_time,
+        )
+        .join(Course, Course.id == Assignment.course_id)
+        .outerjoin(
+            latest_submission,
+            and_(
+                latest_submission.c.assignment_id == Assignment.id,
+                latest_submission.c.rank == 1,
+            ),
+        )
+        .where(Assignment.course_id.in_(course_ids), Assignment.due_date >= func.now())
+        .order_by(Assignment.due_date, Assignment.id)
+        .limit(UPCOMING_ASSIGNMENTS_LIMIT)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def _recent_feedback(db: Session, user_id: int) -> List[Dict[str, Any]]:
+    """The user's most recently generated feedback."""
+    rows = db.execute(
+        select(
+            Submission.id.label("submission_id"),
+            Submission.assignment_id,
+            Assignment.title.label("assignment_title"),
+            Course.code.label("course_code"),
+            Assignment.points_possible,
+            Submission.status,
+            Feedback.suggested_grade.label("score"),
+            Feedback.final_grade,
+            Feedback.professor_review,
+            Feedback.feedback_generated_at,
+        )
+        .join(Submission, Submission.id == Feedback.submission_id)
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .join(Course, Course.id == Assignment.course_id)
+        .where(Submission.user_id == user_id)
+        .order_by(Feedback.feedback_generated_at.desc(), Feedback.id.desc())
+        .limit(RECENT_FEEDBACK_LIMIT)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def get_dashboard(db: Session, user: User) -> Dict[str, Any]:
+    """
+    Get the home screen data of a user, using the per-user cache.
+
+    Three queries build a dashboard: enrolled courses, upcoming assignments
+    with the user's latest attempt, and recent feedback.
+
+    Args:
+        db (Session): Database session
+        user (User): Current user
+
+    Returns:
+        Dict[str, Any]: Courses, upcoming assignments and recent feedback
+    """
+    with _dashboard_cache_lock:
+        cached = _dashboard_cache.get(user.id)
+    if cached is not None:
+        return cached
+
+    courses = _enrolled_courses(db, user.id)
+    dashboard = {
+        "courses": courses,
+        "upcoming_assignments": _upcoming_assignments(
+            db, user.id, [course["id"] for course in courses]
+        ),
+        "recent_feedback": _recent_feedback(db, user.id),
+    }
+
+    with _dashboard_cache_lock:
+        _dashboard_cache[user.id] = dashboard
+    return dashboard
+
+
+def _drop_dashboards(user_ids: Optional[List[int]]) -> None:
+    """Drop cached dashboards of this process; all of them when given None."""
+    with _dashboard_cache_lock:
+        if user_ids is None:
+            _dashboard_cache.clear()
+        for user_id in user_ids or ():
+            _dashboard_cache.pop(user_id, None)
+
+
+def invalidate_dashboard(*user_ids: int) -> None:
+    """
+    Drop the cached dashboards of users, in this and every other process.
+
+    Args:
+        *user_ids (int): User IDs
+    """
+    if not user_ids:
+        return
+    _drop_dashboards(list(user_ids))
+    broadcast_invalidation("dashboard", list(user_ids))
+
+
+event_bus.on_invalidate("dashboard", _drop_dashboards)
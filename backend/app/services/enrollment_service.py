@@ -0,0 +1,100 @@
+# backend/app/services/enrollment_service.py
+import csv
+import io
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.database.models import CourseUser, User
+
+
+def parse_roster_csv(content: bytes) -> List[str]:
+    """
+    Extract email addresses from a CSV roster.
+
+    The ``email`` column is used when the file has a header containing it,
+    otherwise the first column of every row.
+
+    Args:
+        content (bytes): Raw CSV file content
+
+    Returns:
+        List[str]: Email addresses in file order
+    """
+    text = content.decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(text)))
+    if not rows:
+        return []
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    if "email" in header:
+        column = header.index("email")
+        rows = rows[1:]
+    else:
+        column = 0
+
+    return [
+        row[column].strip()
+        for row in rows
+        if len(row) > column and row[column].strip()
+    ]
+
+
+def resolve_emails(db: Session, emails: Iterable[str]) -> Dict[str, int]:
+    """
+    Map email addresses to user IDs with a single query.
+
+    Both the given and the lower-cased spelling of each email are looked up,
+    which tolerates common case differences while still using the unique
+    index on users.email.
+
+    Args:
+        db (Session): Database session
+        emails (Iterable[str]): Email addresses
+
+    Returns:
+        Dict[str, int]: User ID keyed by lower-cased email, for known users only
+    """
+    lookup: Set[str] = set()
+    for email in emails:
+        lookup.add(email)
+        lookup.add(email.lower())
+    if not lookup:
+        return {}
+
+    rows = db.query(User.id, User.email).filter(User.email.in_(lookup)).all()
+    return {email.lower(): user_id for user_id, email in rows}
+
+
+def enroll_users(
+    db: Session, course_id: int, user_ids: Iterable[int], role: str
+) -> Set[int]:
+    """
+    Enroll users in a course with one INSERT ... ON CONFLICT DO NOTHING.
+
+    Users already enrolled are left untouched.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+        user_ids (Iterable[int]): Users to enroll
+        role (str): Course role for the new enrollments
+
+    Returns:
+        Set[int]: IDs of the users that were newly enrolled
+    """
+    rows = [
+        {"course_id": course_id, "user_id": user_id, "role": role}
+        for user_id in sorted(set(user_ids))
+    ]
+    if not rows:
+        return set()
+
+    stmt = (
+        pg_insert(CourseUser)
+        .values(rows)
+        .on_conflict_do_nothing(constraint="unique_course_user")
+        .returning(CourseUser.user_id)
+    )
+    return set(db.execute(stmt).scalars().all())
@@ -0,0 +1,252 @@
+# backend/app/services/event_bus.py
+import asyncio
+import json
+import select
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import db as database
+
+# Postgres channel every API worker listens on
+EVENTS_CHANNEL = "gradient_events"
+
+# Postgres channel carrying cache invalidations between processes
+CACHE_CHANNEL = "gradient_cache_invalidations"
+
+# Keys per invalidation notification, keeping payloads under the NOTIFY limit
+CACHE_KEYS_PER_NOTIFICATION = 500
+
+# Identifies this process, so it skips the invalidations it sent itself
+PROCESS_ID = uuid.uuid4().hex
+
+# Events a slow client has not read yet; older events are dropped beyond this
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class EventBus:
+    """
+    In-process pub/sub of per-user events.
+
+    Events are published through Postgres NOTIFY, so they are only sent when
+    the publishing transaction commits and they reach every API worker. Each
+    worker runs one listener thread that hands events to the websocket
+    connections of the user they are addressed to. The same thread applies
+    cache invalidations sent by other processes.
+    """
+
+    def __init__(self):
+        """Initialize an event bus with no subscribers."""
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cache_handlers: Dict[str, Callable[[Optional[List[Any]]], None]] = {}
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        """
+        Subscribe to the events of a user.
+
+        Args:
+            user_id (int): User ID
+
+        Returns:
+            asyncio.Queue: Queue receiving the user's events
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        """
+        Remove a subscription.
+
+        Args:
+            user_id (int): User ID
+            queue (asyncio.Queue): Queue returned by subscribe
+        """
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def _deliver(self, user_id: int, event: Dict[str, Any]) -> None:
+        """Put an event on the user's queues. Runs on the event loop."""
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, ()))
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def dispatch(self, payload: str) -> None:
+        """
+        Hand a notification payload to local subscribers. Thread-safe.
+
+        Args:
+            payload (str): JSON event with a user_id field
+        """
+        try:
+            event = json.loads(payload)
+            user_id = int(event["user_id"])
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring malformed event: {e}")
+            return
+
+        with self._lock:
+            if user_id not in self._subscribers:
+                return
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._deliver, user_id, event)
+
+    def on_invalidate(
+        self, cache: str, handler: Callable[[Optional[List[Any]]], None]
+    ) -> None:
+        """
+        Register how to apply invalidations of a cache sent by other processes.
+
+        Args:
+            cache (str): Cache name used with broadcast_invalidation
+            handler (Callable[[Optional[List[Any]]], None]): Drops the given
+                keys, or the whole cache when called with None
+        """
+        self._cache_handlers[cache] = handler
+
+    def dispatch_invalidation(self, payload: str) -> None:
+        """
+        Apply a cache invalidation sent by another process. Thread-safe.
+
+        Args:
+            payload (str): JSON invalidation with cache, keys and origin fields
+        """
+        try:
+            message = json.loads(payload)
+            handler = self._cache_handlers.get(message["cache"])
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Ignoring malformed cache invalidation: {e}")
+            return
+
+        if handler is not None and message.get("origin") != PROCESS_ID:
+            handler(message.get("keys"))
+
+    def _listen(self) -> None:
+        """Listener thread: LISTEN on the events channel, reconnecting on errors."""
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(settings.DATABASE_URL)
+                connection.set_isolation_level(
+                    psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+                )
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {EVENTS_CHANNEL}")
+                    cursor.execute(f"LISTEN {CACHE_CHANNEL}")
+
+                while not self._stopped.is_set():
+                    # Wake up regularly to notice shutdown
+                    if select.select([connection], [], [], 5) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        if notify.channel == CACHE_CHANNEL:
+                            self.dispatch_invalidation(notify.payload)
+                        else:
+                            self.dispatch(notify.payload)
+            except Exception as e:
+                print(f"Event listener error: {e}")
+                self._stopped.wait(5)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start the listener thread.
+
+        Args:
+            loop (Optional[asyncio.AbstractEventLoop]): Loop serving the
+                websocket connections; workers without websockets only
+                receive cache invalidations
+        """
+        self._loop = loop
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="event-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the listener thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+event_bus = EventBus()
+
+
+def publish_event(db: Session, user_id: int, event_type: str, **data: Any) -> None:
+    """
+    Publish an event to a user when the current transaction commits.
+
+    Args:
+        db (Session): Database session inside the transaction to publish with
+        user_id (int): User the event is addressed to
+        event_type (str): Event type, such as "submission.graded"
+        **data: Event fields
+    """
+    payload = json.dumps({"type": event_type, "user_id": user_id, **data})
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": EVENTS_CHANNEL, "payload": payload},
+    )
+
+
+def broadcast_invalidation(cache: str, keys: Optional[List[Any]] = None) -> None:
+    """
+    Tell the other processes to drop entries of an in-process cache.
+
+    Call it after the change is committed and the local cache is cleared.
+    The notification is sent on its own connection, since callers have
+    already committed. Without Postgres (the SQLite benchmark runs a single
+    process) nothing is sent.
+
+    Args:
+        cache (str): Cache name registered with EventBus.on_invalidate
+        keys (Optional[List[Any]]): Keys to drop; None drops the whole cache
+    """
+    engine = database.engine
+    if engine.dialect.name != "postgresql":
+        return
+
+    if keys is None:
+        batches = [None]
+    else:
+        batches = [
+            keys[start : start + CACHE_KEYS_PER_NOTIFICATION]
+            for start in range(0, len(keys), CACHE_KEYS_PER_NOTIFICATION)
+        ]
+
+    try:
+        with engine.connect() as connection:
+            for batch in batches:
+                payload = json.dumps({"cache": cache, "keys": batch, "origin": PROCESS_ID})
+                connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": CACHE_CHANNEL, "payload": payload},
+                )
+            connection.commit()
+    except Exception as e:
+        # Other processes still drop the entries when they expire
+        print(f"Error broadcasting {cache} cache invalidation: {e}")
@@ -0,0 +1,125 @@
+# backend/app/services/feedback_store.py
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.database.models import Feedback, FeedbackDetail, IssueType, SeverityLevel
+
+
+def build_detail_rows(
+    suggestions: List[str],
+    issue_type: str = IssueType.CONTENT.value,
+    severity: str = SeverityLevel.MEDIUM.value,
+) -> List[Dict[str, Any]]:
+    """
+    Turn improvement suggestions into feedback_details rows.
+
+    Args:
+        suggestions (List[str]): Improvement suggestions from the grader
+        issue_type (str): Issue type stored for every row
+        severity (str): Severity stored for every row
+
+    Returns:
+        List[Dict[str, Any]]: Rows ready for insert_feedback
+    """
+    return [
+        {
+            "issue_type": issue_type,
+            "issue_location": None,
+            "issue_description": suggestion,
+            "suggestion": None,
+            "severity": severity,
+            "rubric_criteria_id": None,
+            "points_awarded": None,
+        }
+        for suggestion in suggestions
+    ]
+
+
+def build_criteria_rows(
+    criteria: List[Dict[str, Any]], criteria_results: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Turn per-criterion rubric scores into feedback_details rows.
+
+    Severity reflects the share of the criterion's points that was lost.
+
+    Args:
+        criteria (List[Dict[str, Any]]): Serialized rubric criteria
+        criteria_results (List[Dict[str, Any]]): Results from GeminiService.grade_criterion
+
+    Returns:
+        List[Dict[str, Any]]: Rows ready for insert_feedback
+    """
+    criteria_by_id = {criterion["id"]: criterion for criterion in criteria}
+    rows = []
+    for result in criteria_results:
+        criterion = criteria_by_id[result["criterion_id"]]
+        points_possible = criterion["points_possible"]
+        fraction = result["score"] / points_possible if points_possible else 1.0
+        if fraction < 0.5:
+            severity = SeverityLevel.HIGH.value
+        elif fraction < 0.8:
+            severity = SeverityLevel.MEDIUM.value
+        else:
+            severity = SeverityLevel.LOW.value
+        rows.append(
+            {
+                "issue_type": IssueType.CONTENT.value,
+                "issue_location": criterion["name"][:255],
+                "issue_description": (
+                    f"{criterion['name']} ({result['score']:g}/{points_possible:g}): "
+                    f"{result['comment']}"
+                ),
+                "suggestion": result["suggestion"],
+                "severity": severity,
+                "rubric_criteria_id": criterion["id"],
+                "points_awarded": result["score"],
+            }
+        )
+    return rows
+
+
+def insert_feedback(
+    db: Session, feedback_values: Dict[str, Any], detail_rows: List[Dict[str, Any]]
+) -> int:
+    """
+    Insert a feedback row and all of its detail rows.
+
+    On PostgreSQL this is a single statement: the feedback insert runs in a
+    data-modifying CTE and the details are one multi-row INSERT that reads the
+    new id from it. Other databases use INSERT ... RETURNING followed by one
+    executemany for the details. Enum-typed columns receive plain string
+    literals, so no dialect-specific casts are needed.
+
+    Args:
+        db (Session): Database session
+        feedback_values (Dict[str, Any]): Column values for the feedback row
+        detail_rows (List[Dict[str, Any]]): Column values for each detail row, without feedback_id
+
+    Returns:
+        int: ID of the new feedback row
+    """
+    feedback_insert = insert(Feedback).values(**feedback_values).returning(Feedback.id)
+
+    if not detail_rows:
+        return db.execute(feedback_insert).scalar_one()
+
+    if db.get_bind().dialect.name == "postgresql":
+        new_feedback = feedback_insert.cte("new_feedback")
+        feedback_id = select(new_feedback.c.id).scalar_subquery()
+        stmt = (
+            insert(FeedbackDetail)
+            .values([{**row, "feedback_id": feedback_id} for row in detail_rows])
+            .add_cte(new_feedback)
+            .returning(FeedbackDetail.feedback_id)
+        )
+        return db.execute(stmt).scalars().first()
+
+    new_feedback_id = db.execute(feedback_insert).scalar_one()
+    db.execute(
+        insert(FeedbackDetail),
+        [{**row, "feedback_id": new_feedback_id} for row in detail_rows],
+    )
+    return new_feedback_id
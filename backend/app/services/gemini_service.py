@@ -1,20 +1,85 @@
 # backend/app/services/gemini_service.py
 import json
+import math
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
-import os
-from google import genai
-from google.genai import types
+
+from app.config import settings
+from app.services.llm_client import create_llm_client
+from app.services.llm_resilience import call_llm, is_retryable
+from app.services.prompt_registry import prompt_registry
+from app.services.rate_limiter import llm_budget
+from app.services.rubric_service import weighted_total
+
+
+def parse_score(result: Dict[str, Any], response_text: str) -> float:
+    """
+    Read the score of a grading response.
+
+    A missing or non-numeric score fails the call rather than counting as 0.
+
+    Args:
+        result (Dict[str, Any]): Parsed response
+        response_text (str): Raw response, quoted in the error
+
+    Raises:
+        ValueError: When the score is missing, not a number, or not finite
+
+    Returns:
+        float: Score
+    """
+    try:
+        score = float(result["score"])
+    except (KeyError, TypeError, ValueError):
+        score = None
+    if score is None or not math.isfinite(score):
+        raise ValueError(f"Grading response has no valid score: {response_text[:200]}")
+    return score
 
 
 class GeminiService:
     """Service for interacting with Google's Gemini API."""
 
     def __init__(self):
-        """Initialize Gemini API client."""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable not set")
-        self.client = genai.Client(api_key=api_key)
+        """Initialize the LLM client selected by the LLM_BACKEND setting."""
+        self.client = create_llm_client()
+
+    def _generate(self, name: str, text: str) -> str:
+        """
+        Call the model with a registered prompt, retrying transient errors.
+
+        Args:
+            name (str): Prompt template name
+            text (str): Per-call user text
+
+        Raises:
+            CircuitOpen: While LLM calls are paused
+            Exception: When the call fails after its retries
+
+        Returns:
+            str: Response text
+        """
+
+        def call() -> str:
+            # Built per attempt so a retry after a discarded cache sends the full prompt
+            model, contents, generate_content_config = prompt_registry.request_for(
+                self.client, name, text
+            )
+            try:
+                with llm_budget.slot("grading"):
+                    response = self.client.models.generate_content(
+                        model=model,
+                        contents=contents,
+                        config=generate_content_config,
+                    )
+                return response.text
+            except Exception as e:
+                # A rejected request may reference an expired context cache
+                if not is_retryable(e):
+                    prompt_registry.discard_cache(name)
+                raise
+
+        return call_llm(call, "grading")
 
     def grade_submission(
         self,
@@ -23,9 +88,27 @@ class GeminiService:
         grading_rubric: Optional[str] = None,
         total_points: int = 100,
         strictness: str = "Medium",
+        signals: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        model = "gemini-2.0-flash"
-
+        """
+        Grade a submission as a whole.
+
+        Args:
+            student_submission (str): Submission text
+            reference_solution (Optional[str]): Reference solution
+            grading_rubric (Optional[str]): Rubric text
+            total_points (int): Points possible for the assignment
+            strictness (str): Grading strictness
+            signals (Optional[Dict[str, Any]]): Pre-grader signals
+
+        Raises:
+            CircuitOpen: While LLM calls are paused
+            Exception: When the model can't be reached or returns no valid score
+
+        Returns:
+            Dict[str, Any]: Overall assessment, improvement suggestions, score
+                and similarity score
+        """
         # Prepare the prompt with appropriate formatting
         prompt_data = {
             "student_submission": student_submission,
@@ -38,108 +121,130 @@ class GeminiService:
             prompt_data["reference_solution"] = reference_solution
         if grading_rubric:
             prompt_data["grading_rubric"] = grading_rubric
+        if signals:
+            prompt_data["precomputed_signals"] = signals
+
+        # Reuse the prebuilt grading prompt; only the submission JSON is per-call
+        response_text = self._generate("grading", json.dumps(prompt_data))
+
+        # Parse the response as JSON; a grade without a score is a failure, not a zero
+        feedback = json.loads(response_text)
+        feedback["score"] = parse_score(feedback, response_text)
+        return feedback
+
+    def grade_criterion(
+        self,
+        student_submission: str,
+        criterion: Dict[str, Any],
+        reference_solution: Optional[str] = None,
+        strictness: str = "Medium",
+    ) -> Dict[str, Any]:
+        """
+        Score a submission against a single rubric criterion.
+
+        Args:
+            student_submission (str): Submission text
+            criterion (Dict[str, Any]): Serialized rubric criterion
+            reference_solution (Optional[str]): Reference solution
+            strictness (str): Grading strictness
+
+        Raises:
+            CircuitOpen: While LLM calls are paused
+            Exception: When the model can't be reached or returns invalid output
+
+        Returns:
+            Dict[str, Any]: Score clamped to the criterion's points, comment and suggestion
+        """
+        prompt_data = {
+            "student_submission": student_submission,
+            "criterion": {
+                "name": criterion["name"],
+                "description": criterion["description"],
+                "points_possible": criterion["points_possible"],
+            },
+            "grading_strictness": strictness,
+        }
+        if reference_solution:
+            prompt_data["reference_solution"] = reference_solution
 
-        prompt_json = json.dumps(prompt_data)
-
-        # Create conversation with system prompt
-        contents = [
-            types.Content(
-                role="user",
-                parts=[
-                    types.Part.from_text(
-                        text="""You are GradingAssistant, an AI that evaluates coding assignments. Your task is to provide concise, helpful feedback on student code submissions based on the following inputs:
-
-## Input Components:
-1. **Student Code Submission** (required)
-2. **Reference Solution** (optional)
-3. **Grading Rubric** (optional)
-4. **Total Points Possible** (required)
-5. **Grading Strictness** (required): Easy (lenient), Medium (standard), or Strict (rigorous)
-
-## Evaluation Focus:
-- Functional correctness
-- Logic implementation
-- Code syntax
-- Edge case handling
-
-Do NOT focus heavily on variable naming conventions unless severely problematic.
-IMPORTANT: Try to match it with the reference solution, sometimes the code might be inefficient but thats what the professor wants. Compare it with reference solution and not with production standards unless specified in the grading rubric.
-
-## Output Format (Keep it brief and focused):
-
-1. **Overall Assessment** (1 paragraph only):
-   - Brief evaluation of the submission's quality and how well it meets requirements
-
-2. **Improvement Suggestions** (3-5 bullet points maximum):
-   - Specific, actionable recommendations
-   - Include line number references where applicable
-   - Brief explanation of why each change would improve the code
-3. **Score**: This should be the score, you score the assignment, out of the total possible points given to you. If total possible points are 50, score out of 50, if it is 10, out of 10. Don't return 8/10 or 40/50, just the score as 8 or 40.
-
-4. **Similarity Score**: Give a similarity score out of 100. This should show how similar is the submitted solution to the professor given reference solution. If no solution is given, don't give this score. Again return in X form, not X/Y form.
-
-## Grading Strictness Guidelines:
-
-- **Easy**: Focus mainly on correct outputs; be generous with partial credit
-- **Medium**: Balance correctness with good coding practices; reasonable deductions for inefficiencies
-- **Strict**: Expect comprehensive test case handling and optimal approaches; limited partial credit
-
-Maintain a constructive, educational tone that helps students improve while providing fair evaluation.
-Return only one feedback for each submission.
-Do no refer to the reference solution, return feedback based on the student submission and grading rubric. Do not mention the grading rubric in the feedback.
-Never mention the reference solution, grade as you are the professor and the student has submitted the assignment to you.
-The input will be provided to you in json form maintaining the input structure given above."""
-                    ),
-                ],
-            ),
-            types.Content(
-                role="model",
-                parts=[
-                    types.Part.from_text(
-                        text="""{
-  \"overall_assessment\": \"The submission demonstrates a good understanding of the core logic required to solve the problem. The code appears functional, but may benefit from minor adjustments to enhance efficiency and readability, aligning it closer to the reference solution.\",
-  \"improvement_suggestions\": [
-    \"Consider restructuring the conditional logic (e.g., if/else statements) to mirror the order in the reference solution. This might improve maintainability. Refer to lines [relevant line numbers].\",
-    \"Explore opportunities to reduce redundancy in calculations by storing intermediate results in variables, as demonstrated in the reference solution. See lines [relevant line numbers].\",
-    \"Ensure that edge cases are handled gracefully, as the reference solution provides. Specifically, consider testing with null or very large input values, adding validation on lines [relevant line numbers].\",
-    \"Review the overall code structure to better match the reference solution's organization, potentially improving readability and consistency. Focus on lines [relevant line numbers].\\"
-  ],
-  \"score\": 0,
-  \"similarity_score\": 0
-}"""
-                    ),
-                ],
-            ),
-            types.Content(
-                role="user",
-                parts=[
-                    types.Part.from_text(text=prompt_json),
-                ],
-            ),
-        ]
-
-        generate_content_config = types.GenerateContentConfig(
-            response_mime_type="application/json",
-        )
+        try:
+            response_text = self._generate("rubric_criterion", json.dumps(prompt_data))
+            result = json.loads(response_text)
+            score = parse_score(result, response_text)
+        except Exception as e:
+            print(f"Error grading criterion {criterion['name']}: {e}")
+            raise
+        return {
+            "criterion_id": criterion["id"],
+            "score": min(max(score, 0.0), criterion["points_possible"]),
+            "comment": result.get("comment", ""),
+            "suggestion": result.get("suggestion") or None,
+        }
 
+    def grade_with_rubric(
+        self,
+        student_submission: str,
+        rubric: Dict[str, Any],
+        reference_solution: Optional[str] = None,
+        total_points: int = 100,
+        strictness: str = "Medium",
+        signals: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Grade a submission criterion by criterion.
+
+        Every criterion is scored independently and concurrently, alongside the
+        overall assessment call. The grade is the weighted total of the criterion
+        scores, computed in code. If the overall assessment or any criterion
+        fails, grading fails, so the stored grade always matches its breakdown.
+
+        Args:
+            student_submission (str): Submission text
+            rubric (Dict[str, Any]): Serialized rubric from rubric_service.load_rubric
+            reference_solution (Optional[str]): Reference solution
+            total_points (int): Points possible for the assignment
+            strictness (str): Grading strictness
+            signals (Optional[Dict[str, Any]]): Pre-grader signals passed to the overall assessment
+
+        Raises:
+            CircuitOpen: While LLM calls are paused
+            Exception: When the overall assessment or a criterion fails
+
+        Returns:
+            Dict[str, Any]: Feedback in grade_submission's format plus ``criteria_results``
+        """
+        criteria = rubric["criteria"]
+        workers = max(1, min(len(criteria) + 1, settings.GRADING_MAX_PARALLEL_CALLS))
+
+        executor = ThreadPoolExecutor(max_workers=workers)
         try:
-            response = self.client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=generate_content_config,
+            overall_future = executor.submit(
+                self.grade_submission,
+                student_submission=student_submission,
+                reference_solution=reference_solution,
+                grading_rubric=rubric["prompt_text"],
+                total_points=total_points,
+                strictness=strictness,
+                signals=signals,
             )
-            # Parse the response as JSON
-            feedback = json.loads(response.text)
-            return feedback
-        except Exception as e:
-            # Log the error and return a default response
-            print(f"Error generating content: {e}")
-            return {
-                "overall_assessment": "Error generating feedback.",
-                "improvement_suggestions": [
-                    "There was an error generating feedback. Please try again later."
-                ],
-                "score": 0,
-                "similarity_score": 0 if reference_solution else None,
-                "error": str(e),
-            }
+            criterion_futures = [
+                executor.submit(
+                    self.grade_criterion,
+                    student_submission,
+                    criterion,
+                    reference_solution,
+                    strictness,
+                )
+                for criterion in criteria
+            ]
+            feedback = overall_future.result()
+            criteria_results = [future.result() for future in criterion_futures]
+        finally:
+            # After a failure, don't start the criteria still queued
+            executor.shutdown(cancel_futures=True)
+
+        scores = {result["criterion_id"]: result["score"] for result in criteria_results}
+        feedback["score"] = weighted_total(criteria, scores, total_points)
+
+        feedback["criteria_results"] = criteria_results
+        return feedback
@@ -0,0 +1,232 @@
+# backend/app/services/grade_curve.py
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, Integer, and_, column, func, select, update, values
+from sqlalchemy.orm import Session
+
+from app.database.models import Assignment, Feedback, Submission, User
+from app.services.analytics_service import (
+    latest_feedback_subquery,
+    latest_submissions_subquery,
+)
+
+CURVE_METHODS = ("linear", "sqrt")
+
+
+def load_grades(
+    db: Session, assignment_id: int, source: str = "final"
+) -> Tuple[List[Any], np.ndarray]:
+    """
+    Load the grades of an assignment's latest attempts in one query.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+        source (str): ``suggested`` for the AI grade, ``final`` for the current
+            grade (the professor's grade, falling back to the AI grade)
+
+    Returns:
+        Tuple[List[Any], np.ndarray]: Rows (feedback_id, submission_id, user_id,
+        student_name) and their grades, in the same order
+    """
+    latest_submission = latest_submissions_subquery(Assignment.id == assignment_id)
+    latest_feedback = latest_feedback_subquery(latest_submission)
+    if source == "suggested":
+        grade = latest_feedback.c.suggested_grade
+    else:
+        grade = func.coalesce(
+            latest_feedback.c.final_grade, latest_feedback.c.suggested_grade
+        )
+
+    rows = db.execute(
+        select(
+            latest_feedback.c.id.label("feedback_id"),
+            latest_submission.c.id.label("submission_id"),
+            latest_submission.c.user_id,
+            (User.first_name + " " + User.last_name).label("student_name"),
+            grade.label("grade"),
+        )
+        .select_from(latest_submission)
+        .join(
+            latest_feedback,
+            and_(
+                latest_feedback.c.submission_id == latest_submission.c.id,
+                latest_feedback.c.rank == 1,
+            ),
+        )
+        .join(User, User.id == latest_submission.c.user_id)
+        .where(latest_submission.c.rank == 1, grade.is_not(None))
+        .order_by(User.last_name, User.first_name, User.id)
+    ).all()
+
+    grades = np.fromiter((row.grade for row in rows), dtype=np.float64, count=len(rows))
+    return rows, grades
+
+
+def percentile_ranks(grades: np.ndarray) -> np.ndarray:
+    """
+    Percentile rank of every grade: the share of grades below it, counting ties as half.
+
+    Args:
+        grades (np.ndarray): Grades
+
+    Returns:
+        np.ndarray: Percentile ranks between 0 and 100
+    """
+    if not len(grades):
+        return grades
+    ordered = np.sort(grades)
+    below = np.searchsorted(ordered, grades, side="left")
+    not_above = np.searchsorted(ordered, grades, side="right")
+    return (below + not_above) / 2 / len(grades) * 100
+
+
+def z_scores(grades: np.ndarray) -> np.ndarray:
+    """
+    Standard scores of grades (0 when all grades are equal).
+
+    Args:
+        grades (np.ndarray): Grades
+
+    Returns:
+        np.ndarray: Z-scores
+    """
+    std = grades.std() if len(grades) else 0.0
+    if std == 0:
+        return np.zeros_like(grades)
+    return (grades - grades.mean()) / std
+
+
+def curve_grades(
+    grades: np.ndarray,
+    method: str,
+    points_possible: float,
+    target_mean: Optional[float] = None,
+    target_std: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Compute curved grades.
+
+    ``linear`` shifts grades so their mean becomes ``target_mean``, also
+    rescaling the spread to ``target_std`` when given; without a target mean
+    the top grade is scaled to full points. ``sqrt`` maps each grade to
+    ``sqrt(grade / points) * points``. Results are clipped to [0, points].
+
+    Args:
+        grades (np.ndarray): Grades
+        method (str): ``linear`` or ``sqrt``
+        points_possible (float): Points possible for the assignment
+        target_mean (Optional[float]): Target mean for the linear curve
+        target_std (Optional[float]): Target standard deviation for the linear curve
+
+    Raises:
+        ValueError: When the method is unknown
+
+    Returns:
+        np.ndarray: Curved grades
+    """
+    if not len(grades):
+        return grades
+
+    if method == "sqrt":
+        curved = np.sqrt(np.clip(grades, 0, None) / points_possible) * points_possible
+    elif method == "linear":
+        if target_mean is None:
+            top = grades.max()
+            curved = grades * (points_possible / top) if top > 0 else grades.copy()
+        else:
+            std = grades.std()
+            scale = target_std / std if target_std is not None and std > 0 else 1.0
+            curved = target_mean + (grades - grades.mean()) * scale
+    else:
+        raise ValueError(f"Unknown curve method: {method}")
+
+    return np.clip(curved, 0, points_possible)
+
+
+def histogram(
+    grades: np.ndarray, points_possible: float, bins: int = 10
+) -> List[Dict[str, float]]:
+    """
+    Histogram of grades over [0, points possible] (widened for extra credit).
+
+    Args:
+        grades (np.ndarray): Grades
+        points_possible (float): Points possible for the assignment
+        bins (int): Number of bins
+
+    Returns:
+        List[Dict[str, float]]: lower, upper and count of each bin
+    """
+    upper = max(points_possible, float(grades.max())) if len(grades) else points_possible
+    counts, edges = np.histogram(grades, bins=bins, range=(0, upper))
+    return [
+        {"lower": round(float(low), 2), "upper": round(float(high), 2), "count": int(count)}
+        for low, high, count in zip(edges[:-1], edges[1:], counts)
+    ]
+
+
+def summarize(grades: np.ndarray) -> Dict[str, Optional[float]]:
+    """
+    Mean, standard deviation and median of grades.
+
+    Args:
+        grades (np.ndarray): Grades
+
+    Returns:
+        Dict[str, Optional[float]]: Statistics, None when there are no grades
+    """
+    if not len(grades):
+        return {"mean": None, "std": None, "median": None}
+    return {
+        "mean": round(float(grades.mean()), 2),
+        "std": round(float(grades.std()), 2),
+        "median": round(float(np.median(grades)), 2),
+    }
+
+
+def apply_grades(
+    db: Session, rows: List[Any], grades: np.ndarray, graded_by: str
+) -> int:
+    """
+    Write final grades with one UPDATE ... FROM (VALUES ...) statement.
+
+    The grades become professor-reviewed and their submissions are marked
+    accepted, as with manual grading. The caller commits.
+
+    Args:
+        db (Session): Database session
+        rows (List[Any]): Rows returned by load_grades
+        grades (np.ndarray): Final grade for each row
+        graded_by (str): Name recorded as grader
+
+    Returns:
+        int: Number of feedback rows updated
+    """
+    if not rows:
+        return 0
+
+    curved = values(
+        column("feedback_id", Integer), column("grade", Float), name="curved"
+    ).data(
+        [(row.feedback_id, round(float(grade), 2)) for row, grade in zip(rows, grades)]
+    )
+    result = db.execute(
+        update(Feedback)
+        .where(Feedback.id == curved.c.feedback_id)
+        .values(
+            final_grade=curved.c.grade,
+            professor_review=True,
+            graded_by=graded_by,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Submission)
+        .where(Submission.id.in_([row.submission_id for row in rows]))
+        .values(status="accepted", updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
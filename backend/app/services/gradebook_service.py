@@ -0,0 +1,198 @@
+# backend/app/services/gradebook_service.py
+import csv
+import io
+import json
+from typing import Iterator
+
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.orm import Session
+
+from app.database.models import Assignment, CourseUser, Feedback, Submission, User
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+GRADEBOOK_COLUMNS = [
+    "student_id",
+    "student_email",
+    "first_name",
+    "last_name",
+    "assignment_id",
+    "assignment_title",
+    "due_date",
+    "points_possible",
+    "submission_id",
+    "attempt_number",
+    "submission_time",
+    "is_late",
+    "status",
+    "suggested_grade",
+    "final_grade",
+    "professor_review",
+]
+
+
+def gradebook_query(course_id: int) -> Select:
+    """
+    Build the gradebook query for a course.
+
+    Every enrolled student is paired with every assignment of the course and
+    joined to their latest attempt and that attempt's latest feedback, so
+    missing work appears as a row with empty submission columns.
+
+    Args:
+        course_id (int): Course ID
+
+    Returns:
+        Select: Query yielding one row per student and assignment
+    """
+    latest_submission = (
+        select(
+            Submission.id,
+            Submission.assignment_id,
+            Submission.user_id,
+            Submission.attempt_number,
+            Submission.submission_time,
+            Submission.is_late,
+            Submission.status,
+            func.row_number()
+            .over(
+                partition_by=(Submission.assignment_id, Submission.user_id),
+                order_by=(Submission.attempt_number.desc(), Submission.id.desc()),
+            )
+            .label("rank"),
+        )
+        .join(Assignment, Submission.assignment_id == Assignment.id)
+        .where(Assignment.course_id == course_id)
+        .subquery("latest_submission")
+    )
+
+    latest_feedback = (
+        select(
+            Feedback.submission_id,
+            Feedback.suggested_grade,
+            Feedback.final_grade,
+            Feedback.professor_review,
+            func.row_number()
+            .over(partition_by=Feedback.submission_id, order_by=Feedback.id.desc())
+            .label("rank"),
+        )
+        .join(latest_submission, Feedback.submission_id == latest_submission.c.id)
+        .where(latest_submission.c.rank == 1)
+        .subquery("latest_feedback")
+    )
+
+    return (
+        select(
+            User.id.label("student_id"),
+            User.email.label("student_email"),
+            User.first_name,
+            User.last_name,
+            Assignment.id.label("assignment_id"),
+            Assignment.title.label("assignment_title"),
+            Assignment.due_date,
+            Assignment.points_possible,
+            latest_submission.c.id.label("submission_id"),
+            latest_submission.c.attempt_number,
+            latest_submission.c.submission_time,
+            latest_submission.c.is_late,
+            latest_submission.c.status,
+            latest_feedback.c.suggested_grade,
+            latest_feedback.c.final_grade,
+            latest_feedback.c.professor_review,
+        )
+        .select_from(CourseUser)
+        .join(User, CourseUser.user_id == User.id)
+        .join(Assignment, Assignment.course_id == CourseUser.course_id)
+        .outerjoin(
+            latest_submission,
+            and_(
+                latest_submission.c.user_id == User.id,
+                latest_submission.c.assignment_id == Assignment.id,
+                latest_submission.c.rank == 1,
+            ),
+        )
+        .outerjoin(
+            latest_feedback,
+            and_(
+                latest_feedback.c.submission_id == latest_submission.c.id,
+                latest_feedback.c.rank == 1,
+            ),
+        )
+        .where(CourseUser.course_id == course_id, CourseUser.role == "student")
+        .order_by(
+            User.last_name,
+            User.first_name,
+            User.id,
+            Assignment.due_date,
+            Assignment.id,
+        )
+    )
+
+
+def _stream_rows(db: Session, course_id: int) -> Iterator:
+    """Yield gradebook rows from a server-side cursor."""
+    result = db.execute(
+        gradebook_query(course_id).execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    try:
+        for row in result:
+            yield row
+    finally:
+        result.close()
+
+
+def _json_default(value):
+    """Serialize datetimes as ISO 8601 and anything else as a string."""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def iter_gradebook_csv(db: Session, course_id: int) -> Iterator[str]:
+    """
+    Stream a course gradebook as CSV text chunks.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+
+    Yields:
+        str: CSV chunk, starting with the header
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(GRADEBOOK_COLUMNS)
+
+    for count, row in enumerate(_stream_rows(db, course_id), start=1):
+        writer.writerow(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            ]
+        )
+        if count % STREAM_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def iter_gradebook_jsonl(db: Session, course_id: int) -> Iterator[str]:
+    """
+    Stream a course gradebook as JSON Lines chunks.
+
+    Args:
+        db (Session): Database session
+        course_id (int): Course ID
+
+    Yields:
+        str: Newline-terminated JSON objects
+    """
+    lines = []
+    for row in _stream_rows(db, course_id):
+        lines.append(json.dumps(dict(row._mapping), default=_json_default) + "\n")
+        if len(lines) == STREAM_BATCH_SIZE:
+            yield "".join(lines)
+            lines = []
+
+    yield "".join(lines)
@@ -0,0 +1,127 @@
+# backend/app/services/grading_retry.py
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import Submission
+from app.services.llm_resilience import CircuitOpen
+
+# A claimed retry is not handed out again for this long, so a worker that
+# dies while grading only delays the submission
+RETRY_CLAIM_LEASE_SECONDS = 600
+
+# Longest stored error message
+MAX_ERROR_LENGTH = 1000
+
+
+def retry_delay_seconds(failures: int) -> float:
+    """
+    Delay before grading a submission again after its latest failure.
+
+    Doubles with every failure up to GRADING_RETRY_MAX_SECONDS. The delay is
+    drawn from the upper half of that ceiling, so submissions that failed
+    together don't all come back at once.
+
+    Args:
+        failures (int): Failed grading attempts so far
+
+    Returns:
+        float: Seconds to wait
+    """
+    ceiling = min(
+        settings.GRADING_RETRY_MAX_SECONDS,
+        settings.GRADING_RETRY_BASE_SECONDS * 2 ** (failures - 1),
+    )
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def record_grading_failure(db: Session, submission: Submission, error: Exception) -> None:
+    """
+    Mark a submission whose grading failed, scheduling a retry if attempts remain.
+
+    No grade is stored. While LLM calls are paused by the circuit breaker the
+    retry waits for the circuit without using up an attempt. The caller commits.
+
+    Args:
+        db (Session): Database session
+        submission (Submission): Submission that failed to grade
+        error (Exception): Grading error
+    """
+    now = datetime.now(timezone.utc)
+    submission.grading_error = str(error)[:MAX_ERROR_LENGTH]
+
+    if isinstance(error, CircuitOpen):
+        submission.status = "grading_retry"
+        submission.next_grading_at = now + timedelta(
+            seconds=error.retry_after
+            + random.uniform(0, settings.GRADING_RETRY_BASE_SECONDS)
+        )
+    else:
+        submission.grading_failures = (submission.grading_failures or 0) + 1
+        if submission.grading_failures >= settings.GRADING_MAX_ATTEMPTS:
+            submission.status = "grading_failed"
+            submission.next_grading_at = None
+        else:
+            submission.status = "grading_retry"
+            submission.next_grading_at = now + timedelta(
+                seconds=retry_delay_seconds(submission.grading_failures)
+            )
+
+    submission.updated_at = now
+    db.add(submission)
+
+
+def clear_grading_failure(submission: Submission) -> None:
+    """
+    Reset the failure state of a submission before it is graded anew.
+
+    Args:
+        submission (Submission): Submission
+    """
+    submission.grading_failures = 0
+    submission.grading_error = None
+    submission.next_grading_at = None
+
+
+def claim_due_retries(db: Session, limit: int) -> List[int]:
+    """
+    Claim submissions whose grading retry is due and commit the claim.
+
+    Claimed submissions keep their status but their retry time moves forward
+    by a lease, so other workers skip them until they are graded or fail again.
+
+    Args:
+        db (Session): Database session
+        limit (int): Submissions to claim
+
+    Returns:
+        List[int]: Claimed submission IDs, longest waiting first
+    """
+    now = datetime.now(timezone.utc)
+    submission_ids = (
+        db.execute(
+            select(Submission.id)
+            .where(
+                Submission.status == "grading_retry",
+                Submission.next_grading_at <= now,
+            )
+            .order_by(Submission.next_grading_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    if submission_ids:
+        db.execute(
+            update(Submission)
+            .where(Submission.id.in_(submission_ids))
+            .values(next_grading_at=now + timedelta(seconds=RETRY_CLAIM_LEASE_SECONDS))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return list(submission_ids)
@@ -0,0 +1,269 @@
+# backend/app/services/llm_client.py
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Iterator
+
+from app.config import settings
+
+
+class FakeLLMError(Exception):
+    """Error injected by the fake LLM backend, shaped like a provider 503."""
+
+    code = 503
+
+
+class FakeResponse:
+    """Response of the fake backend, with the ``text`` of a Gemini response."""
+
+    def __init__(self, text: str):
+        """
+        Initialize a fake response.
+
+        Args:
+            text (str): Response text
+        """
+        self.text = text
+
+
+class FakeCachedContent:
+    """Context cache handle of the fake backend."""
+
+    def __init__(self, name: str):
+        """
+        Initialize a fake cache handle.
+
+        Args:
+            name (str): Cache name
+        """
+        self.name = name
+
+
+def _content_text(contents: Any) -> str:
+    """Text of the last turn of the contents passed to generate_content."""
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, list) and contents:
+        last = contents[-1]
+        if isinstance(last, str):
+            return last
+        parts = getattr(last, "parts", None) or []
+        return "".join(getattr(part, "text", None) or "" for part in parts)
+    return ""
+
+
+def _digest(text: str) -> int:
+    """Stable 64-bit hash of a text."""
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class FakeModels:
+    """The ``models`` API of the fake backend."""
+
+    def __init__(self, client: "FakeLLMClient"):
+        """
+        Initialize the fake models API.
+
+        Args:
+            client (FakeLLMClient): Owning client
+        """
+        self._client = client
+
+    def generate_content(self, model: str, contents: Any, config: Any = None) -> FakeResponse:
+        """
+        Return a deterministic response after the configured latency.
+
+        Args:
+            model (str): Model name (ignored)
+            contents: Prompt contents
+            config: GenerateContentConfig; JSON is returned when it asks for JSON
+
+        Raises:
+            TimeoutError: When the latency exceeds the call timeout
+            FakeLLMError: At the configured error rate
+
+        Returns:
+            FakeResponse: Response
+        """
+        text = _content_text(contents)
+        self._client.wait(self._client.latency_seconds())
+        return FakeResponse(self._client.respond(text, config))
+
+    def generate_content_stream(
+        self, model: str, contents: Any, config: Any = None
+    ) -> Iterator[FakeResponse]:
+        """
+        Stream a deterministic response in chunks.
+
+        The first chunk arrives after the configured latency, each following
+        one after the configured chunk delay.
+
+        Args:
+            model (str): Model name (ignored)
+            contents: Prompt contents
+            config: GenerateContentConfig
+
+        Raises:
+            TimeoutError: When the latency exceeds the call timeout
+            FakeLLMError: At the configured error rate
+
+        Yields:
+            FakeResponse: Response chunks
+        """
+        text = _content_text(contents)
+        self._client.wait(self._client.latency_seconds())
+        response = self._client.respond(text, config)
+        size = max(1, settings.FAKE_LLM_STREAM_CHUNK_CHARS)
+        for start in range(0, len(response), size):
+            if start:
+                time.sleep(settings.FAKE_LLM_STREAM_CHUNK_DELAY_MS / 1000)
+            yield FakeResponse(response[start : start + size])
+
+
+class FakeCaches:
+    """The ``caches`` API of the fake backend; caches are only named."""
+
+    def __init__(self):
+        """Initialize the fake caches API."""
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def create(self, model: str, config: Any = None) -> FakeCachedContent:
+        """Create a named cache handle."""
+        with self._lock:
+            self._count += 1
+            return FakeCachedContent(f"cachedContents/fake-{self._count}")
+
+
+class FakeLLMClient:
+    """
+    Offline stand-in for the Gemini client, for development, load tests and
+    benchmarks.
+
+    Responses depend only on the prompt text, so the same submission always
+    gets the same grade. Latency, injected errors and streaming are set by
+    the FAKE_LLM_* settings; latency jitter and errors come from a seeded
+    generator, so a run is reproducible for a given order of calls.
+    """
+
+    def __init__(self):
+        """Initialize the fake client from settings."""
+        self.models = FakeModels(self)
+        self.caches = FakeCaches()
+        self._random = random.Random(settings.FAKE_LLM_SEED)
+        self._lock = threading.Lock()
+
+    def latency_seconds(self) -> float:
+        """Draw the latency of a call."""
+        with self._lock:
+            jitter = self._random.uniform(
+                -settings.FAKE_LLM_LATENCY_JITTER_MS, settings.FAKE_LLM_LATENCY_JITTER_MS
+            )
+        return max(0.0, settings.FAKE_LLM_LATENCY_MS + jitter) / 1000
+
+    def wait(self, seconds: float) -> None:
+        """
+        Sleep for a call's latency, then fail at the configured error rate.
+
+        Raises:
+            TimeoutError: When the latency exceeds LLM_CALL_TIMEOUT_SECONDS
+            FakeLLMError: At the configured error rate
+        """
+        if seconds > settings.LLM_CALL_TIMEOUT_SECONDS:
+            time.sleep(settings.LLM_CALL_TIMEOUT_SECONDS)
+            raise TimeoutError("Fake LLM call timed out")
+        time.sleep(seconds)
+        with self._lock:
+            failed = self._random.random() < settings.FAKE_LLM_ERROR_RATE
+        if failed:
+            raise FakeLLMError("Injected fake LLM error")
+
+    def respond(self, text: str, config: Any) -> str:
+        """
+        Build the response to a prompt.
+
+        Args:
+            text (str): Text of the last user turn
+            config: GenerateContentConfig
+
+        Returns:
+            str: JSON in the grading or rubric criterion format when JSON is
+                requested, otherwise plain text
+        """
+        seed = _digest(text)
+        if getattr(config, "response_mime_type", None) != "application/json":
+            return (
+                f"This is a fake response to a {len(text.split())}-word prompt "
+                f"(#{seed % 10000:04d})."
+            )
+
+        try:
+            request = json.loads(text)
+        except ValueError:
+            request = {}
+        if not isinstance(request, dict):
+            request = {}
+
+        # Scores between 50% and 100% of the points, fixed per prompt
+        fraction = 0.5 + (seed % 1000) / 2000
+        criterion = request.get("criterion")
+        if isinstance(criterion, dict):
+            return json.dumps(
+                {
+                    "score": round(float(criterion.get("points_possible", 10)) * fraction, 1),
+                    "comment": f"Fake assessment of {criterion.get('name', 'the criterion')}.",
+                    "suggestion": "This is a fake suggestion.",
+                }
+            )
+
+        points = request.get("total_points_possible", 100)
+        return json.dumps(
+            {
+                "overall_assessment": "This is a fake assessment of the submission.",
+                "improvement_suggestions": [
+                    "This is the first fake suggestion.",
+                    "This is the second fake suggestion.",
+                ],
+                "score": round(float(points) * fraction, 1),
+                "similarity_score": round(fraction * 100)
+                if "reference_solution" in request
+                else None,
+            }
+        )
+
+
+def create_llm_client():
+    """
+    Create the LLM client selected by the LLM_BACKEND setting.
+
+    Raises:
+        ValueError: When the backend is unknown, or is "gemini" without GOOGLE_API_KEY
+
+    Returns:
+        genai.Client or FakeLLMClient: Client exposing ``models`` and ``caches``
+    """
+    if settings.LLM_BACKEND == "fake":
+        return FakeLLMClient()
+    if settings.LLM_BACKEND != "gemini":
+        raise ValueError(f"Unknown LLM_BACKEND: {settings.LLM_BACKEND}")
+
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY environment variable not set")
+
+    # Imported here: the SDK takes about a second to import
+    from google import genai
+    from google.genai import types
+
+    # Bound every request so a stalled call fails instead of holding a thread
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            timeout=int(settings.LLM_CALL_TIMEOUT_SECONDS * 1000)
+        ),
+    )
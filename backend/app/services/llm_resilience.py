@@ -0,0 +1,234 @@
+# backend/app/services/llm_resilience.py
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+
+ResultType = TypeVar("ResultType")
+
+# Status codes of transient provider errors: timeouts, quota and overload
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling the LLM while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        """
+        Initialize the error.
+
+        Args:
+            retry_after (float): Seconds until calls are tried again
+        """
+        super().__init__(f"LLM calls paused for {retry_after:.0f}s after repeated failures")
+        self.retry_after = retry_after
+
+
+class CallNotStarted(Exception):
+    """Base of errors raised by a call before it reached the provider."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether an LLM call error is transient and worth retrying.
+
+    Provider errors carry their HTTP status in ``code``; timeouts and dropped
+    connections surface as built-in or httpx transport errors.
+
+    Args:
+        error (Exception): Error raised by the call
+
+    Returns:
+        bool: True for rate limits, overload, server errors and timeouts
+    """
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # httpx is only loaded with the Gemini SDK; without it no httpx error exists
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(error, httpx.TransportError)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing provider for a while.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls fail fast with CircuitOpen. Once ``reset_seconds`` have
+    passed a single probe call is let through: its success closes the
+    circuit, its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        """
+        Initialize a closed circuit breaker.
+
+        Args:
+            name (str): Name used in logs
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_seconds (float): Seconds the circuit stays open before a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.times_opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a probe through; 0 when not open."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_seconds - time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go ahead.
+
+        Raises:
+            CircuitOpen: While the circuit is open, or another call is probing
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self.opened_at + self.reset_seconds - now)
+        raise CircuitOpen(retry_after)
+
+    def record_success(self) -> None:
+        """Close the circuit after a call reached the provider."""
+        with self._lock:
+            if self.opened_at is not None:
+                print(f"Circuit {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.probing or (
+                self.opened_at is None and self.failures >= self.failure_threshold
+            ):
+                print(f"Circuit {self.name} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+            self.probing = False
+
+    def release_probe(self) -> None:
+        """Let another call probe after the probing call didn't reach the provider."""
+        with self._lock:
+            self.probing = False
+
+    def usage(self) -> Dict[str, object]:
+        """Counters of this process."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+llm_circuit = CircuitBreaker(
+    "llm", settings.LLM_CIRCUIT_FAILURE_THRESHOLD, settings.LLM_CIRCUIT_RESET_SECONDS
+)
+
+
+def backoff_seconds(attempt: int, base: float, cap: float) -> float:
+    """
+    Jittered exponential backoff ("full jitter") before a retry.
+
+    Args:
+        attempt (int): Attempts made so far, from 1
+        base (float): Delay ceiling after the first attempt
+        cap (float): Largest delay ceiling
+
+    Returns:
+        float: Seconds to wait, uniformly drawn below the ceiling
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def call_llm(
+    call: Callable[[], ResultType],
+    kind: str,
+    breaker: CircuitBreaker = llm_circuit,
+) -> ResultType:
+    """
+    Make an LLM call, retrying transient errors with jittered backoff.
+
+    Calls fail fast while the circuit breaker is open. Only transient errors
+    count against the breaker; a rejected request still shows the provider
+    is up, and a CallNotStarted error, such as no free LLM slot, says nothing
+    about it. Timeouts are enforced by the client (LLM_CALL_TIMEOUT_SECONDS).
+
+    Args:
+        call (Callable[[], ResultType]): The call, made once per attempt
+        kind (str): "grading" or "chat", which sets the attempts
+        breaker (CircuitBreaker): Circuit breaker guarding the provider
+
+    Raises:
+        CircuitOpen: When the circuit is open
+        Exception: The error of the last attempt, or the first non-transient one
+
+    Returns:
+        ResultType: Result of the call
+    """
+    attempts = (
+        settings.LLM_GRADING_CALL_ATTEMPTS
+        if kind == "grading"
+        else settings.LLM_CHAT_CALL_ATTEMPTS
+    )
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        try:
+            result = call()
+        except CallNotStarted:
+            breaker.release_probe()
+            raise
+        except Exception as e:
+            if not is_retryable(e):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            if attempt >= max(1, attempts):
+                raise
+            delay = backoff_seconds(
+                attempt, settings.LLM_RETRY_BASE_SECONDS, settings.LLM_RETRY_MAX_SECONDS
+            )
+            print(f"LLM {kind} call failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
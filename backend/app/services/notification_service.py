@@ -0,0 +1,263 @@
+# backend/app/services/notification_service.py
+import smtplib
+from email.message import EmailMessage
+from typing import Any, List
+
+from sqlalchemy import exists, func, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models import (
+    Assignment,
+    Course,
+    CourseUser,
+    Notification,
+    NotificationType,
+    Submission,
+    User,
+    UserPreference,
+)
+
+# Used when a user has no preferences row, matching the column defaults
+DEFAULT_DEADLINE_HOURS = 24
+
+NOTIFICATION_COLUMNS = [
+    "user_id",
+    "title",
+    "message",
+    "notification_type",
+    "related_assignment_id",
+    "scheduled_time",
+]
+
+
+def _wants_notifications():
+    """Whether a user has any notification channel enabled."""
+    return or_(
+        func.coalesce(UserPreference.email_notifications, True),
+        func.coalesce(UserPreference.in_app_notifications, True),
+    )
+
+
+def schedule_deadline_reminders(db: Session) -> int:
+    """
+    Create deadline reminders for every student whose reminder window has opened.
+
+    A student's window opens ``notification_deadline_hours`` before the due
+    date. Students who already submitted are skipped. All reminders are
+    created by a single INSERT ... SELECT; a partial unique index makes it
+    safe to run repeatedly. The caller commits.
+
+    Args:
+        db (Session): Database session
+
+    Returns:
+        int: Number of reminders created
+    """
+    hours = func.coalesce(
+        UserPreference.notification_deadline_hours, DEFAULT_DEADLINE_HOURS
+    )
+    remind_at = Assignment.due_date - func.make_interval(0, 0, 0, 0, hours)
+
+    reminders = (
+        select(
+            CourseUser.user_id,
+            func.concat("Upcoming deadline: ", Assignment.title),
+            func.concat(
+                Assignment.title,
+                " in ",
+                Course.code,
+                " is due on ",
+                func.to_char(Assignment.due_date, "YYYY-MM-DD HH24:MI TZ"),
+                ".",
+            ),
+            literal(NotificationType.DEADLINE_REMINDER.value),
+            Assignment.id,
+            remind_at,
+        )
+        .select_from(Assignment)
+        .join(Course, Course.id == Assignment.course_id)
+        .join(
+            CourseUser,
+            (CourseUser.course_id == Assignment.course_id)
+            & (CourseUser.role == "student"),
+        )
+        .outerjoin(UserPreference, UserPreference.user_id == CourseUser.user_id)
+        .where(
+            Assignment.due_date > func.now(),
+            remind_at <= func.now(),
+            _wants_notifications(),
+            ~exists().where(
+                Submission.assignment_id == Assignment.id,
+                Submission.user_id == CourseUser.user_id,
+            ),
+        )
+    )
+
+    stmt = (
+        pg_insert(Notification)
+        .from_select(NOTIFICATION_COLUMNS, reminders)
+        .on_conflict_do_nothing(
+            index_elements=["user_id", "related_assignment_id"],
+            index_where=text("notification_type = 'deadline_reminder'"),
+        )
+    )
+    return db.execute(stmt).rowcount
+
+
+def queue_feedback_notifications(db: Session, submission_ids: List[int]) -> None:
+    """
+    Queue "feedback available" notices for graded submissions.
+
+    Meant to run inside the grading transaction so the notice is created
+    exactly when the feedback is. Delivery is left to the scheduler worker.
+
+    Args:
+        db (Session): Database session
+        submission_ids (List[int]): Submissions whose feedback was generated
+    """
+    if not submission_ids:
+        return
+
+    notices = (
+        select(
+            Submission.user_id,
+            func.concat("Feedback available: ", Assignment.title),
+            func.concat(
+                "Your submission for ",
+                Assignment.title,
+                " in ",
+                Course.code,
+                " has been graded. Open GRADiEnt to read the feedback.",
+            ),
+            literal(NotificationType.FEEDBACK_AVAILABLE.value),
+            Assignment.id,
+            func.now(),
+        )
+        .select_from(Submission)
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .join(Course, Course.id == Assignment.course_id)
+        .outerjoin(UserPreference, UserPreference.user_id == Submission.user_id)
+        .where(Submission.id.in_(submission_ids), _wants_notifications())
+    )
+    db.execute(pg_insert(Notification).from_select(NOTIFICATION_COLUMNS, notices))
+
+
+def claim_pending_notifications(db: Session, limit: int) -> List[Any]:
+    """
+    Lock a batch of notifications that are due and not sent yet.
+
+    Rows are locked with SKIP LOCKED, so several workers can deliver at the
+    same time without sending a notification twice.
+
+    Args:
+        db (Session): Database session
+        limit (int): Maximum number of notifications
+
+    Returns:
+        List[Any]: Notifications with the recipient's email address and email preference
+    """
+    return db.execute(
+        select(
+            Notification.id,
+            Notification.title,
+            Notification.message,
+            User.email,
+            User.first_name,
+            func.coalesce(UserPreference.email_notifications, True).label(
+                "email_notifications"
+            ),
+        )
+        .join(User, User.id == Notification.user_id)
+        .outerjoin(UserPreference, UserPreference.user_id == Notification.user_id)
+        .where(
+            Notification.sent_time.is_(None),
+            Notification.scheduled_time <= func.now(),
+        )
+        .order_by(Notification.scheduled_time, Notification.id)
+        .limit(limit)
+        .with_for_update(of=Notification, skip_locked=True)
+    ).all()
+
+
+def mark_sent(db: Session, notification_ids: List[int]) -> int:
+    """
+    Set the sent time of notifications that have not been marked yet.
+
+    Args:
+        db (Session): Database session
+        notification_ids (List[int]): Notification IDs
+
+    Returns:
+        int: Number of notifications marked
+    """
+    if not notification_ids:
+        return 0
+
+    return db.execute(
+        update(Notification)
+        .where(Notification.id.in_(notification_ids), Notification.sent_time.is_(None))
+        .values(sent_time=func.now())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def build_email(notification: Any) -> EmailMessage:
+    """
+    Build the email for a notification.
+
+    Args:
+        notification (Any): Row returned by claim_pending_notifications
+
+    Returns:
+        EmailMessage: Email message
+    """
+    email = EmailMessage()
+    email["Subject"] = notification.title
+    email["From"] = settings.SMTP_FROM
+    email["To"] = notification.email
+    email.set_content(f"Hi {notification.first_name},\n\n{notification.message}\n")
+    return email
+
+
+def deliver_pending_notifications(db: Session, batch_size: int) -> int:
+    """
+    Deliver one batch of due notifications and mark them sent.
+
+    In-app notifications only need their sent time set. Emails go out over
+    one SMTP connection per batch; notifications whose email fails stay
+    pending and are retried on the next run. Commits the batch.
+
+    Args:
+        db (Session): Database session
+        batch_size (int): Maximum number of notifications to deliver
+
+    Returns:
+        int: Number of notifications delivered
+    """
+    notifications = claim_pending_notifications(db, batch_size)
+    if not notifications:
+        db.commit()
+        return 0
+
+    emails = [n for n in notifications if n.email_notifications]
+    failed = set()
+    if emails:
+        try:
+            with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as smtp:
+                for notification in emails:
+                    try:
+                        smtp.send_message(build_email(notification))
+                    except smtplib.SMTPException as e:
+                        print(f"Error sending notification {notification.id}: {e}")
+                        failed.add(notification.id)
+        except (OSError, smtplib.SMTPException) as e:
+            print(f"Error connecting to SMTP server: {e}")
+            failed.update(n.id for n in emails)
+
+    delivered = mark_sent(
+        db, [n.id for n in notifications if n.id not in failed]
+    )
+    db.commit()
+    return delivered
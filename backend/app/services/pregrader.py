@@ -0,0 +1,107 @@
+# backend/app/services/pregrader.py
+from typing import Any, Dict, Optional
+
+from app.utils.text_similarity import (
+    jaccard,
+    normalize_layout,
+    normalize_text,
+    shingles,
+    tokenize,
+)
+
+PREGRADER_NAME = "GRADiEnt Pre-grader"
+
+
+class PreGradeResult:
+    """Outcome of the local pre-grading stage."""
+
+    def __init__(
+        self,
+        signals: Dict[str, Any],
+        feedback: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize a pre-grade result.
+
+        Args:
+            signals (Dict[str, Any]): Cheap deterministic measurements of the submission
+            feedback (Optional[Dict[str, Any]]): Final feedback when the case is settled locally
+        """
+        self.signals = signals
+        self.feedback = feedback
+
+    @property
+    def decided(self) -> bool:
+        """Whether the submission was graded without the LLM."""
+        return self.feedback is not None
+
+    @property
+    def similarity_score(self) -> Optional[float]:
+        """Similarity to the reference solution out of 100, if one was given."""
+        return self.signals.get("reference_similarity")
+
+
+def pregrade(
+    submission_text: str,
+    reference_solution: Optional[str] = None,
+    total_points: int = 100,
+) -> PreGradeResult:
+    """
+    Settle trivial submissions locally and measure the rest.
+
+    Empty submissions score 0 and submissions matching the reference solution
+    exactly, or up to whitespace other than indentation, score full points.
+    Indentation can change what code does, so it has to match as written.
+    Everything else gets token-shingle similarity to the reference and size
+    signals that are passed on to the LLM grader.
+
+    Args:
+        submission_text (str): Submission text
+        reference_solution (Optional[str]): Reference solution
+        total_points (int): Points possible for the assignment
+
+    Returns:
+        PreGradeResult: Signals, plus feedback when no LLM call is needed
+    """
+    normalized = normalize_text(submission_text or "")
+    signals: Dict[str, Any] = {
+        "submission_lines": normalized.count("\n") + 1 if normalized else 0,
+        "submission_tokens": len(tokenize(normalized)),
+    }
+
+    if not normalized:
+        return PreGradeResult(
+            signals,
+            {
+                "overall_assessment": "The submission is empty, so there is no work to evaluate.",
+                "improvement_suggestions": [
+                    "Make sure your answer or file contents are included before submitting."
+                ],
+                "score": 0,
+                "similarity_score": 0 if reference_solution else None,
+            },
+        )
+
+    if not reference_solution:
+        return PreGradeResult(signals)
+
+    if submission_text == reference_solution:
+        signals["reference_match"] = "exact"
+    elif normalize_layout(submission_text) == normalize_layout(reference_solution):
+        signals["reference_match"] = "normalized"
+
+    if "reference_match" in signals:
+        signals["reference_similarity"] = 100.0
+        return PreGradeResult(
+            signals,
+            {
+                "overall_assessment": "The submission fully meets the requirements of the assignment.",
+                "improvement_suggestions": [],
+                "score": total_points,
+                "similarity_score": 100.0,
+            },
+        )
+
+    similarity = jaccard(shingles(normalized), shingles(normalize_text(reference_solution)))
+    signals["reference_similarity"] = round(similarity * 100, 1)
+    return PreGradeResult(signals)
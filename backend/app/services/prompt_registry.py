@@ -0,0 +1,486 @@
+# backend/app/services/prompt_registry.py
+from __future__ import annotations
+
+import threading
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# The Gemini SDK takes about a second to import, so its types are imported
+# when a prompt is first used rather than when the app starts.
+if TYPE_CHECKING:
+    from google.genai import types
+
+
+GRADING_PROMPT = """You are GradingAssistant, an AI that evaluates coding assignments. Your task is to provide concise, helpful feedback on student code submissions based on the following inputs:
+
+## Input Components:
+1. **Student Code Submission** (required)
+2. **Reference Solution** (optional)
+3. **Grading Rubric** (optional)
+4. **Total Points Possible** (required)
+5. **Grading Strictness** (required): Easy (lenient), Medium (standard), or Strict (rigorous)
+6. **Precomputed Signals** (optional): deterministic measurements of the submission, such as its size and its token-shingle similarity (0-100) to the reference solution. Use them as hints only.
+
+## Evaluation Focus:
+- Functional correctness
+- Logic implementation
+- Code syntax
+- Edge case handling
+
+Do NOT focus heavily on variable naming conventions unless severely problematic.
+IMPORTANT: Try to match it with the reference solution, sometimes the code might be inefficient but thats what the professor wants. Compare it with reference solution and not with production standards unless specified in the grading rubric.
+
+## Output Format (Keep it brief and focused):
+
+1. **Overall Assessment** (1 paragraph only):
+   - Brief evaluation of the submission's quality and how well it meets requirements
+
+2. **Improvement Suggestions** (3-5 bullet points maximum):
+   - Specific, actionable recommendations
+   - Include line number references where applicable
+   - Brief explanation of why each change would improve the code
+3. **Score**: This should be the score, you score the assignment, out of the total possible points given to you. If total possible points are 50, score out of 50, if it is 10, out of 10. Don't return 8/10 or 40/50, just the score as 8 or 40.
+
+4. **Similarity Score**: Give a similarity score out of 100. This should show how similar is the submitted solution to the professor given reference solution. If no solution is given, don't give this score. Again return in X form, not X/Y form.
+
+## Grading Strictness Guidelines:
+
+- **Easy**: Focus mainly on correct outputs; be generous with partial credit
+- **Medium**: Balance correctness with good coding practices; reasonable deductions for inefficiencies
+- **Strict**: Expect comprehensive test case handling and optimal approaches; limited partial credit
+
+Maintain a constructive, educational tone that helps students improve while providing fair evaluation.
+Return only one feedback for each submission.
+Do no refer to the reference solution, return feedback based on the student submission and grading rubric. Do not mention the grading rubric in the feedback.
+Never mention the reference solution, grade as you are the professor and the student has submitted the assignment to you.
+The input will be provided to you in json form maintaining the input structure given above."""
+
+GRADING_EXAMPLE_RESPONSE = """{
+  \"overall_assessment\": \"The submission demonstrates a good understanding of the core logic required to solve the problem. The code appears functional, but may benefit from minor adjustments to enhance efficiency and readability, aligning it closer to the reference solution.\",
+  \"improvement_suggestions\": [
+    \"Consider restructuring the conditional logic (e.g., if/else statements) to mirror the order in the reference solution. This might improve maintainability. Refer to lines [relevant line numbers].\",
+    \"Explore opportunities to reduce redundancy in calculations by storing intermediate results in variables, as demonstrated in the reference solution. See lines [relevant line numbers].\",
+    \"Ensure that edge cases are handled gracefully, as the reference solution provides. Specifically, consider testing with null or very large input values, adding validation on lines [relevant line numbers].\",
+    \"Review the overall code structure to better match the reference solution's organization, potentially improving readability and consistency. Focus on lines [relevant line numbers].\\"
+  ],
+  \"score\": 0,
+  \"similarity_score\": 0
+}"""
+
+RUBRIC_CRITERION_PROMPT = """You are GradingAssistant, an AI that scores one criterion of a grading rubric at a time. You will receive a JSON object with:
+
+1. **student_submission** (required)
+2. **criterion**: the rubric criterion to score, with its name, description and points_possible (required)
+3. **reference_solution** (optional)
+4. **grading_strictness** (required): Easy (lenient), Medium (standard), or Strict (rigorous)
+
+Score the submission ONLY against the given criterion, ignoring every other aspect of the work. The score must be a number between 0 and the criterion's points_possible. Return it as a plain number, not in X/Y form.
+
+Respond with a JSON object containing:
+- **score**: points awarded for this criterion
+- **comment**: one or two sentences explaining the score
+- **suggestion**: one specific, actionable improvement for this criterion, or an empty string if none is needed
+
+Never mention the reference solution. Maintain a constructive, educational tone."""
+
+RUBRIC_CRITERION_EXAMPLE_RESPONSE = """{
+  \"score\": 0,
+  \"comment\": \"The submission handles the main case correctly but does not address empty input, which this criterion requires.\",
+  \"suggestion\": \"Add a check for empty input before processing and return the documented default value.\"
+}"""
+
+CHAT_PROMPT = """SYSTEM PROMPT:
+
+You are Neuron, an AI teaching assistant specifically designed to help students learn and navigate the GRADiEnt learning platform.
+
+GRADiEnt is an educational platform that:
+- Provides AI-powered instant feedback on student assignments
+- Allows students to register for courses
+- Enables submission of assignments in various formats (text, file uploads)
+- Features automated grading with professor review
+- Organizes courses by terms with enrollment capabilities
+- Offers detailed feedback on submissions with improvement suggestions
+
+Your primary purpose is to guide students toward knowledge and provide comprehensive educational assistance. You should:
+
+1. Provide direct, concise answers to student questions without asking unnecessary follow-up questions
+2. Explain how to register for courses, submit assignments, and view feedback clearly and efficiently
+3. Give helpful information about assignments based on the course material provided with the question
+4. Provide guidance on interpreting feedback and improving submissions
+5. Explain platform features like course registration, submission processes, and grading
+6. **Teach academic concepts completely and thoroughly when asked**
+7. **Provide in-depth educational content on any curriculum topics**
+
+When students ask for help with specific assignment tasks or to learn any academic subject, ALWAYS provide comprehensive teaching:
+- For coding assignments: Provide detailed algorithm explanations, pseudocode, or code snippets that demonstrate concepts with thorough explanations
+- For essays: Offer structural guidance, thesis statement assistance, or paragraph organization tips
+- For presentations: Suggest effective slide organization, visual elements, or speaking points
+- For other academic work: Provide conceptual frameworks, methodological approaches, or resource suggestions
+- **For direct learning requests: Teach the topic completely, explaining concepts from fundamentals to advanced applications**
+
+Never refuse to help with legitimate academic questions or teaching requests. When a student asks you to teach a topic, provide a structured, educational explanation of the subject.
+
+A question may come with numbered excerpts from the descriptions and materials of the student's courses and assignments. Use them when they are relevant, mention the assignment or course they come from, and ignore them when they are not. Never invent assignment requirements that are not in the excerpts.
+
+Only ask clarifying questions when absolutely necessary to provide assistance. Focus on giving comprehensive answers with the information you have available.
+
+Always maintain a helpful, educational tone. Your goal is to empower students to succeed academically by providing both platform assistance and direct educational content.
+
+Remember key platform features:
+- Course registration system with term-based organization
+- Assignment submission with both text and file upload options
+- AI-powered automated grading with professor review
+- Detailed feedback with improvement suggestions
+- Dashboard showing enrolled courses and upcoming assignments"""
+
+CHAT_SUMMARY_PROMPT = """You maintain the running summary of a tutoring conversation between a student and Neuron, the GRADiEnt teaching assistant.
+
+You will receive the previous summary (possibly empty) and the next turns of the conversation. Return an updated summary that:
+- Keeps the student's goals, the course or assignment they are working on, and open questions
+- Keeps facts, definitions, code and decisions that later answers may depend on
+- Drops greetings, repetition and anything already resolved and no longer relevant
+
+Write at most 200 words of plain text, in the third person ("The student asked..."). Return only the summary."""
+
+GUEST_CHAT_PROMPT = """SYSTEM PROMPT:
+
+SYSTEM PROMPT:
+
+You are Neuron, an AI assistant for the GRADiEnt educational platform. When speaking with guest users (not logged in), your role is to provide general information about the platform and answer frequently asked questions.
+
+For guest users, you should:
+
+1. Provide clear information about what GRADiEnt is and how it works
+2. Explain the AI-powered feedback system that helps students improve their work
+3. Answer questions about registration processes for both students and professors
+4. Describe the platform's terms of service and privacy policy in general terms
+5. Direct users to appropriate contact channels for support
+6. Explain the benefits of the platform for both students and educators
+
+Topics you can discuss with guests include:
+- General overview of GRADiEnt's features and benefits
+- How the AI grading and feedback system works in general terms
+- Registration and account creation processes
+- Differences between student and professor accounts
+- Platform accessibility and technical requirements
+- Terms of service and privacy policy information
+- Support channels and contact information
+
+When guests ask about accessing learning materials or submitting assignments, politely explain that these features require registration and login.
+
+Maintain a helpful, informative tone while encouraging guests to register for full access to the platform's educational features.
+
+Key information to share with guests:
+- GRADiEnt is an educational platform that provides AI-powered instant feedback
+- The platform allows for course registration, assignment submission, and automated grading
+- Students receive detailed feedback with specific improvement suggestions
+- Professors can review AI-generated feedback before finalizing grades
+- Registration is simple and can be completed online through the platform
+- Both students and professors can benefit from the streamlined workflow
+- Support is available through email, contact form, and help center resources"""
+
+
+class PromptTemplate:
+    """A versioned prompt whose SDK objects are built on first use and reused."""
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        model: str,
+        preamble: Optional[List[Tuple[str, str]]] = None,
+        system_prompt: Optional[str] = None,
+        cacheable: bool = False,
+        **config_options,
+    ):
+        """
+        Build the fixed Content and GenerateContentConfig objects for a prompt.
+
+        Args:
+            name (str): Registry name of the prompt
+            version (str): Prompt version, bumped whenever the text changes
+            model (str): Gemini model the prompt is tuned for
+            preamble (Optional[List[Tuple[str, str]]]): Fixed (role, text) turns sent before the user turn
+            system_prompt (Optional[str]): System instruction text
+            cacheable (bool): Whether the fixed part may be stored with provider context caching
+            **config_options: Extra GenerateContentConfig options (temperature, response_mime_type, ...)
+        """
+        self.name = name
+        self.version = version
+        self.model = model
+        self.cacheable = cacheable
+        self.preamble_turns = preamble or []
+        self.system_prompt = system_prompt
+        self.config_options = config_options
+
+    @cached_property
+    def preamble(self) -> List[types.Content]:
+        """Fixed turns sent before the user turn."""
+        return self.history_contents(self.preamble_turns)
+
+    @cached_property
+    def system_instruction(self) -> Optional[types.Content]:
+        """System instruction, if the prompt has one."""
+        from google.genai import types
+
+        if not self.system_prompt:
+            return None
+        return types.Content(
+            role="system", parts=[types.Part.from_text(text=self.system_prompt)]
+        )
+
+    @cached_property
+    def config(self) -> types.GenerateContentConfig:
+        """Config used when the fixed part is sent with every call."""
+        from google.genai import types
+
+        return types.GenerateContentConfig(
+            system_instruction=self.system_instruction, **self.config_options
+        )
+
+    @cached_property
+    def fixed_tokens(self) -> int:
+        """Rough token count of the fixed part (about four characters per token)."""
+        texts = [self.system_prompt or ""] + [text for _, text in self.preamble_turns]
+        return sum(len(text) for text in texts) // 4
+
+    @property
+    def key(self) -> str:
+        """Versioned identifier of the prompt, e.g. ``grading@1``."""
+        return f"{self.name}@{self.version}"
+
+    def user_content(self, text: str) -> types.Content:
+        """Wrap the per-call text in a user turn."""
+        from google.genai import types
+
+        return types.Content(role="user", parts=[types.Part.from_text(text=text)])
+
+    def history_contents(
+        self, history: Optional[List[Tuple[str, str]]]
+    ) -> List[types.Content]:
+        """Wrap earlier (role, text) conversation turns."""
+        from google.genai import types
+
+        return [
+            types.Content(role=role, parts=[types.Part.from_text(text=text)])
+            for role, text in (history or [])
+        ]
+
+    def build_contents(
+        self, text: str, history: Optional[List[Tuple[str, str]]] = None
+    ) -> List[types.Content]:
+        """Return the fixed preamble, earlier turns and the per-call user turn."""
+        return [*self.preamble, *self.history_contents(history), self.user_content(text)]
+
+
+class PromptRegistry:
+    """Registry of prompt templates with optional provider-side context caching."""
+
+    # Back off this long after a failed cache creation (e.g. preamble below
+    # the provider's minimum cacheable size) before trying again.
+    CACHE_RETRY_SECONDS = 600
+    # Recreate caches this long before they expire on the provider side.
+    CACHE_REFRESH_MARGIN_SECONDS = 60
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._caches: Dict[str, Tuple[str, float, types.GenerateContentConfig]] = {}
+        self._cache_failures: Dict[str, float] = {}
+        self._cache_creating: set = set()
+        self._lock = threading.Lock()
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        """
+        Register a template under its name.
+
+        Args:
+            template (PromptTemplate): Template to register
+
+        Returns:
+            PromptTemplate: The registered template
+        """
+        self._templates[template.name] = template
+        return template
+
+    def get(self, name: str) -> PromptTemplate:
+        """
+        Get a registered template.
+
+        Args:
+            name (str): Template name
+
+        Raises:
+            KeyError: When no template is registered under the name
+
+        Returns:
+            PromptTemplate: The template
+        """
+        return self._templates[name]
+
+    def request_for(
+        self,
+        client,
+        name: str,
+        text: str,
+        history: Optional[List[Tuple[str, str]]] = None,
+    ) -> Tuple[str, List[types.Content], types.GenerateContentConfig]:
+        """
+        Build the arguments for ``client.models.generate_content``.
+
+        When the template's fixed part is held in a provider context cache,
+        only the conversation turns are sent and the config references the cache.
+
+        Args:
+            client: Gemini API client
+            name (str): Template name
+            text (str): Per-call user text
+            history (Optional[List[Tuple[str, str]]]): Earlier (role, text) turns of a conversation
+
+        Returns:
+            Tuple[str, List[types.Content], types.GenerateContentConfig]: Model, contents and config
+        """
+        template = self.get(name)
+        cached_config = self._cached_config(client, template)
+        if cached_config is not None:
+            contents = [*template.history_contents(history), template.user_content(text)]
+            return template.model, contents, cached_config
+        return template.model, template.build_contents(text, history), template.config
+
+    def discard_cache(self, name: str) -> None:
+        """
+        Forget the provider cache for a template, e.g. after a call using it failed.
+
+        Args:
+            name (str): Template name
+        """
+        template = self._templates.get(name)
+        if template:
+            with self._lock:
+                self._caches.pop(template.key, None)
+
+    def _cached_config(
+        self, client, template: PromptTemplate
+    ) -> Optional[types.GenerateContentConfig]:
+        """
+        Return a config bound to a live provider cache, creating one if needed.
+
+        Prompts whose fixed part is below the provider's minimum cache size
+        are always sent inline. The cache is created outside the lock by one
+        caller; concurrent callers send the prompt inline meanwhile.
+        """
+        from google.genai import types
+
+        if (
+            not template.cacheable
+            or not settings.GEMINI_CONTEXT_CACHE_ENABLED
+            or template.fixed_tokens < settings.GEMINI_CONTEXT_CACHE_MIN_TOKENS
+        ):
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._caches.get(template.key)
+            if entry and entry[1] > now:
+                return entry[2]
+
+            failed_at = self._cache_failures.get(template.key)
+            if failed_at is not None and now - failed_at < self.CACHE_RETRY_SECONDS:
+                return None
+            if template.key in self._cache_creating:
+                return None
+            self._cache_creating.add(template.key)
+
+        ttl = settings.GEMINI_CONTEXT_CACHE_TTL_SECONDS
+        try:
+            cache = client.caches.create(
+                model=template.model,
+                config=types.CreateCachedContentConfig(
+                    display_name=template.key,
+                    contents=template.preamble,
+                    system_instruction=template.system_instruction,
+                    ttl=f"{ttl}s",
+                ),
+            )
+        except Exception as e:
+            print(f"Context caching unavailable for {template.key}: {e}")
+            with self._lock:
+                self._cache_creating.discard(template.key)
+                self._cache_failures[template.key] = now
+                self._caches.pop(template.key, None)
+            return None
+
+        config = types.GenerateContentConfig(
+            cached_content=cache.name, **template.config_options
+        )
+        expires_at = now + max(ttl - self.CACHE_REFRESH_MARGIN_SECONDS, 0)
+        with self._lock:
+            self._cache_creating.discard(template.key)
+            self._caches[template.key] = (cache.name, expires_at, config)
+            self._cache_failures.pop(template.key, None)
+        return config
+
+
+# The grading prompts are cacheable, but at about 1,000 and 300 tokens they are
+# below GEMINI_CONTEXT_CACHE_MIN_TOKENS and are sent inline until they grow past it.
+prompt_registry = PromptRegistry()
+
+prompt_registry.register(
+    PromptTemplate(
+        name="grading",
+        version="2",
+        model=settings.GEMINI_MODEL,
+        preamble=[("user", GRADING_PROMPT), ("model", GRADING_EXAMPLE_RESPONSE)],
+        cacheable=True,
+        response_mime_type="application/json",
+    )
+)
+
+prompt_registry.register(
+    PromptTemplate(
+        name="rubric_criterion",
+        version="1",
+        model=settings.GEMINI_MODEL,
+        preamble=[
+            ("user", RUBRIC_CRITERION_PROMPT),
+            ("model", RUBRIC_CRITERION_EXAMPLE_RESPONSE),
+        ],
+        cacheable=True,
+        response_mime_type="application/json",
+    )
+)
+
+prompt_registry.register(
+    PromptTemplate(
+        name="chat",
+        version="2",
+        model=settings.GEMINI_MODEL,
+        system_prompt=CHAT_PROMPT,
+        response_mime_type="text/plain",
+    )
+)
+
+prompt_registry.register(
+    PromptTemplate(
+        name="chat_summary",
+        version="1",
+        model=settings.GEMINI_MODEL,
+        system_prompt=CHAT_SUMMARY_PROMPT,
+        temperature=0.2,
+        response_mime_type="text/plain",
+    )
+)
+
+prompt_registry.register(
+    PromptTemplate(
+        name="guest_chat",
+        version="1",
+        model=settings.GEMINI_MODEL,
+        system_prompt=GUEST_CHAT_PROMPT,
+        temperature=0.5,
+        response_mime_type="text/plain",
+    )
+)
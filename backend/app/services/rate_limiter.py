@@ -0,0 +1,320 @@
+# backend/app/services/rate_limiter.py
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import settings
+from app.database.db import SessionLocal
+from app.database.models import RateLimitBucket
+from app.services.llm_resilience import CallNotStarted, llm_circuit
+
+
+class RateLimitResult:
+    """Outcome of taking a token from a bucket."""
+
+    def __init__(self, allowed: bool, remaining: float, retry_after: float):
+        """
+        Initialize a rate limit result.
+
+        Args:
+            allowed (bool): Whether the request may proceed
+            remaining (float): Tokens left in the bucket
+            retry_after (float): Seconds until a token is available, when not allowed
+        """
+        self.allowed = allowed
+        self.remaining = remaining
+        self.retry_after = retry_after
+
+
+class MemoryBucketStore:
+    """Token buckets kept in this process."""
+
+    def __init__(self, max_keys: int = 100_000):
+        """
+        Initialize an in-memory store.
+
+        Args:
+            max_keys (int): Buckets kept; idle buckets expire after an hour
+        """
+        self._buckets: TTLCache = TTLCache(maxsize=max_keys, ttl=3600)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        """
+        Refill a bucket and take one token if available.
+
+        Args:
+            key (str): Bucket key
+            capacity (float): Bucket size (burst)
+            rate (float): Tokens added per second
+
+        Returns:
+            Tuple[bool, float]: Whether a token was taken, and the tokens left
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+        return allowed, tokens
+
+
+class DatabaseBucketStore:
+    """
+    Token buckets shared by every worker, kept in the rate_limit_buckets table.
+
+    Each take is one atomic upsert that refills the bucket from the time
+    since its last update and takes a token only if one is available.
+    """
+
+    def take(self, key: str, capacity: float, rate: float) -> Tuple[bool, float]:
+        """
+        Refill a bucket and take one token if available.
+
+        Args:
+            key (str): Bucket key
+            capacity (float): Bucket size (burst)
+            rate (float): Tokens added per second
+
+        Returns:
+            Tuple[bool, float]: Whether a token was taken, and the tokens left
+        """
+        bucket = RateLimitBucket.__table__
+        refilled = func.least(
+            capacity,
+            bucket.c.tokens
+            + func.extract("epoch", func.now() - bucket.c.updated_at) * rate,
+        )
+        stmt = (
+            pg_insert(bucket)
+            .values(key=key, tokens=capacity - 1, updated_at=func.now())
+            .on_conflict_do_update(
+                index_elements=[bucket.c.key],
+                set_={"tokens": refilled - 1, "updated_at": func.now()},
+                where=refilled >= 1,
+            )
+            .returning(bucket.c.tokens)
+        )
+
+        db = SessionLocal()
+        try:
+            tokens = db.execute(stmt).scalar()
+            if tokens is None:
+                # Bucket is empty; read how far it has refilled
+                tokens = db.execute(
+                    select(refilled).where(bucket.c.key == key)
+                ).scalar()
+                db.rollback()
+                return False, tokens or 0.0
+            db.commit()
+            return True, tokens
+        finally:
+            db.close()
+
+
+class RateLimiter:
+    """A named token-bucket budget applied per key (user or IP address)."""
+
+    def __init__(self, name: str, per_minute: float, burst: int, store):
+        """
+        Initialize a rate limiter.
+
+        Args:
+            name (str): Budget name, part of every bucket key
+            per_minute (float): Sustained requests per minute
+            burst (int): Requests allowed at once after being idle
+            store: MemoryBucketStore or DatabaseBucketStore
+        """
+        self.name = name
+        self.capacity = float(burst)
+        self.rate = per_minute / 60.0
+        self.store = store
+        self.allowed = 0
+        self.limited = 0
+
+    def hit(self, key: str) -> RateLimitResult:
+        """
+        Count a request against the budget of a key.
+
+        Args:
+            key (str): User or client key, such as "user:12" or "ip:10.0.0.1"
+
+        Returns:
+            RateLimitResult: Whether the request is allowed
+        """
+        allowed, remaining = self.store.take(
+            f"{self.name}:{key}", self.capacity, self.rate
+        )
+        if allowed:
+            self.allowed += 1
+            return RateLimitResult(True, remaining, 0.0)
+
+        self.limited += 1
+        return RateLimitResult(False, remaining, (1 - remaining) / self.rate)
+
+    def usage(self) -> Dict[str, float]:
+        """Counters of this process."""
+        return {
+            "per_minute": self.rate * 60,
+            "burst": self.capacity,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class LLMBudgetExceeded(CallNotStarted):
+    """Raised when no LLM call slot became free in time."""
+
+
+class LLMConcurrencyBudget:
+    """
+    Limits concurrent LLM calls in this process, giving grading priority.
+
+    Chat may use only part of the slots and never starts while a grading
+    call is waiting. Grading calls wait as long as needed; chat calls give
+    up after a short timeout.
+    """
+
+    def __init__(self, capacity: int, chat_capacity: int):
+        """
+        Initialize the budget.
+
+        Args:
+            capacity (int): Concurrent LLM calls
+            chat_capacity (int): Concurrent chat calls, at most capacity
+        """
+        self.capacity = capacity
+        self.limits = {"grading": capacity, "chat": min(chat_capacity, capacity)}
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.waiting: Dict[str, int] = defaultdict(int)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self._condition = threading.Condition()
+
+    def _can_start(self, kind: str) -> bool:
+        """Whether a call of this kind may start now."""
+        if sum(self.in_flight.values()) >= self.capacity:
+            return False
+        if self.in_flight[kind] >= self.limits[kind]:
+            return False
+        return kind == "grading" or self.waiting["grading"] == 0
+
+    @contextmanager
+    def slot(self, kind: str, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold an LLM call slot for the duration of the block.
+
+        Args:
+            kind (str): "grading" or "chat"
+            timeout (Optional[float]): Seconds to wait for a slot; None waits forever
+
+        Raises:
+            LLMBudgetExceeded: When no slot became free in time
+        """
+        with self._condition:
+            self.waiting[kind] += 1
+            try:
+                started = self._condition.wait_for(
+                    lambda: self._can_start(kind), timeout
+                )
+            finally:
+                self.waiting[kind] -= 1
+            if not started:
+                self.rejected[kind] += 1
+                # A waiting grading call may have been holding back others
+                self._condition.notify_all()
+                raise LLMBudgetExceeded(f"No free LLM slot for {kind}")
+            self.in_flight[kind] += 1
+            self.calls[kind] += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight[kind] -= 1
+                self._condition.notify_all()
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """Counters of this process per kind of call."""
+        with self._condition:
+            return {
+                kind: {
+                    "limit": self.limits[kind],
+                    "in_flight": self.in_flight[kind],
+                    "waiting": self.waiting[kind],
+                    "calls": self.calls[kind],
+                    "rejected": self.rejected[kind],
+                }
+                for kind in self.limits
+            }
+
+
+def retry_after_header(result: RateLimitResult) -> Dict[str, str]:
+    """Retry-After header for a limited request, in whole seconds."""
+    return {"Retry-After": str(max(1, math.ceil(result.retry_after)))}
+
+
+_store = (
+    DatabaseBucketStore()
+    if settings.RATE_LIMIT_STORE == "database"
+    else MemoryBucketStore()
+)
+
+chat_rate_limiter = RateLimiter(
+    "chat", settings.CHAT_RATE_LIMIT_PER_MINUTE, settings.CHAT_RATE_LIMIT_BURST, _store
+)
+guest_chat_rate_limiter = RateLimiter(
+    "guest_chat",
+    settings.GUEST_CHAT_RATE_LIMIT_PER_MINUTE,
+    settings.GUEST_CHAT_RATE_LIMIT_BURST,
+    _store,
+)
+chat_ip_rate_limiter = RateLimiter(
+    "chat_ip",
+    settings.CHAT_IP_RATE_LIMIT_PER_MINUTE,
+    settings.CHAT_IP_RATE_LIMIT_BURST,
+    _store,
+)
+grading_rate_limiter = RateLimiter(
+    "grading",
+    settings.GRADING_RATE_LIMIT_PER_MINUTE,
+    settings.GRADING_RATE_LIMIT_BURST,
+    _store,
+)
+
+llm_budget = LLMConcurrencyBudget(
+    settings.LLM_MAX_CONCURRENT_CALLS, settings.LLM_MAX_CONCURRENT_CHAT_CALLS
+)
+
+
+def get_usage() -> Dict[str, object]:
+    """
+    Usage counters of this process for capacity planning.
+
+    Returns:
+        Dict[str, object]: Rate limiter, LLM call and circuit breaker counters
+    """
+    return {
+        "store": settings.RATE_LIMIT_STORE,
+        "rate_limits": {
+            limiter.name: limiter.usage()
+            for limiter in (
+                chat_rate_limiter,
+                chat_ip_rate_limiter,
+                guest_chat_rate_limiter,
+                grading_rate_limiter,
+            )
+        },
+        "llm_calls": llm_budget.usage(),
+        "llm_circuit": llm_circuit.usage(),
+    }
@@ -0,0 +1,201 @@
+# backend/app/services/review_queue.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, func, select, tuple_, update
+from sqlalchemy.orm import Session, aliased
+
+from app.database.models import Assignment, Course, CourseUser, Feedback, Submission, User
+
+
+def encode_cursor(due_date: datetime, submission_time: datetime, submission_id: int) -> str:
+    """
+    Encode the sort key of the last returned item as an opaque cursor.
+
+    Args:
+        due_date (datetime): Assignment due date
+        submission_time (datetime): Submission time
+        submission_id (int): Submission ID
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = json.dumps([due_date.isoformat(), submission_time.isoformat(), submission_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor
+
+    Raises:
+        ValueError: When the cursor is malformed
+
+    Returns:
+        Tuple[datetime, datetime, int]: Due date, submission time and submission ID
+    """
+    try:
+        due_date, submission_time, submission_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+        )
+        return (
+            datetime.fromisoformat(due_date),
+            datetime.fromisoformat(submission_time),
+            int(submission_id),
+        )
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def get_review_queue(
+    db: Session,
+    user: User,
+    course_id: Optional[int] = None,
+    assignment_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """
+    Get one page of AI-graded submissions awaiting professor review.
+
+    Items are ordered by assignment due date, then submission time, and
+    paginated by keyset: the cursor holds the sort key of the last item, so
+    every page is a single indexed range scan regardless of its depth.
+
+    Args:
+        db (Session): Database session
+        user (User): Professor or admin requesting the queue
+        course_id (Optional[int]): Only this course
+        assignment_id (Optional[int]): Only this assignment
+        cursor (Optional[str]): Cursor from the previous page
+        limit (int): Maximum number of items
+
+    Raises:
+        ValueError: When the cursor is malformed
+
+    Returns:
+        Dict[str, Any]: Items and the cursor of the next page (None on the last page)
+    """
+    newer_feedback = aliased(Feedback)
+    query = (
+        select(
+            Submission.id.label("submission_id"),
+            Submission.submission_time,
+            Submission.is_late,
+            Submission.attempt_number,
+            Submission.user_id,
+            (User.first_name + " " + User.last_name).label("student_name"),
+            Assignment.id.label("assignment_id"),
+            Assignment.title.label("assignment_title"),
+            Assignment.due_date,
+            Assignment.points_possible,
+            Course.id.label("course_id"),
+            Course.code.label("course_code"),
+            Feedback.suggested_grade,
+            Feedback.similarity_score,
+            Feedback.graded_by,
+            Feedback.feedback_generated_at,
+        )
+        .join(
+            Feedback,
+            (Feedback.submission_id == Submission.id)
+            & Feedback.professor_review.is_(False),
+        )
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .join(Course, Course.id == Assignment.course_id)
+        .join(User, User.id == Submission.user_id)
+        .where(
+            Submission.status == "graded",
+            # Only the latest feedback of a regraded submission
+            ~exists().where(
+                newer_feedback.submission_id == Submission.id,
+                newer_feedback.id > Feedback.id,
+            ),
+        )
+    )
+
+    # Professors only see courses they teach
+    if user.role == "professor":
+        query = query.where(
+            Assignment.course_id.in_(
+                select(CourseUser.course_id).where(
+                    CourseUser.user_id == user.id, CourseUser.role == "professor"
+                )
+            )
+        )
+    if course_id:
+        query = query.where(Assignment.course_id == course_id)
+    if assignment_id:
+        query = query.where(Submission.assignment_id == assignment_id)
+
+    sort_key = tuple_(Assignment.due_date, Submission.submission_time, Submission.id)
+    if cursor:
+        query = query.where(sort_key > tuple_(*decode_cursor(cursor)))
+
+    rows = db.execute(
+        query.order_by(
+            Assignment.due_date, Submission.submission_time, Submission.id
+        ).limit(limit + 1)
+    ).all()
+
+    items: List[Dict[str, Any]] = [dict(row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            last["due_date"], last["submission_time"], last["submission_id"]
+        )
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def accept_submissions(db: Session, *criteria) -> List[Any]:
+    """
+    Accept the AI grades of all graded submissions matching the criteria.
+
+    One statement marks the submissions accepted and copies each suggested
+    grade to the final grade of its feedback: the submissions UPDATE runs
+    in a data-modifying CTE that feeds the feedback UPDATE. The caller
+    commits.
+
+    Args:
+        db (Session): Database session
+        *criteria: Filters on Submission selecting the submissions to accept
+
+    Returns:
+        List[Any]: submission_id, user_id and assignment_id of each accepted submission
+    """
+    accepted = (
+        update(Submission)
+        .where(Submission.status == "graded", *criteria)
+        .values(status="accepted", updated_at=func.now())
+        .returning(Submission.id, Submission.user_id, Submission.assignment_id)
+        .cte("accepted")
+    )
+    stmt = (
+        update(Feedback)
+        .where(Feedback.submission_id == accepted.c.id)
+        .values(
+            final_grade=Feedback.suggested_grade,
+            professor_review=True,
+            updated_at=func.now(),
+        )
+        .returning(
+            accepted.c.id.label("submission_id"),
+            accepted.c.user_id,
+            accepted.c.assignment_id,
+        )
+        .add_cte(accepted)
+        .execution_options(synchronize_session=False)
+    )
+
+    # A regraded submission has several feedback rows; report it once
+    unique = {}
+    for row in db.execute(stmt).all():
+        unique.setdefault(row.submission_id, row)
+    return list(unique.values())
@@ -0,0 +1,152 @@
+# backend/app/services/rubric_service.py
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.database.models import Rubric
+from app.services.event_bus import broadcast_invalidation, event_bus
+
+# Serialized rubrics keyed by assignment id. Assignments without a rubric are
+# cached as None so they don't hit the database on every grading call.
+_rubric_cache: TTLCache = TTLCache(
+    maxsize=1024, ttl=settings.RUBRIC_CACHE_TTL_SECONDS
+)
+_rubric_cache_lock = threading.Lock()
+
+
+def serialize_rubric(rubric: Rubric) -> Dict[str, Any]:
+    """
+    Serialize a rubric and its criteria into plain data.
+
+    Args:
+        rubric (Rubric): Rubric with criteria loaded
+
+    Returns:
+        Dict[str, Any]: Rubric data including a JSON rendering for prompts
+    """
+    criteria: List[Dict[str, Any]] = [
+        {
+            "id": criterion.id,
+            "name": criterion.criteria_name,
+            "description": criterion.description,
+            "points_possible": criterion.points_possible,
+            "weight": criterion.weight,
+        }
+        for criterion in sorted(rubric.criteria, key=lambda c: c.id)
+    ]
+    prompt_text = json.dumps(
+        {
+            "title": rubric.title,
+            "description": rubric.description,
+            "criteria": [
+                {key: value for key, value in criterion.items() if key != "id"}
+                for criterion in criteria
+            ],
+        }
+    )
+    return {
+        "id": rubric.id,
+        "title": rubric.title,
+        "description": rubric.description,
+        "criteria": criteria,
+        "prompt_text": prompt_text,
+    }
+
+
+def load_rubric(db: Session, assignment_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the serialized rubric for an assignment, using the in-process cache.
+
+    When an assignment has several rubrics the most recently updated one is used.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+
+    Returns:
+        Optional[Dict[str, Any]]: Serialized rubric, or None if the assignment has no criteria
+    """
+    with _rubric_cache_lock:
+        if assignment_id in _rubric_cache:
+            return _rubric_cache[assignment_id]
+
+    rubric = (
+        db.query(Rubric)
+        .options(selectinload(Rubric.criteria))
+        .filter(Rubric.assignment_id == assignment_id)
+        .order_by(Rubric.updated_at.desc(), Rubric.id.desc())
+        .first()
+    )
+    serialized = serialize_rubric(rubric) if rubric and rubric.criteria else None
+
+    with _rubric_cache_lock:
+        _rubric_cache[assignment_id] = serialized
+    return serialized
+
+
+def _drop_rubrics(assignment_ids: Optional[List[int]]) -> None:
+    """Drop cached rubrics of this process; all of them when given None."""
+    with _rubric_cache_lock:
+        if assignment_ids is None:
+            _rubric_cache.clear()
+        for assignment_id in assignment_ids or ():
+            _rubric_cache.pop(assignment_id, None)
+
+
+def invalidate_rubric(assignment_id: int) -> None:
+    """
+    Drop the cached rubric for an assignment, in this and every other process.
+
+    Args:
+        assignment_id (int): Assignment ID
+    """
+    _drop_rubrics([assignment_id])
+    broadcast_invalidation("rubric", [assignment_id])
+
+
+event_bus.on_invalidate("rubric", _drop_rubrics)
+
+
+def weighted_total(
+    criteria: List[Dict[str, Any]], scores: Dict[int, float], total_points: float
+) -> float:
+    """
+    Combine per-criterion scores into a grade out of total_points.
+
+    Each criterion contributes its score fraction scaled by its weight. When all
+    weights are zero the criteria are combined by raw points instead.
+
+    Args:
+        criteria (List[Dict[str, Any]]): Serialized rubric criteria
+        scores (Dict[int, float]): Points awarded keyed by criterion id
+        total_points (float): Points possible for the assignment
+
+    Returns:
+        float: Weighted grade rounded to two decimals
+    """
+    total_weight = sum(criterion["weight"] for criterion in criteria)
+    if total_weight > 0:
+        fraction = (
+            sum(
+                criterion["weight"]
+                * (
+                    scores[criterion["id"]] / criterion["points_possible"]
+                    if criterion["points_possible"]
+                    else 1.0
+                )
+                for criterion in criteria
+            )
+            / total_weight
+        )
+    else:
+        points_possible = sum(criterion["points_possible"] for criterion in criteria)
+        fraction = (
+            sum(scores[criterion["id"]] for criterion in criteria) / points_possible
+            if points_possible
+            else 0.0
+        )
+    return round(fraction * total_points, 2)
@@ -0,0 +1,188 @@
+# backend/app/services/similarity_index.py
+from typing import Any, Dict, List
+
+import numpy as np
+from sqlalchemy import delete, insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.database.models import Submission, SubmissionLshBucket, SubmissionSignature
+from app.utils.text_similarity import (
+    LSH_THRESHOLD,
+    estimate_similarity,
+    lsh_buckets,
+    minhash_signature,
+    normalize_text,
+    pairwise_similarity,
+    shingles,
+)
+
+
+def _decode(signature: bytes) -> np.ndarray:
+    """Decode a stored signature."""
+    return np.frombuffer(signature, dtype=np.uint32)
+
+
+def index_submission(db: Session, submission: Submission, submission_text: str) -> bool:
+    """
+    Add or replace a submission in its assignment's near-duplicate index.
+
+    Args:
+        db (Session): Database session
+        submission (Submission): Submission to index
+        submission_text (str): Text of the submission
+
+    Returns:
+        bool: False when the text has no tokens and was not indexed
+    """
+    shingle_set = shingles(normalize_text(submission_text or ""))
+    if not shingle_set:
+        return False
+
+    signature = minhash_signature(shingle_set)
+
+    db.execute(
+        delete(SubmissionLshBucket).where(
+            SubmissionLshBucket.submission_id == submission.id
+        )
+    )
+    db.execute(
+        delete(SubmissionSignature).where(
+            SubmissionSignature.submission_id == submission.id
+        )
+    )
+    db.execute(
+        insert(SubmissionSignature).values(
+            submission_id=submission.id,
+            assignment_id=submission.assignment_id,
+            user_id=submission.user_id,
+            signature=signature.tobytes(),
+        )
+    )
+    db.execute(
+        insert(SubmissionLshBucket),
+        [
+            {
+                "submission_id": submission.id,
+                "assignment_id": submission.assignment_id,
+                "band": band,
+                "bucket": bucket,
+            }
+            for band, bucket in enumerate(lsh_buckets(signature))
+        ],
+    )
+    return True
+
+
+def find_similar(
+    db: Session, submission_id: int, threshold: float = 0.5
+) -> List[Dict[str, Any]]:
+    """
+    Find indexed submissions of the same assignment similar to a submission.
+
+    Candidates come from shared LSH buckets, so only a small slice of the
+    assignment is read; their similarity is then estimated from signatures.
+    LSH only finds pairs above LSH_THRESHOLD (about 0.42), so lower
+    thresholds compare against every submission of the assignment instead.
+    Other attempts by the same student are excluded.
+
+    Args:
+        db (Session): Database session
+        submission_id (int): Submission to compare
+        threshold (float): Minimum estimated Jaccard similarity (0-1)
+
+    Returns:
+        List[Dict[str, Any]]: submission_id, user_id and similarity, most similar first
+    """
+    target = db.get(SubmissionSignature, submission_id)
+    if not target:
+        return []
+
+    signature = _decode(target.signature)
+
+    query = db.query(
+        SubmissionSignature.submission_id,
+        SubmissionSignature.user_id,
+        SubmissionSignature.signature,
+    ).filter(
+        SubmissionSignature.assignment_id == target.assignment_id,
+        SubmissionSignature.user_id != target.user_id,
+    )
+    if threshold >= LSH_THRESHOLD:
+        bands = list(enumerate(lsh_buckets(signature)))
+        candidate_ids = (
+            db.query(SubmissionLshBucket.submission_id)
+            .filter(
+                SubmissionLshBucket.assignment_id == target.assignment_id,
+                tuple_(SubmissionLshBucket.band, SubmissionLshBucket.bucket).in_(bands),
+                SubmissionLshBucket.submission_id != submission_id,
+            )
+            .distinct()
+        )
+        query = query.filter(SubmissionSignature.submission_id.in_(candidate_ids))
+    candidates = query.all()
+    if not candidates:
+        return []
+
+    similarities = estimate_similarity(
+        signature, np.stack([_decode(candidate.signature) for candidate in candidates])
+    )
+    results = [
+        {
+            "submission_id": candidate.submission_id,
+            "user_id": candidate.user_id,
+            "similarity": round(float(similarity), 3),
+        }
+        for candidate, similarity in zip(candidates, similarities)
+        if similarity >= threshold
+    ]
+    results.sort(key=lambda result: result["similarity"], reverse=True)
+    return results
+
+
+def similarity_report(
+    db: Session, assignment_id: int, threshold: float = 0.7
+) -> List[Dict[str, Any]]:
+    """
+    List every pair of submissions in an assignment above a similarity threshold.
+
+    All signatures are loaded in one query and compared as a matrix. Pairs of
+    attempts by the same student are skipped.
+
+    Args:
+        db (Session): Database session
+        assignment_id (int): Assignment ID
+        threshold (float): Minimum estimated Jaccard similarity (0-1)
+
+    Returns:
+        List[Dict[str, Any]]: Pairs with submission and user ids, most similar first
+    """
+    rows = (
+        db.query(
+            SubmissionSignature.submission_id,
+            SubmissionSignature.user_id,
+            SubmissionSignature.signature,
+        )
+        .filter(SubmissionSignature.assignment_id == assignment_id)
+        .order_by(SubmissionSignature.submission_id)
+        .all()
+    )
+    if len(rows) < 2:
+        return []
+
+    matrix = pairwise_similarity(np.stack([_decode(row.signature) for row in rows]))
+    user_ids = np.array([row.user_id for row in rows])
+    different_users = user_ids[:, None] != user_ids[None, :]
+    first, second = np.nonzero(np.triu((matrix >= threshold) & different_users, k=1))
+
+    pairs = [
+        {
+            "submission_id": rows[i].submission_id,
+            "user_id": rows[i].user_id,
+            "other_submission_id": rows[j].submission_id,
+            "other_user_id": rows[j].user_id,
+            "similarity": round(float(matrix[i, j]), 3),
+        }
+        for i, j in zip(first.tolist(), second.tolist())
+    ]
+    pairs.sort(key=lambda pair: pair["similarity"], reverse=True)
+    return pairs
@@ -0,0 +1,202 @@
+import hashlib
+import re
+from typing import List, Set
+
+import numpy as np
+
+# Identifiers/numbers, or single punctuation characters
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# MinHash parameters. Signatures are persisted, so these must stay fixed.
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+# Jaccard similarity above which LSH reliably finds a pair (about 0.42);
+# pairs below it rarely share a bucket
+LSH_THRESHOLD = (1 / LSH_BANDS) ** (1 / LSH_ROWS)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+# Coefficients stay below 2**32 so a * hash never overflows uint64
+_PERM_A = _rng.randint(1, 1 << 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for whitespace-insensitive comparison.
+
+    Line endings are unified, runs of spaces and tabs collapse to one space,
+    and leading/trailing whitespace and blank lines are dropped.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    normalized = (re.sub(r"[ \t]+", " ", line).strip() for line in lines)
+    return "\n".join(line for line in normalized if line)
+
+
+def normalize_layout(text: str) -> str:
+    """
+    Normalize whitespace that can't change what code does.
+
+    Like normalize_text, but leading indentation is kept as written, since
+    it carries the structure of languages such as Python. Only runs of spaces
+    and tabs after it collapse, and trailing whitespace and blank lines are
+    dropped.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized text
+    """
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    normalized = []
+    for line in lines:
+        body = line.lstrip(" \t")
+        if body.strip():
+            indent = line[: len(line) - len(body)]
+            normalized.append(indent + re.sub(r"[ \t]+", " ", body).rstrip())
+    return "\n".join(normalized)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into word and punctuation tokens.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        List[str]: Tokens in order
+    """
+    return TOKEN_PATTERN.findall(text)
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Build the set of token shingles (contiguous token n-grams) of a text.
+
+    Texts shorter than the shingle size yield a single shingle of all tokens.
+
+    Args:
+        text (str): Raw text
+        size (int): Tokens per shingle
+
+    Returns:
+        Set[str]: Shingles
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """
+    Jaccard similarity of two sets.
+
+    Args:
+        a (Set[str]): First set
+        b (Set[str]): Second set
+
+    Returns:
+        float: Similarity between 0 and 1 (1 when both sets are empty)
+    """
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash_signature(shingle_set: Set[str]) -> np.ndarray:
+    """
+    Compute the MinHash signature of a shingle set.
+
+    Args:
+        shingle_set (Set[str]): Shingles of a text
+
+    Returns:
+        np.ndarray: uint32 signature of length MINHASH_PERMUTATIONS
+    """
+    hashes = np.fromiter(
+        (
+            int.from_bytes(
+                hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little"
+            )
+            for s in shingle_set
+        ),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+    if not len(hashes):
+        return np.full(MINHASH_PERMUTATIONS, _MAX_HASH, dtype=np.uint32)
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_buckets(signature: np.ndarray) -> List[int]:
+    """
+    Hash each LSH band of a signature to a bucket id.
+
+    Two signatures share a bucket in some band with high probability when
+    their Jaccard similarity is above roughly (1 / LSH_BANDS) ** (1 / LSH_ROWS).
+
+    Args:
+        signature (np.ndarray): MinHash signature
+
+    Returns:
+        List[int]: One signed 64-bit bucket id per band
+    """
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                signature[band * LSH_ROWS : (band + 1) * LSH_ROWS].tobytes(),
+                digest_size=8,
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+
+def estimate_similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Estimate Jaccard similarity between one signature and a matrix of others.
+
+    Args:
+        signature (np.ndarray): MinHash signature
+        others (np.ndarray): Signatures stacked row-wise
+
+    Returns:
+        np.ndarray: Estimated similarity for each row of others
+    """
+    return (others == signature).mean(axis=1)
+
+
+def pairwise_similarity(signatures: np.ndarray, chunk_size: int = 64) -> np.ndarray:
+    """
+    Estimate Jaccard similarity between every pair of signatures.
+
+    Rows are compared in chunks to bound memory on large assignments.
+
+    Args:
+        signatures (np.ndarray): Signatures stacked row-wise
+        chunk_size (int): Rows compared per chunk
+
+    Returns:
+        np.ndarray: Symmetric similarity matrix
+    """
+    count = len(signatures)
+    matrix = np.empty((count, count), dtype=np.float32)
+    for start in range(0, count, chunk_size):
+        chunk = signatures[start : start + chunk_size]
+        matrix[start : start + len(chunk)] = (
+            chunk[:, None, :] == signatures[None, :, :]
+        ).mean(axis=2)
+    return matrix
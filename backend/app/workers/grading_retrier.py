@@ -0,0 +1,76 @@
+# backend/app/workers/grading_retrier.py
+"""
+Grading retrier.
+
+Grades again the submissions whose AI grading failed (status
+"grading_retry") once their retry time has come. Run it next to the API:
+
+    python -m app.workers.grading_retrier
+
+Several instances can run at once; retries are claimed with row locks.
+While the LLM circuit breaker is open the queue is paused and submissions
+keep waiting without using up attempts. Rubric edits made through the API
+reach the retrier's rubric cache over the event bus.
+"""
+import argparse
+import time
+
+from app.api.v1.endpoints.submissions import process_submission_grading
+from app.config import settings
+from app.database.db import SessionLocal
+from app.services.event_bus import event_bus
+from app.services.grading_retry import claim_due_retries
+from app.services.llm_resilience import llm_circuit
+
+
+def run_once() -> int:
+    """
+    Grade one batch of due retries.
+
+    Returns:
+        int: Submissions processed
+    """
+    if llm_circuit.state == "open":
+        return 0
+
+    db = SessionLocal()
+    try:
+        submission_ids = claim_due_retries(db, settings.GRADING_RETRY_BATCH_SIZE)
+        # If the circuit opens meanwhile, the rest fail fast and are
+        # rescheduled for when it closes
+        for submission_id in submission_ids:
+            process_submission_grading(db, submission_id)
+
+        if submission_ids:
+            print(f"Grading retries: {len(submission_ids)} claimed")
+        return len(submission_ids)
+    except Exception as e:
+        print(f"Error running grading retrier: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Run the retrier loop."""
+    parser = argparse.ArgumentParser(description="GRADiEnt grading retrier")
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single pass and exit"
+    )
+    args = parser.parse_args()
+
+    # Receive cache invalidations; this worker serves no websockets
+    event_bus.start()
+
+    while True:
+        processed = run_once()
+        if args.once:
+            break
+        # Keep going while a full batch was due
+        if processed < settings.GRADING_RETRY_BATCH_SIZE:
+            time.sleep(settings.GRADING_RETRY_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
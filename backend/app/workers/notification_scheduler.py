@@ -0,0 +1,63 @@
+# backend/app/workers/notification_scheduler.py
+"""
+Notification scheduler.
+
+Creates deadline reminders and delivers pending notifications, including
+the "feedback available" notices queued by grading. Run it next to the API:
+
+    python -m app.workers.notification_scheduler
+
+Several instances can run at once; reminders are deduplicated by the
+database and deliveries are claimed with row locks.
+"""
+import argparse
+import time
+
+from app.config import settings
+from app.database.db import SessionLocal
+from app.services.notification_service import (
+    deliver_pending_notifications,
+    schedule_deadline_reminders,
+)
+
+
+def run_once() -> None:
+    """Create due deadline reminders, then deliver everything pending."""
+    db = SessionLocal()
+    try:
+        created = schedule_deadline_reminders(db)
+        db.commit()
+
+        delivered = 0
+        while True:
+            batch = deliver_pending_notifications(db, settings.NOTIFICATION_BATCH_SIZE)
+            delivered += batch
+            if batch < settings.NOTIFICATION_BATCH_SIZE:
+                break
+
+        if created or delivered:
+            print(f"Notifications: {created} reminders created, {delivered} delivered")
+    except Exception as e:
+        print(f"Error running notification scheduler: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Run the scheduler loop."""
+    parser = argparse.ArgumentParser(description="GRADiEnt notification scheduler")
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single pass and exit"
+    )
+    args = parser.parse_args()
+
+    while True:
+        run_once()
+        if args.once:
+            break
+        time.sleep(settings.NOTIFICATION_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
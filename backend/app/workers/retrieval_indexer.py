@@ -0,0 +1,38 @@
+# backend/app/workers/retrieval_indexer.py
+"""
+Course retrieval indexer.
+
+Builds or refreshes the on-disk index of course material used by the chat
+assistant. The API keeps it up to date as courses and assignments change
+and builds missing course shards on first use, so this is only needed to
+warm the index after a deploy or to pick up material files changed on disk:
+
+    python -m app.workers.retrieval_indexer
+    python -m app.workers.retrieval_indexer --course 3
+"""
+import argparse
+
+from app.database.db import SessionLocal
+from app.database.models import Course
+from app.services.course_retrieval import course_index
+
+
+def main() -> None:
+    """Sync the index of every course, or of the given ones."""
+    parser = argparse.ArgumentParser(description="GRADiEnt course retrieval indexer")
+    parser.add_argument(
+        "--course", type=int, action="append", help="Course ID (repeatable)"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        course_ids = args.course or [row.id for row in db.query(Course.id).all()]
+        updated = sum(course_index.sync_course(db, course_id) for course_id in course_ids)
+        print(f"Retrieval index: {updated} of {len(course_ids)} courses updated")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
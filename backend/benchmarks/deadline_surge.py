@@ -0,0 +1,167 @@
+# backend/benchmarks/deadline_surge.py
+"""
+Deadline-surge load test.
+
+Models the minutes before an assignment is due: a burst of students
+submitting at once while other users keep loading dashboards and running
+searches. Reports latency percentiles and shed (503) responses per route.
+
+Against a running server (uses one student account for every virtual
+student; submissions are whitespace-only, so the pre-grader settles them
+without an LLM call):
+
+    python -m benchmarks.deadline_surge --base-url http://localhost:8000 \\
+        --email student@example.com --password secret --assignment-id 1
+
+Without a server, replaying the same traffic through the admission control
+middleware in front of a simulated app whose threadpool and database pool
+are the bottleneck (compare with --no-admission):
+
+    python -m benchmarks.deadline_surge --simulate
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+API = "/api/v1"
+
+# Simulated service time of each route, in seconds
+SIMULATED_SERVICE_TIME = {
+    f"{API}/submissions/": 0.08,
+    f"{API}/users/me/dashboard": 0.15,
+    f"{API}/search/basic": 0.25,
+}
+# Requests the simulated app serves at once (threadpool and database pool)
+SIMULATED_WORKERS = 15
+
+
+class Results:
+    """Latencies and status codes per route."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, status: int, seconds: float) -> None:
+        self.statuses[route][status] += 1
+        if status < 500:
+            self.latencies[route].append(seconds)
+
+    def report(self) -> None:
+        print(f"{'route':<14}{'ok':>7}{'503':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for route in sorted(self.statuses):
+            latencies = sorted(self.latencies[route])
+            statuses = self.statuses[route]
+            ok = sum(count for status, count in statuses.items() if status < 500)
+
+            def percentile(p: float) -> str:
+                if not latencies:
+                    return "-"
+                return f"{latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000:.0f}"
+
+            print(
+                f"{route:<14}{ok:>7}{statuses.get(503, 0):>7}"
+                f"{percentile(0.5):>9}{percentile(0.95):>9}{percentile(0.99):>9}"
+            )
+
+
+async def timed(client: httpx.AsyncClient, results: Results, route: str, method: str, url: str, **kwargs) -> None:
+    """Send one request and record its outcome."""
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 599
+    results.record(route, status, time.perf_counter() - start)
+
+
+async def run_surge(client: httpx.AsyncClient, args, headers: Dict[str, str]) -> Results:
+    """Run the surge: submissions arriving over the window plus steady background load."""
+    results = Results()
+    deadline = time.perf_counter() + args.duration
+
+    async def background_user() -> None:
+        while time.perf_counter() < deadline:
+            if random.random() < 0.5:
+                await timed(client, results, "dashboard", "GET", f"{API}/users/me/dashboard", headers=headers)
+            else:
+                await timed(client, results, "search", "GET", f"{API}/search/basic", params={"query": "assignment"}, headers=headers)
+            await asyncio.sleep(random.uniform(0, args.think_time))
+
+    async def student(delay: float) -> None:
+        await asyncio.sleep(delay)
+        await timed(
+            client,
+            results,
+            "submission",
+            "POST",
+            f"{API}/submissions/",
+            data={"assignment_id": str(args.assignment_id), "submission_text": " "},
+            headers=headers,
+        )
+
+    # Submissions bunch up towards the end of the window
+    delays = [args.duration * random.betavariate(3, 1) for _ in range(args.students)]
+    await asyncio.gather(
+        *(background_user() for _ in range(args.background_users)),
+        *(student(delay) for delay in delays),
+    )
+    return results
+
+
+def simulated_app():
+    """ASGI app whose capacity is a fixed number of workers."""
+    workers = asyncio.Semaphore(SIMULATED_WORKERS)
+
+    async def app(scope, receive, send):
+        async with workers:
+            await asyncio.sleep(SIMULATED_SERVICE_TIME.get(scope["path"], 0.05))
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Deadline-surge load test")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", help="Student account used by every virtual user")
+    parser.add_argument("--password")
+    parser.add_argument("--assignment-id", type=int, default=1)
+    parser.add_argument("--students", type=int, default=600, help="Submissions in the surge")
+    parser.add_argument("--background-users", type=int, default=60, help="Users loading dashboards and searching")
+    parser.add_argument("--duration", type=float, default=10.0, help="Surge window in seconds")
+    parser.add_argument("--think-time", type=float, default=0.2, help="Max pause between background requests")
+    parser.add_argument("--simulate", action="store_true", help="Use a simulated app instead of a server")
+    parser.add_argument("--no-admission", action="store_true", help="Simulate without admission control")
+    args = parser.parse_args()
+
+    if args.simulate:
+        app = simulated_app()
+        if not args.no_admission:
+            from app.core.admission import AdmissionControlMiddleware
+
+            app = AdmissionControlMiddleware(app)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://surge", timeout=60)
+        headers: Dict[str, str] = {}
+    else:
+        if not args.email or not args.password:
+            parser.error("--email and --password are required without --simulate")
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=httpx.Limits(max_connections=None))
+        response = await client.post(f"{API}/auth/login", data={"username": args.email, "password": args.password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async with client:
+        results = await run_surge(client, args, headers)
+    results.report()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
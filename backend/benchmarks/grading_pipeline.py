@@ -0,0 +1,462 @@
+# backend/benchmarks/grading_pipeline.py
+"""
+Grading pipeline benchmark.
+
+Drives the whole submission path end to end: each virtual student creates a
+submission, grading runs in the background, and the student polls the
+submission until its feedback is ready. The API runs in this process behind
+a real HTTP server, with the offline fake LLM backend by default, so a run
+needs no API key and measures the application rather than the model.
+
+Reports throughput, p50/p99 latency per route, time until graded, and the
+number of database queries per request (including the background work a
+request schedules).
+
+Against the configured Postgres database (migrated; fixture users, a
+course and an assignment are added to it):
+
+    python -m benchmarks.grading_pipeline --submissions 200 --concurrency 20
+
+Against a throwaway SQLite database:
+
+    python -m benchmarks.grading_pipeline --database-url sqlite:///data/bench.db
+
+Save a run and compare a later one with it:
+
+    python -m benchmarks.grading_pipeline --output baseline.json
+    python -m benchmarks.grading_pipeline --baseline baseline.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import re
+import socket
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+API = "/api/v1"
+
+# Route label of the request whose code is running, for query attribution
+current_route: contextvars.ContextVar = contextvars.ContextVar(
+    "current_route", default="other"
+)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of a list, or None when it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class QueryCounter:
+    """
+    ASGI middleware counting database queries per route.
+
+    Queries run after the response body is sent (background tasks such as
+    grading) are counted under the route with a " (background)" suffix.
+    """
+
+    def __init__(self, app, engine):
+        self.app = app
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.queries: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        from sqlalchemy import event
+
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        with self._lock:
+            self.queries[current_route.get()] += 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = re.sub(r"/\d+", "/{id}", scope["path"][len(API):])
+        route = f"{scope['method']} {path}"
+        current_route.set(route)
+        with self._lock:
+            self.requests[route] += 1
+
+        async def send_and_label(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                current_route.set(f"{route} (background)")
+
+        await self.app(scope, receive, send_and_label)
+
+
+class Results:
+    """Latencies, status codes and grading times of a run."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.graded_after: List[float] = []
+        self.not_graded = 0
+        self.duration = 0.0
+
+    def record(self, route: str, status: int, seconds: float) -> None:
+        self.statuses[route][status] += 1
+        if status < 400:
+            self.latencies[route].append(seconds)
+
+    def summary(self, counter: QueryCounter) -> Dict[str, Any]:
+        """Summarize the run as JSON-serializable data."""
+        routes = {}
+        for route in sorted(self.statuses):
+            latencies = self.latencies[route]
+            routes[route] = {
+                "requests": sum(self.statuses[route].values()),
+                "errors": sum(
+                    count for status, count in self.statuses[route].items() if status >= 400
+                ),
+                "p50_ms": _ms(percentile(latencies, 0.5)),
+                "p99_ms": _ms(percentile(latencies, 0.99)),
+            }
+
+        queries = {}
+        for label, count in sorted(counter.queries.items()):
+            requests = counter.requests.get(label.replace(" (background)", ""), 0)
+            queries[label] = {
+                "total": count,
+                "per_request": round(count / requests, 1) if requests else None,
+            }
+
+        return {
+            "graded": len(self.graded_after),
+            "not_graded": self.not_graded,
+            "duration_s": round(self.duration, 2),
+            "throughput_per_s": round(len(self.graded_after) / self.duration, 2)
+            if self.duration
+            else 0.0,
+            "graded_after_p50_ms": _ms(percentile(self.graded_after, 0.5)),
+            "graded_after_p99_ms": _ms(percentile(self.graded_after, 0.99)),
+            "routes": routes,
+            "queries": queries,
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _delta(value, baseline) -> str:
+    if value is None or not baseline:
+        return ""
+    return f" ({(value - baseline) / baseline * 100:+.0f}%)"
+
+
+def report(summary: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Print a summary, with changes from a baseline run when given."""
+    base = baseline or {}
+    print(
+        f"graded {summary['graded']} submissions in {summary['duration_s']} s: "
+        f"{summary['throughput_per_s']}/s{_delta(summary['throughput_per_s'], base.get('throughput_per_s'))}"
+    )
+    if summary["not_graded"]:
+        print(f"not graded before the timeout: {summary['not_graded']}")
+    print(
+        f"time until graded: p50 {summary['graded_after_p50_ms']} ms"
+        f"{_delta(summary['graded_after_p50_ms'], base.get('graded_after_p50_ms'))}, "
+        f"p99 {summary['graded_after_p99_ms']} ms"
+        f"{_delta(summary['graded_after_p99_ms'], base.get('graded_after_p99_ms'))}"
+    )
+
+    print()
+    print(f"{'route':<32}{'requests':>9}{'errors':>8}{'p50 ms':>16}{'p99 ms':>16}")
+    for route, stats in summary["routes"].items():
+        base_route = base.get("routes", {}).get(route, {})
+        p50 = f"{stats['p50_ms']}{_delta(stats['p50_ms'], base_route.get('p50_ms'))}"
+        p99 = f"{stats['p99_ms']}{_delta(stats['p99_ms'], base_route.get('p99_ms'))}"
+        print(f"{route:<32}{stats['requests']:>9}{stats['errors']:>8}{p50:>16}{p99:>16}")
+
+    print()
+    print(f"{'database queries':<45}{'total':>8}{'per request':>20}")
+    for label, stats in summary["queries"].items():
+        base_label = base.get("queries", {}).get(label, {})
+        per_request = stats["per_request"]
+        column = f"{per_request}{_delta(per_request, base_label.get('per_request'))}"
+        print(f"{label:<45}{stats['total']:>8}{column:>20}")
+
+
+def configure_environment(args) -> None:
+    """Select the LLM backend and database before the app reads its settings."""
+    os.environ["LLM_BACKEND"] = args.backend
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["FAKE_LLM_LATENCY_JITTER_MS"] = str(args.llm_jitter_ms)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.llm_error_rate)
+    if args.no_admission:
+        os.environ["ADMISSION_CONTROL_ENABLED"] = "false"
+    if args.database_url and args.database_url.startswith("sqlite"):
+        # Postgres settings are required by the app but unused here
+        for name in ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST", "POSTGRES_DB"):
+            os.environ.setdefault(name, "unused")
+        os.environ.setdefault("POSTGRES_PORT", "5432")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+
+
+def bind_database(database_url: Optional[str]):
+    """
+    Point the app at the benchmark database and return its engine.
+
+    SQLite gets the schema created from the models. It has no advisory locks
+    or LISTEN/NOTIFY, which a single-process run does not need, so those
+    functions are registered as no-ops, and older versions lack concat.
+    """
+    from sqlalchemy import create_engine, event
+
+    from app.database import db as database
+    from app.database.models import Base
+
+    if not database_url:
+        return database.engine
+
+    if database_url.startswith("sqlite"):
+        engine = create_engine(
+            database_url, connect_args={"check_same_thread": False, "timeout": 30}
+        )
+
+        @event.listens_for(engine, "connect")
+        def register_functions(connection, _):
+            # Let readers run while a writer holds the database
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.create_function("pg_advisory_xact_lock", 2, lambda *_: None)
+            connection.create_function("pg_notify", 2, lambda *_: None)
+            connection.create_function(
+                "concat", -1, lambda *parts: "".join(str(p) for p in parts if p is not None)
+            )
+
+        Base.metadata.create_all(engine)
+    else:
+        engine = create_engine(database_url)
+
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    return engine
+
+
+def seed(args) -> Dict[str, Any]:
+    """Create a professor, a course, an assignment and enrolled students."""
+    from app.core.security import create_access_token
+    from app.database.db import SessionLocal
+    from app.database.models import Assignment, Course, CourseUser, User
+
+    tag = datetime.now().strftime("%m%d%H%M%S")
+    db = SessionLocal()
+    try:
+        professor = User(
+            email=f"bench-professor-{tag}@example.com",
+            password_hash="!",
+            first_name="Bench",
+            last_name="Professor",
+            role="professor",
+        )
+        db.add(professor)
+        course = Course(
+            code=f"BENCH{tag}",
+            name="Grading Benchmark",
+            description="Fixture course of the grading pipeline benchmark.",
+            term=f"Benchmark {tag}",
+        )
+        db.add(course)
+        db.flush()
+
+        assignment = Assignment(
+            course_id=course.id,
+            title="Benchmark essay",
+            description="Explain how a hash table resolves collisions.",
+            assignment_type="essay",
+            due_date=datetime.now(timezone.utc) + timedelta(days=7),
+            points_possible=100,
+            created_by=professor.id,
+        )
+        db.add(assignment)
+
+        students = [
+            User(
+                email=f"bench-student-{tag}-{number}@example.com",
+                password_hash="!",
+                first_name="Bench",
+                last_name=f"Student {number}",
+                role="student",
+            )
+            for number in range(args.students)
+        ]
+        db.add_all(students)
+        db.flush()
+        db.add_all(
+            CourseUser(course_id=course.id, user_id=student.id, role="student")
+            for student in students
+        )
+        db.commit()
+
+        return {
+            "assignment_id": assignment.id,
+            "tokens": [
+                create_access_token(student.email, "student", timedelta(hours=2))
+                for student in students
+            ],
+        }
+    finally:
+        db.close()
+
+
+def submission_text(number: int) -> str:
+    """A distinct essay-like submission that the pre-grader leaves to the LLM."""
+    return (
+        f"Submission {number}. A hash table maps keys to buckets with a hash "
+        "function. When two keys land in the same bucket, separate chaining "
+        "keeps a list per bucket, while open addressing probes other buckets "
+        "(linear probing, quadratic probing or double hashing). Keeping the "
+        "load factor low and resizing the table keeps lookups close to O(1)."
+    )
+
+
+async def run_load(base_url: str, fixtures: Dict[str, Any], args) -> Results:
+    """Create submissions and poll them until graded."""
+    results = Results()
+    slots = asyncio.Semaphore(args.concurrency)
+    tokens = fixtures["tokens"]
+
+    async def timed(client, route: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            results.record(route, 599, time.perf_counter() - start)
+            return None
+        results.record(route, response.status_code, time.perf_counter() - start)
+        return response
+
+    async def submit_and_wait(client: httpx.AsyncClient, number: int) -> None:
+        headers = {"Authorization": f"Bearer {tokens[number % len(tokens)]}"}
+        async with slots:
+            start = time.perf_counter()
+            response = await timed(
+                client,
+                "create_submission",
+                "POST",
+                f"{API}/submissions/",
+                data={
+                    "assignment_id": str(fixtures["assignment_id"]),
+                    "submission_text": submission_text(number),
+                },
+                headers=headers,
+            )
+            if response is None or response.status_code != 201:
+                results.not_graded += 1
+                return
+
+            submission_id = response.json()["id"]
+            deadline = start + args.timeout
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(args.poll_interval)
+                response = await timed(
+                    client, "get_submission", "GET", f"{API}/submissions/{submission_id}", headers=headers
+                )
+                if response is not None and response.status_code == 200:
+                    if response.json().get("feedback"):
+                        results.graded_after.append(time.perf_counter() - start)
+                        return
+            results.not_graded += 1
+
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=httpx.Limits(max_connections=None)
+    ) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(submit_and_wait(client, n) for n in range(args.submissions)))
+        results.duration = time.perf_counter() - start
+    return results
+
+
+def start_server(app) -> tuple:
+    """Serve the app on a free local port in a background thread."""
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Grading pipeline benchmark")
+    parser.add_argument("--database-url", help="Database to use instead of the configured Postgres database")
+    parser.add_argument("--backend", choices=["fake", "gemini"], default="fake", help="LLM backend")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="Fake LLM latency")
+    parser.add_argument("--llm-jitter-ms", type=float, default=200, help="Fake LLM latency jitter")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fake LLM error rate (0-1)")
+    parser.add_argument("--submissions", type=int, default=100)
+    parser.add_argument("--students", type=int, default=50, help="Virtual students sharing the submissions")
+    parser.add_argument("--concurrency", type=int, default=20, help="Students submitting at once")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between polls")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for each grade")
+    parser.add_argument("--no-admission", action="store_true", help="Disable admission control")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with results saved by --output")
+    args = parser.parse_args()
+
+    configure_environment(args)
+    engine = bind_database(args.database_url)
+
+    from app.main import app
+
+    counter = QueryCounter(app, engine)
+    fixtures = seed(args)
+    # Only count the benchmark traffic
+    counter.queries.clear()
+
+    server, thread, base_url = start_server(counter)
+    try:
+        results = asyncio.run(run_load(base_url, fixtures, args))
+        # Let the last background tasks finish before reading the counters
+        time.sleep(0.5)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    summary = results.summary(counter)
+    summary["settings"] = {
+        "backend": args.backend,
+        "llm_latency_ms": args.llm_latency_ms,
+        "submissions": args.submissions,
+        "concurrency": args.concurrency,
+        "database": engine.dialect.name,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    report(summary, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# backend/benchmarks/import_time.py
+"""
+Import-time profile of the API.
+
+Imports a module (app.main by default) in fresh interpreters with
+``-X importtime`` and reports the median wall time and the slowest modules
+by cumulative and self time. Worker startup and every reload pay this cost,
+so check it after adding a dependency or module-level setup:
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module app.workers.retrieval_indexer --runs 3
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+
+def import_once(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Import a module in a new interpreter.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Tuple[float, List[Tuple[str, int, int]]]: Wall seconds, and
+            (module, self µs, cumulative µs) for every module imported
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return seconds, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time profile")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5, help="Imports timed; the median is reported")
+    parser.add_argument("--top", type=int, default=15, help="Modules listed per table")
+    args = parser.parse_args()
+
+    runs = [import_once(args.module) for _ in range(args.runs)]
+    wall = [seconds for seconds, _ in runs]
+    # Profile of the median run
+    _, modules = sorted(runs, key=lambda run: run[0])[len(runs) // 2]
+
+    print(f"import {args.module}: median {statistics.median(wall) * 1000:.0f} ms "
+          f"(min {min(wall) * 1000:.0f}, max {max(wall) * 1000:.0f}, {args.runs} runs)")
+    for title, column in (("cumulative", 2), ("self", 1)):
+        print(f"\n{'slowest by ' + title:<56}{'self ms':>9}{'cum ms':>9}")
+        for name, self_us, cumulative_us in sorted(modules, key=lambda row: -row[column])[: args.top]:
+            print(f"{name:<56}{self_us / 1000:>9.1f}{cumulative_us / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+-- Per-criterion rubric scores stored on feedback_details
+ALTER TABLE feedback_details
+    ADD COLUMN IF NOT EXISTS rubric_criteria_id INTEGER
+        REFERENCES rubric_criteria (id) ON DELETE SET NULL,
+    ADD COLUMN IF NOT EXISTS points_awarded DOUBLE PRECISION;
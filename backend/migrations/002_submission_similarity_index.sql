@@ -0,0 +1,23 @@
+-- MinHash/LSH near-duplicate index over submission text
+CREATE TABLE IF NOT EXISTS submission_signatures (
+    submission_id INTEGER PRIMARY KEY REFERENCES submissions (id) ON DELETE CASCADE,
+    assignment_id INTEGER NOT NULL REFERENCES assignments (id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    signature BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_submission_signatures_assignment_id
+    ON submission_signatures (assignment_id);
+
+CREATE TABLE IF NOT EXISTS submission_lsh_buckets (
+    id SERIAL PRIMARY KEY,
+    submission_id INTEGER NOT NULL
+        REFERENCES submission_signatures (submission_id) ON DELETE CASCADE,
+    assignment_id INTEGER NOT NULL,
+    band INTEGER NOT NULL,
+    bucket BIGINT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_submission_lsh_buckets_lookup
+    ON submission_lsh_buckets (assignment_id, band, bucket);
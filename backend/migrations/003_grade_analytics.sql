@@ -0,0 +1,64 @@
+-- Lookup indexes used by per-assignment queries
+CREATE INDEX IF NOT EXISTS ix_submissions_assignment_id
+    ON submissions (assignment_id);
+
+CREATE INDEX IF NOT EXISTS ix_feedback_submission_id
+    ON feedback (submission_id);
+
+-- Materialized grade statistics, refreshed whenever grades are written
+CREATE TABLE IF NOT EXISTS assignment_stats (
+    assignment_id INTEGER PRIMARY KEY REFERENCES assignments (id) ON DELETE CASCADE,
+    course_id INTEGER NOT NULL REFERENCES courses (id) ON DELETE CASCADE,
+    submission_count INTEGER NOT NULL DEFAULT 0,
+    student_count INTEGER NOT NULL DEFAULT 0,
+    late_count INTEGER NOT NULL DEFAULT 0,
+    graded_count INTEGER NOT NULL DEFAULT 0,
+    reviewed_count INTEGER NOT NULL DEFAULT 0,
+    suggested_mean DOUBLE PRECISION,
+    suggested_median DOUBLE PRECISION,
+    suggested_p25 DOUBLE PRECISION,
+    suggested_p75 DOUBLE PRECISION,
+    suggested_p90 DOUBLE PRECISION,
+    suggested_min DOUBLE PRECISION,
+    suggested_max DOUBLE PRECISION,
+    final_mean DOUBLE PRECISION,
+    final_median DOUBLE PRECISION,
+    final_p25 DOUBLE PRECISION,
+    final_p75 DOUBLE PRECISION,
+    final_p90 DOUBLE PRECISION,
+    final_min DOUBLE PRECISION,
+    final_max DOUBLE PRECISION,
+    grade_delta_mean DOUBLE PRECISION,
+    grade_delta_abs_mean DOUBLE PRECISION,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_assignment_stats_course_id
+    ON assignment_stats (course_id);
+
+CREATE TABLE IF NOT EXISTS course_stats (
+    course_id INTEGER PRIMARY KEY REFERENCES courses (id) ON DELETE CASCADE,
+    assignment_count INTEGER NOT NULL DEFAULT 0,
+    submission_count INTEGER NOT NULL DEFAULT 0,
+    student_count INTEGER NOT NULL DEFAULT 0,
+    late_count INTEGER NOT NULL DEFAULT 0,
+    graded_count INTEGER NOT NULL DEFAULT 0,
+    reviewed_count INTEGER NOT NULL DEFAULT 0,
+    suggested_mean DOUBLE PRECISION,
+    suggested_median DOUBLE PRECISION,
+    suggested_p25 DOUBLE PRECISION,
+    suggested_p75 DOUBLE PRECISION,
+    suggested_p90 DOUBLE PRECISION,
+    suggested_min DOUBLE PRECISION,
+    suggested_max DOUBLE PRECISION,
+    final_mean DOUBLE PRECISION,
+    final_median DOUBLE PRECISION,
+    final_p25 DOUBLE PRECISION,
+    final_p75 DOUBLE PRECISION,
+    final_p90 DOUBLE PRECISION,
+    final_min DOUBLE PRECISION,
+    final_max DOUBLE PRECISION,
+    grade_delta_mean DOUBLE PRECISION,
+    grade_delta_abs_mean DOUBLE PRECISION,
+    refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,6 @@
+-- Lookups of a course's members by role, and of a user's courses
+CREATE INDEX IF NOT EXISTS ix_course_users_course_id_role
+    ON course_users (course_id, role);
+
+CREATE INDEX IF NOT EXISTS ix_course_users_user_id
+    ON course_users (user_id);
@@ -0,0 +1,3 @@
+-- Assignments of a course ordered by due date (upcoming assignments view)
+CREATE INDEX IF NOT EXISTS ix_assignments_course_id_due_date
+    ON assignments (course_id, due_date);
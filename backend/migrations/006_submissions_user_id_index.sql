@@ -0,0 +1,3 @@
+-- A student's own submissions (dashboard, submission list)
+CREATE INDEX IF NOT EXISTS ix_submissions_user_id
+    ON submissions (user_id);
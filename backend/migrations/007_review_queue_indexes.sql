@@ -0,0 +1,7 @@
+-- Professor review queue: graded submissions whose feedback awaits review
+CREATE INDEX IF NOT EXISTS ix_submissions_status
+    ON submissions (status);
+
+CREATE INDEX IF NOT EXISTS ix_feedback_pending_review
+    ON feedback (submission_id)
+    WHERE professor_review = false;
@@ -0,0 +1,9 @@
+-- Notification delivery: one reminder per student and assignment, and a
+-- small index over notifications that still have to be sent
+CREATE UNIQUE INDEX IF NOT EXISTS uq_notifications_deadline_reminder
+    ON notifications (user_id, related_assignment_id)
+    WHERE notification_type = 'deadline_reminder';
+
+CREATE INDEX IF NOT EXISTS ix_notifications_pending
+    ON notifications (scheduled_time)
+    WHERE sent_time IS NULL;
@@ -0,0 +1,32 @@
+-- Race-free attempt numbering and idempotent submission creation
+ALTER TABLE submissions
+    ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(255);
+
+-- Renumber the attempts of students whose concurrent requests produced
+-- duplicate attempt numbers, in submission order, so the unique index
+-- below can be created
+UPDATE submissions
+SET attempt_number = numbered.attempt_number
+FROM (
+    SELECT id,
+           row_number() OVER (
+               PARTITION BY assignment_id, user_id
+               ORDER BY submission_time, id
+           ) AS attempt_number
+    FROM submissions
+    WHERE (assignment_id, user_id) IN (
+        SELECT assignment_id, user_id
+        FROM submissions
+        GROUP BY assignment_id, user_id
+        HAVING count(*) <> count(DISTINCT attempt_number)
+    )
+) AS numbered
+WHERE submissions.id = numbered.id
+  AND submissions.attempt_number IS DISTINCT FROM numbered.attempt_number;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_submissions_attempt
+    ON submissions (assignment_id, user_id, attempt_number);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_submissions_idempotency_key
+    ON submissions (user_id, idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
@@ -0,0 +1,6 @@
+-- Token buckets shared by API workers when RATE_LIMIT_STORE=database
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    key VARCHAR(255) PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
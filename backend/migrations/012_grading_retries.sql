@@ -0,0 +1,30 @@
+-- Failed AI grading is retried instead of being stored as a grade of 0.
+-- New submission statuses (the column is a plain string):
+--   grading_retry   grading failed, retried at next_grading_at
+--   grading_failed  grading failed on every attempt, needs a manual regrade
+ALTER TABLE submissions
+    ADD COLUMN IF NOT EXISTS grading_failures INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS grading_error TEXT,
+    ADD COLUMN IF NOT EXISTS next_grading_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS ix_submissions_next_grading_at
+    ON submissions (next_grading_at)
+    WHERE status = 'grading_retry';
+
+-- Requeue unreviewed submissions holding the placeholder zero grade that
+-- was saved when the grading call failed
+WITH placeholder AS (
+    DELETE FROM feedback
+    USING submissions
+    WHERE feedback.submission_id = submissions.id
+      AND submissions.status = 'graded'
+      AND feedback.professor_review IS NOT TRUE
+      AND feedback.feedback_text = 'Error generating feedback.'
+    RETURNING feedback.submission_id
+)
+UPDATE submissions
+SET status = 'grading_retry',
+    grading_failures = 1,
+    grading_error = 'Placeholder grade from a failed grading call',
+    next_grading_at = CURRENT_TIMESTAMP
+WHERE id IN (SELECT submission_id FROM placeholder);
@@ -0,0 +1,32 @@
+-- Grade statistics are updated per student instead of being recomputed
+-- from every submission of the assignment and course on each grade change.
+
+-- Each student's latest attempt as counted in the assignment's statistics,
+-- so a grade change can replace its previous contribution
+CREATE TABLE IF NOT EXISTS assignment_student_grades (
+    assignment_id INTEGER NOT NULL REFERENCES assignments (id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    course_id INTEGER NOT NULL REFERENCES courses (id) ON DELETE CASCADE,
+    attempt_count INTEGER NOT NULL DEFAULT 0,
+    is_late BOOLEAN NOT NULL DEFAULT FALSE,
+    suggested_grade DOUBLE PRECISION,
+    final_grade DOUBLE PRECISION,
+    PRIMARY KEY (assignment_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_assignment_student_grades_course_id
+    ON assignment_student_grades (course_id);
+
+-- Running sums behind the means; the distribution is recomputed lazily
+ALTER TABLE assignment_stats
+    ADD COLUMN IF NOT EXISTS suggested_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS final_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS delta_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS grade_delta_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS grade_delta_abs_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS distribution_stale BOOLEAN NOT NULL DEFAULT TRUE,
+    ADD COLUMN IF NOT EXISTS distribution_refreshed_at TIMESTAMP WITH TIME ZONE;
+
+-- Existing rows have no sums or per-student rows; they are rebuilt on first read
+DELETE FROM assignment_stats;
+DELETE FROM course_stats;
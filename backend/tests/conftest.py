@@ -0,0 +1,17 @@
+# backend/tests/conftest.py
+"""
+Unit tests of pure functions. They need no database or Gemini key, but the
+settings require these variables, so placeholders are set before the app is
+imported. No connection is opened.
+"""
+import os
+
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,61 @@
+# backend/tests/test_analytics_service.py
+import numpy as np
+import pytest
+
+from app.services.analytics_service import COUNTERS, contribution, distribution
+
+
+def test_student_without_attempts_contributes_nothing():
+    assert contribution(0, False, None, None) == {name: 0 for name in COUNTERS}
+
+
+def test_graded_and_reviewed_attempt():
+    counters = contribution(2, True, 8.0, 6.5)
+
+    assert counters == {
+        "submission_count": 2,
+        "student_count": 1,
+        "late_count": 1,
+        "graded_count": 1,
+        "reviewed_count": 1,
+        "suggested_sum": 8.0,
+        "final_sum": 6.5,
+        "delta_count": 1,
+        "grade_delta_sum": -1.5,
+        "grade_delta_abs_sum": 1.5,
+    }
+
+
+def test_ungraded_attempt_only_counts_the_submission():
+    counters = contribution(1, False, None, None)
+
+    assert counters["student_count"] == 1
+    assert counters["graded_count"] == 0
+    assert counters["delta_count"] == 0
+
+
+def test_grade_change_is_the_difference_of_contributions():
+    before = contribution(1, False, 7.0, None)
+    after = contribution(1, False, 7.0, 9.0)
+
+    delta = {name: after[name] - before[name] for name in COUNTERS}
+
+    assert delta["reviewed_count"] == 1
+    assert delta["final_sum"] == 9.0
+    assert delta["grade_delta_sum"] == 2.0
+    assert delta["submission_count"] == 0
+
+
+def test_distribution_matches_linear_interpolation():
+    grades = [4.0, 1.0, 3.0, 2.0]
+
+    stats = distribution(grades)
+
+    assert stats["median"] == pytest.approx(2.5)
+    assert stats["p25"] == pytest.approx(np.percentile(grades, 25))
+    assert stats["p90"] == pytest.approx(3.7)
+    assert (stats["min"], stats["max"]) == (1.0, 4.0)
+
+
+def test_distribution_of_no_grades():
+    assert set(distribution([]).values()) == {None}
@@ -0,0 +1,55 @@
+# backend/tests/test_course_retrieval.py
+from app.services.course_retrieval import (
+    PASSAGE_OVERLAP,
+    PASSAGE_WORDS,
+    search_terms,
+    split_passages,
+)
+
+
+def test_search_terms_are_lowercase_words_without_stopwords():
+    assert search_terms("What is the Big-O of a HashMap lookup?") == [
+        "big",
+        "o",
+        "hashmap",
+        "lookup",
+    ]
+
+
+def test_search_terms_keep_numbers_and_order():
+    assert search_terms("Week 3: sorting, then week 2") == [
+        "week",
+        "3",
+        "sorting",
+        "then",
+        "week",
+        "2",
+    ]
+
+
+def test_search_terms_of_empty_text():
+    assert search_terms("") == []
+    assert search_terms("the and of") == []
+
+
+def test_split_passages_of_empty_text():
+    assert split_passages("") == []
+    assert split_passages(" \n ") == []
+
+
+def test_short_text_is_one_passage():
+    assert split_passages("one  two\nthree") == ["one two three"]
+
+
+def test_passages_overlap_and_cover_every_word():
+    words = [f"w{i}" for i in range(300)]
+
+    passages = [passage.split() for passage in split_passages(" ".join(words))]
+
+    step = PASSAGE_WORDS - PASSAGE_OVERLAP
+    assert all(len(passage) <= PASSAGE_WORDS for passage in passages)
+    for previous, passage in zip(passages, passages[1:]):
+        assert passage[0] == previous[step]
+        assert previous[-PASSAGE_OVERLAP:] == passage[:PASSAGE_OVERLAP]
+    assert passages[0][0] == "w0"
+    assert passages[-1][-1] == "w299"
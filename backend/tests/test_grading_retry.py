@@ -0,0 +1,26 @@
+# backend/tests/test_grading_retry.py
+import pytest
+
+from app.config import settings
+from app.services.grading_retry import retry_delay_seconds
+
+
+@pytest.fixture(autouse=True)
+def retry_settings(monkeypatch):
+    monkeypatch.setattr(settings, "GRADING_RETRY_BASE_SECONDS", 60)
+    monkeypatch.setattr(settings, "GRADING_RETRY_MAX_SECONDS", 3600)
+
+
+@pytest.mark.parametrize(
+    "failures, ceiling",
+    [(1, 60), (2, 120), (3, 240), (6, 1920), (7, 3600), (20, 3600)],
+)
+def test_retry_delay_doubles_up_to_the_maximum(failures, ceiling):
+    for _ in range(50):
+        assert ceiling / 2 <= retry_delay_seconds(failures) <= ceiling
+
+
+def test_retry_delay_is_jittered():
+    delays = {retry_delay_seconds(3) for _ in range(20)}
+
+    assert len(delays) > 1
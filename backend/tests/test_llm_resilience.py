@@ -0,0 +1,155 @@
+# backend/tests/test_llm_resilience.py
+import pytest
+
+from app.services import llm_resilience
+from app.services.llm_resilience import CallNotStarted, CircuitBreaker, CircuitOpen, call_llm
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProviderError(Exception):
+    def __init__(self, code):
+        super().__init__(f"status {code}")
+        self.code = code
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_resilience.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, reset_seconds=30)
+
+
+def test_circuit_opens_after_consecutive_failures(breaker):
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpen) as raised:
+        breaker.before_call()
+    assert raised.value.retry_after == pytest.approx(30)
+    assert breaker.rejected == 1
+
+
+def test_success_resets_the_failure_count(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+def test_half_open_circuit_lets_a_single_probe_through(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+
+def test_successful_probe_closes_the_circuit(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_probe_opens_the_circuit_again(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert breaker.retry_after() == pytest.approx(30)
+    assert breaker.times_opened == 2
+
+
+def test_released_probe_lets_another_call_probe(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.before_call()
+    breaker.release_probe()
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_resilience.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(llm_resilience.settings, "LLM_GRADING_CALL_ATTEMPTS", 3)
+
+
+def test_call_llm_retries_transient_errors(breaker, no_backoff):
+    outcomes = [ProviderError(503), ProviderError(429), "graded"]
+
+    def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert call_llm(call, "grading", breaker) == "graded"
+    assert breaker.failures == 0
+
+
+def test_call_llm_does_not_retry_rejected_requests(breaker, no_backoff):
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise ProviderError(400)
+
+    with pytest.raises(ProviderError):
+        call_llm(call, "grading", breaker)
+    assert len(calls) == 1
+    assert breaker.failures == 0
+
+
+def test_call_llm_raises_the_last_error_after_its_attempts(breaker, no_backoff):
+    def call():
+        raise TimeoutError("timed out")
+
+    with pytest.raises(TimeoutError):
+        call_llm(call, "grading", breaker)
+    assert breaker.state == "open"
+
+
+def test_call_llm_leaves_the_breaker_alone_when_the_call_never_started(breaker, no_backoff):
+    breaker.record_failure()
+
+    def call():
+        raise CallNotStarted("no slot")
+
+    with pytest.raises(CallNotStarted):
+        call_llm(call, "grading", breaker)
+    assert breaker.failures == 1
@@ -0,0 +1,70 @@
+# backend/tests/test_pregrader.py
+from app.services.pregrader import pregrade
+
+REFERENCE = "def add(a, b):\n    return a + b\n"
+
+
+def test_empty_submission_scores_zero_without_the_llm():
+    result = pregrade("  \n\t ", REFERENCE, 50)
+
+    assert result.decided
+    assert result.feedback["score"] == 0
+    assert result.feedback["similarity_score"] == 0
+    assert result.signals["submission_tokens"] == 0
+
+
+def test_empty_submission_without_reference_has_no_similarity():
+    result = pregrade("", None, 50)
+
+    assert result.feedback["similarity_score"] is None
+
+
+def test_exact_match_scores_full_points():
+    result = pregrade(REFERENCE, REFERENCE, 50)
+
+    assert result.decided
+    assert result.feedback["score"] == 50
+    assert result.signals["reference_match"] == "exact"
+    assert result.similarity_score == 100.0
+
+
+def test_whitespace_differences_still_match():
+    result = pregrade("def add(a,  b):\r\n    return a + b", REFERENCE, 50)
+
+    assert result.decided
+    assert result.signals["reference_match"] == "normalized"
+
+
+def test_other_submissions_are_left_to_the_llm_with_signals():
+    result = pregrade("def add(a, b):\n    return b + a + 0\n", REFERENCE, 50)
+
+    assert not result.decided
+    assert result.signals["submission_lines"] == 2
+    assert result.signals["submission_tokens"] > 0
+    assert 0 <= result.similarity_score < 100
+
+
+def test_without_reference_only_size_signals_are_measured():
+    result = pregrade("An essay about hash tables.", None, 50)
+
+    assert not result.decided
+    assert result.similarity_score is None
+    assert "reference_match" not in result.signals
+
+
+def test_indentation_differences_are_left_to_the_llm():
+    reference = "def sign(x):\n    if x > 0:\n        return 1\n    return 0\n"
+    # The final return moved inside the if block: different control flow
+    submission = "def sign(x):\n    if x > 0:\n        return 1\n        return 0\n"
+
+    result = pregrade(submission, reference, 10)
+
+    assert not result.decided
+    assert "reference_match" not in result.signals
+
+
+def test_inner_and_trailing_whitespace_still_match():
+    result = pregrade("def add(a,\tb):   \n\n    return  a + b", REFERENCE, 50)
+
+    assert result.decided
+    assert result.signals["reference_match"] == "normalized"
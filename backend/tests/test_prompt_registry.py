@@ -0,0 +1,100 @@
+# backend/tests/test_prompt_registry.py
+import pytest
+
+from app.config import settings
+from app.services.prompt_registry import PromptRegistry, prompt_registry
+
+
+class CachedContent:
+    def __init__(self, name):
+        self.name = name
+
+
+class Caches:
+    """Records cache creations; fails them when told to."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.created = []
+
+    def create(self, model, config=None):
+        if self.fail:
+            raise RuntimeError("cached content is too small")
+        self.created.append(config)
+        return CachedContent(f"cachedContents/test-{len(self.created)}")
+
+
+class Client:
+    def __init__(self, fail=False):
+        self.caches = Caches(fail)
+
+
+@pytest.fixture
+def registry():
+    # A fresh registry, so caches don't leak between tests
+    registry = PromptRegistry()
+    registry.register(prompt_registry.get("grading"))
+    return registry
+
+
+@pytest.fixture
+def cache_everything(monkeypatch):
+    # The real prompts are below the provider minimum, so lower it to reach the cache path
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "GEMINI_CONTEXT_CACHE_MIN_TOKENS", 0)
+
+
+def test_prompts_below_the_provider_minimum_are_sent_inline(registry):
+    client = Client()
+    template = registry.get("grading")
+    assert template.fixed_tokens < settings.GEMINI_CONTEXT_CACHE_MIN_TOKENS
+
+    model, contents, config = registry.request_for(client, "grading", "{}")
+
+    assert client.caches.created == []
+    assert model == template.model
+    assert len(contents) == len(template.preamble) + 1
+    assert config is template.config
+    assert config.cached_content is None
+
+
+def test_cached_prompt_sends_only_the_user_turn(registry, cache_everything):
+    client = Client()
+    template = registry.get("grading")
+
+    _, contents, config = registry.request_for(client, "grading", "{}")
+    _, contents_again, config_again = registry.request_for(client, "grading", "{}")
+
+    assert len(client.caches.created) == 1
+    assert client.caches.created[0].display_name == template.key
+    assert client.caches.created[0].contents == template.preamble
+    assert [content.role for content in contents] == ["user"]
+    assert config.cached_content == "cachedContents/test-1"
+    assert config.response_mime_type == "application/json"
+    assert config_again is config
+    assert len(contents_again) == 1
+
+
+def test_discarded_cache_is_recreated(registry, cache_everything):
+    client = Client()
+    registry.request_for(client, "grading", "{}")
+
+    registry.discard_cache("grading")
+    _, _, config = registry.request_for(client, "grading", "{}")
+
+    assert len(client.caches.created) == 2
+    assert config.cached_content == "cachedContents/test-2"
+
+
+def test_failed_cache_creation_falls_back_inline_and_backs_off(registry, cache_everything):
+    client = Client(fail=True)
+    template = registry.get("grading")
+
+    _, contents, config = registry.request_for(client, "grading", "{}")
+    assert config is template.config
+    assert len(contents) == len(template.preamble) + 1
+
+    # Within the retry delay, the cache isn't requested again
+    client.caches.fail = False
+    registry.request_for(client, "grading", "{}")
+    assert client.caches.created == []
@@ -0,0 +1,37 @@
+# backend/tests/test_review_queue.py
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.review_queue import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    due_date = datetime(2026, 3, 1, 23, 59, tzinfo=timezone.utc)
+    submission_time = datetime(2026, 2, 28, 10, 15, 30, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(due_date, submission_time, 42)
+
+    assert decode_cursor(cursor) == (due_date, submission_time, 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2026, 1, 1), datetime(2026, 1, 1), 10**12)
+
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_="
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "WzEsIDJd",  # [1, 2]
+        "WyJ4IiwgIjIwMjYtMDEtMDEiLCAxXQ==",  # ["x", "2026-01-01", 1]
+    ],
+)
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,44 @@
+# backend/tests/test_rubric_service.py
+import pytest
+
+from app.services.rubric_service import weighted_total
+
+
+def criterion(criterion_id, points_possible, weight):
+    return {"id": criterion_id, "points_possible": points_possible, "weight": weight}
+
+
+def test_weighted_total_scales_score_fractions_by_weight():
+    criteria = [criterion(1, 10, 3), criterion(2, 5, 1)]
+
+    # (3 * 10/10 + 1 * 0/5) / 4 of 100 points
+    assert weighted_total(criteria, {1: 10, 2: 0}, 100) == 75.0
+
+
+def test_weighted_total_ignores_points_when_weighted():
+    criteria = [criterion(1, 100, 1), criterion(2, 1, 1)]
+
+    # Equal weights count both criteria the same, whatever their points
+    assert weighted_total(criteria, {1: 50, 2: 1}, 20) == 15.0
+
+
+def test_weighted_total_uses_raw_points_when_all_weights_are_zero():
+    criteria = [criterion(1, 30, 0), criterion(2, 10, 0)]
+
+    assert weighted_total(criteria, {1: 15, 2: 10}, 80) == 50.0
+
+
+def test_weighted_total_counts_criteria_without_points_as_full_marks():
+    criteria = [criterion(1, 0, 1), criterion(2, 10, 1)]
+
+    assert weighted_total(criteria, {1: 0, 2: 5}, 100) == 75.0
+
+
+def test_weighted_total_is_zero_without_points_or_weights():
+    assert weighted_total([criterion(1, 0, 0)], {1: 0}, 100) == 0.0
+
+
+def test_weighted_total_rounds_to_two_decimals():
+    criteria = [criterion(1, 3, 1)]
+
+    assert weighted_total(criteria, {1: 1}, 10) == pytest.approx(3.33)
@@ -167,11 +167,13 @@ const ChatWindow = ({ isOpen, onClose, isPreLogin = false }) => {
     },
   ]);
   const [isTyping, setIsTyping] = useState(false);
+  const [conversationId, setConversationId] = useState(null);
   const chatContainerRef = useRef(null);
   const messageInputRef = useRef(null);
 
   // Update welcome message when login state changes
   useEffect(() => {
+    setConversationId(null);
     setMessages([
       {
         type: "assistant",
@@ -216,7 +218,16 @@ const ChatWindow = ({ isOpen, onClose, isPreLogin = false }) => {
     try {
       // Use different endpoint based on login state
       const endpoint = isPreLogin ? "chat/guest" : "chat";
-      const result = await chatService.sendMessage(userMessage, endpoint);
+      const result = await chatService.sendMessage(
+        userMessage,
+        endpoint,
+        conversationId
+      );
+
+      // Keep the conversation going on the server
+      if (result.conversation_id) {
+        setConversationId(result.conversation_id);
+      }
 
       // Add AI response
       setMessages((prev) => [
@@ -30,6 +30,8 @@ const SubmissionDetail = ({
       graded: "bg-blue-100 text-blue-800",
       accepted: "bg-green-100 text-green-800",
       resubmitted: "bg-purple-100 text-purple-800",
+      grading_retry: "bg-orange-100 text-orange-800",
+      grading_failed: "bg-red-100 text-red-800",
     };
 
     const statusText = {
@@ -37,6 +39,8 @@ const SubmissionDetail = ({
       graded: "Graded (Needs Review)",
       accepted: "Accepted",
       resubmitted: "Resubmitted",
+      grading_retry: "Grading Delayed",
+      grading_failed: "Grading Failed",
     };
 
     return (
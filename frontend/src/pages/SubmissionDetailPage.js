@@ -8,6 +8,10 @@ import Alert from "../components/common/Alert";
 import Button from "../components/common/Button";
 import submissionService from "../services/submissionService";
 import assignmentService from "../services/assignmentService";
+import eventService from "../services/eventService";
+
+// Events that change a submission's status or feedback
+const SUBMISSION_EVENTS = ["submission.graded", "submission.grading_failed"];
 
 const SubmissionDetailPage = () => {
   const { id } = useParams();
@@ -52,6 +56,24 @@ const SubmissionDetailPage = () => {
     fetchSubmission();
   }, [id]);
 
+  // Show new feedback as soon as grading finishes, without reloading
+  useEffect(() => {
+    return eventService.subscribe(async (event) => {
+      if (
+        !SUBMISSION_EVENTS.includes(event.type) ||
+        event.submission_id !== Number(id)
+      ) {
+        return;
+      }
+      try {
+        const data = await submissionService.getSubmissionById(id);
+        setSubmission(data);
+      } catch (error) {
+        console.error("Error refreshing submission:", error);
+      }
+    });
+  }, [id]);
+
   // Handle regrading (professors only)
   const handleRegrade = async (submissionId) => {
     if (!isProfessor) return;
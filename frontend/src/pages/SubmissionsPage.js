@@ -8,6 +8,7 @@ import Loading from "../components/common/Loading";
 import Alert from "../components/common/Alert";
 import submissionService from "../services/submissionService";
 import assignmentService from "../services/assignmentService";
+import eventService from "../services/eventService";
 
 const SubmissionsPage = () => {
   const { currentUser } = useAuth();
@@ -36,6 +37,19 @@ const SubmissionsPage = () => {
     fetchSubmissions();
   }, []);
 
+  // Reload the list when one of the submissions finishes grading
+  useEffect(() => {
+    return eventService.subscribe(async (event) => {
+      if (!event.type?.startsWith("submission.")) return;
+      try {
+        const data = await submissionService.getSubmissions();
+        setSubmissions(data.submissions || []);
+      } catch (error) {
+        console.error("Error refreshing submissions:", error);
+      }
+    });
+  }, []);
+
   // Fetch assignments for the filter
   useEffect(() => {
     const fetchAssignments = async () => {
@@ -57,6 +71,8 @@ const SubmissionsPage = () => {
       graded: "bg-blue-100 text-blue-800",
       accepted: "bg-green-100 text-green-800",
       resubmitted: "bg-purple-100 text-purple-800",
+      grading_retry: "bg-orange-100 text-orange-800",
+      grading_failed: "bg-red-100 text-red-800",
     };
 
     const statusText = {
@@ -64,6 +80,8 @@ const SubmissionsPage = () => {
       graded: "Graded",
       accepted: "Accepted",
       resubmitted: "Resubmitted",
+      grading_retry: "Grading Delayed",
+      grading_failed: "Grading Failed",
     };
 
     return (
@@ -2,10 +2,11 @@ import api from "./api";
 
 const chatService = {
   // Send a prompt to the chat API and get a response
-  sendMessage: async (prompt, endpoint = "chat") => {
+  sendMessage: async (prompt, endpoint = "chat", conversationId = null) => {
     try {
       const response = await api.post(endpoint, {
         prompt: prompt,
+        conversation_id: conversationId,
       });
       return response.data;
     } catch (error) {
@@ -0,0 +1,58 @@
+import api from "./api";
+
+// Seconds between reconnection attempts, doubling up to the maximum
+const RECONNECT_BASE_SECONDS = 1;
+const RECONNECT_MAX_SECONDS = 30;
+
+const eventService = {
+  // Receive the current user's events, such as "submission.graded", as they
+  // happen. Reconnects after the connection drops. Returns a function that
+  // closes the connection.
+  subscribe: (onEvent) => {
+    let socket = null;
+    let closed = false;
+    let failures = 0;
+    let reconnectTimer = null;
+
+    const connect = () => {
+      const token = localStorage.getItem("token");
+      if (!token || closed) return;
+
+      // Browsers can't set headers on websockets; the token goes in the query
+      const url = `${api.defaults.baseURL.replace(/^http/, "ws")}/events/ws?token=${encodeURIComponent(token)}`;
+      socket = new WebSocket(url);
+
+      socket.onopen = () => {
+        failures = 0;
+      };
+
+      socket.onmessage = (message) => {
+        try {
+          onEvent(JSON.parse(message.data));
+        } catch (error) {
+          console.error("Error handling event:", error);
+        }
+      };
+
+      socket.onclose = () => {
+        if (closed) return;
+        const delay = Math.min(
+          RECONNECT_MAX_SECONDS,
+          RECONNECT_BASE_SECONDS * 2 ** failures
+        );
+        failures += 1;
+        reconnectTimer = setTimeout(connect, delay * 1000);
+      };
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (socket) socket.close();
+    };
+  },
+};
+
+export default eventService;